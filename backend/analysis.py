@@ -0,0 +1,196 @@
+"""
+Builds the API response payloads from the functions in numerology.py.
+
+Shared by the single-record routes, the batch route and the bulk CLI so
+every entry point returns exactly the same shapes. The Lo Shu grid,
+pinnacles, essence and periods stay as compact results.py objects
+inside payloads; encode with results.default or convert with
+results.plain at the edge.
+"""
+import numerology
+import dob_table
+import metrics
+
+NUMBER_TOTALS = {
+    "mobile": numerology.calculate_mobile_total,
+    "vehicle": numerology.calculate_vehicle_total,
+    "house": numerology.calculate_house_total,
+}
+
+
+def dob_profile(dob: str, gender: str, system=None) -> dict:
+    """
+    Returns every DOB-only result for dob/gender, from the precomputed
+    table when the date is covered and computed directly otherwise.
+    The table holds built-in system results, so a system (see
+    systems.resolve) is always computed directly.
+    """
+    if system is None:
+        profile = dob_table.lookup(dob, gender)
+        if profile is not None:
+            return profile
+
+    mulank = numerology.calculate_mulank(dob)
+    bhagyank = numerology.calculate_bhagyank(dob)
+    kua = numerology.calculate_kua(dob, gender, system)
+    return {
+        "mulank": mulank,
+        "bhagyank": bhagyank,
+        "kua": kua,
+        "loshu": numerology.lo_shu_grid(dob, mulank, bhagyank, kua),
+        "pinnacles_challenges": numerology.pinnacle_cycles(dob, system),
+    }
+
+
+def core_numbers(dob: str) -> tuple:
+    """
+    Returns (mulank, bhagyank) for dob.
+    """
+    table = dob_table.get_table()
+    i = table.index(dob)
+    if i is not None:
+        return table.mulank[i], table.bhagyank[i]
+    return numerology.calculate_mulank(dob), numerology.calculate_bhagyank(dob)
+
+
+def static_analysis(name: str, dob: str, gender: str, profile: dict = None,
+                    essence_start_age: int = 0, essence_end_age: int = 100, system=None) -> dict:
+    """
+    Every /analyze section except periods, i.e. the part that never
+    changes for the same inputs. The essence timeline covers
+    essence_start_age to essence_end_age (default the full 0-100).
+    """
+    if profile is None:
+        with metrics.stage("dob_profile"):
+            profile = dob_profile(dob, gender, system)
+    with metrics.stage("name_number"):
+        name_number = numerology.calculate_name_number(name, system)
+    with metrics.stage("essence"):
+        essence = numerology.essence_timeline(dob, name, essence_start_age, essence_end_age, system)
+
+    return {
+        "mulank": profile["mulank"],
+        "bhagyank": profile["bhagyank"],
+        "kua": profile["kua"],
+        "name_number": name_number,
+        "loshu": profile["loshu"],
+        "pinnacles_challenges": profile["pinnacles_challenges"],
+        "essence": essence,
+    }
+
+
+def assemble_person(static: dict, periods: dict) -> dict:
+    """
+    Builds the /analyze payload from static_analysis output and the
+    personal periods, in the response's field order.
+    """
+    return {
+        "mulank": static["mulank"],
+        "bhagyank": static["bhagyank"],
+        "kua": static["kua"],
+        "name_number": static["name_number"],
+        "loshu": static["loshu"],
+        "periods": periods,
+        "life_roadmap": {
+            "pinnacles_challenges": static["pinnacles_challenges"],
+            "essence": static["essence"],
+        },
+    }
+
+
+def analyze_person(name: str, dob: str, gender: str, profile: dict = None, periods: dict = None,
+                   essence_start_age: int = 0, essence_end_age: int = 100, system=None) -> dict:
+    """
+    Full /analyze payload. profile and periods may be passed in when the
+    caller has already computed them for this DOB.
+    """
+    if periods is None:
+        with metrics.stage("periods"):
+            periods = numerology.personal_periods(dob)
+    static = static_analysis(name, dob, gender, profile, essence_start_age, essence_end_age, system)
+    return assemble_person(static, periods)
+
+
+def analyze_person_cached(cache, name: str, dob: str, gender: str,
+                          essence_start_age: int = 0, essence_end_age: int = 100, system=None) -> dict:
+    """
+    analyze_person backed by a cache.AnalysisCache: the static part is
+    reused for the same normalized inputs, periods for the same dob today.
+    """
+    key = cache.static_key(name, dob, gender, essence_start_age, essence_end_age, system)
+    with metrics.stage("cache_get"):
+        static = cache.get_static(key)
+    if static is None:
+        static = static_analysis(name, dob, gender, None, essence_start_age, essence_end_age, system)
+        with metrics.stage("cache_set"):
+            cache.set_static(key, static)
+
+    with metrics.stage("cache_get"):
+        periods = cache.get_periods(dob)
+    if periods is None:
+        with metrics.stage("periods"):
+            periods = numerology.personal_periods(dob)
+        with metrics.stage("cache_set"):
+            cache.set_periods(dob, periods)
+
+    return assemble_person(static, periods)
+
+
+def analyze_number(kind: str, number: str, dob: str, core: tuple = None, system=None) -> dict:
+    """
+    Payload for /analyze/mobile, /analyze/vehicle and /analyze/house.
+    kind is one of NUMBER_TOTALS' keys.
+    """
+    if core is None:
+        with metrics.stage("core_numbers"):
+            core = core_numbers(dob)
+    mulank, bhagyank = core
+    with metrics.stage(f"{kind}_total"):
+        totals = NUMBER_TOTALS[kind](number)
+    with metrics.stage("compatibility"):
+        compatibility = numerology.get_compatibility(mulank, totals["single_digit"], system)
+
+    return {
+        "mulank": mulank,
+        "bhagyank": bhagyank,
+        f"{kind}_total": totals["single_digit"],
+        f"{kind}_compound": totals["total_sum"],
+        "compatibility": compatibility,
+    }
+
+
+class BatchContext:
+    """
+    Memoizes DOB-derived values across the records it analyzes, so each
+    unique date (and date/gender pair) is computed once. Callers make one
+    per chunk (batch.encode_records, numerology_cli.encode_chunk), so the
+    memo is shared only within a chunk. What is shared across chunks and
+    workers is the process-wide dob_table: the API and the CLI build it
+    before starting their pools, so forked workers inherit it, and
+    built-in system profiles are table lookups in every chunk. The memo
+    adds periods, core numbers and custom-system profiles on top.
+    """
+
+    def __init__(self):
+        self.profiles = {}
+        self.periods = {}
+        self.cores = {}
+
+    def analyze_person(self, name: str, dob: str, gender: str,
+                       essence_start_age: int = 0, essence_end_age: int = 100, system=None) -> dict:
+        key = (dob, "male" if gender.lower() == "male" else "female", system)
+        profile = self.profiles.get(key)
+        if profile is None:
+            profile = self.profiles[key] = dob_profile(dob, gender, system)
+        periods = self.periods.get(dob)
+        if periods is None:
+            periods = self.periods[dob] = numerology.personal_periods(dob)
+        return analyze_person(name, dob, gender, profile=profile, periods=periods,
+                              essence_start_age=essence_start_age, essence_end_age=essence_end_age,
+                              system=system)
+
+    def analyze_number(self, kind: str, number: str, dob: str, system=None) -> dict:
+        core = self.cores.get(dob)
+        if core is None:
+            core = self.cores[dob] = core_numbers(dob)
+        return analyze_number(kind, number, dob, core=core, system=system)
@@ -0,0 +1,81 @@
+"""
+Minimal in-process ASGI client for benchmarks and checks.
+
+Drives an ASGI app (e.g. main.app) directly, without a server, socket
+or extra dependencies:
+
+    client = ASGIClient(main.app)
+    status, body = client.post("/analyze", {"name": "...", "dob": "1990-06-29", "gender": "male"})
+"""
+import asyncio
+import json
+
+
+class ASGIClient:
+    def __init__(self, app):
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+
+    async def arequest(self, method: str, path: str, payload=None, headers: dict = None, body: bytes = None) -> tuple:
+        """
+        Sends one HTTP request and returns (status, response body bytes).
+        payload is JSON-encoded; pass body for raw bytes instead.
+        """
+        if payload is not None:
+            body = json.dumps(payload).encode()
+        body = body or b""
+        path, _, query = path.partition("?")
+        raw_headers = [(b"host", b"testserver"), (b"content-length", str(len(body)).encode())]
+        if payload is not None:
+            raw_headers.append((b"content-type", b"application/json"))
+        for name, value in (headers or {}).items():
+            raw_headers.append((name.lower().encode(), value.encode()))
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Only reached once the response is complete
+            await asyncio.Event().wait()
+
+        status = 500
+        chunks = []
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return status, b"".join(chunks)
+
+    def request(self, method: str, path: str, payload=None, headers: dict = None, body: bytes = None) -> tuple:
+        return self.loop.run_until_complete(self.arequest(method, path, payload, headers, body))
+
+    def get(self, path: str, headers: dict = None) -> tuple:
+        return self.request("GET", path, headers=headers)
+
+    def post(self, path: str, payload=None, headers: dict = None) -> tuple:
+        return self.request("POST", path, payload, headers)
+
+    def close(self):
+        self.loop.close()
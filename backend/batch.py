@@ -0,0 +1,86 @@
+"""
+Per-record validation and encoding for /analyze/batch and
+/analyze/batch/arrow.
+
+encode_records and encode_arrow are the units of work handed to the
+batch process pool: they take a chunk of raw records and return their
+encoded results, so only plain lists and bytes cross the process boundary.
+"""
+from typing import Any
+
+from pydantic import ValidationError
+
+import analysis
+import columnar
+import fastjson
+from schemas import (
+    AnalysisRequest,
+    HouseAnalysisRequest,
+    MobileAnalysisRequest,
+    VehicleAnalysisRequest,
+    validation_message,
+)
+
+
+def analyze_record(context: analysis.BatchContext, record: Any) -> dict:
+    """
+    Validates and analyzes one batch record, returning an error dict instead
+    of raising. The record type is picked by which number field it carries.
+    """
+    if not isinstance(record, dict):
+        return {"error": "record must be a JSON object"}
+    try:
+        if "mobile_number" in record:
+            req = MobileAnalysisRequest.model_validate(record)
+            return context.analyze_number("mobile", req.mobile_number, req.dob, req.numerology_system())
+        if "vehicle_number" in record:
+            req = VehicleAnalysisRequest.model_validate(record)
+            return context.analyze_number("vehicle", req.vehicle_number, req.dob, req.numerology_system())
+        if "house_number" in record:
+            req = HouseAnalysisRequest.model_validate(record)
+            return context.analyze_number("house", req.house_number, req.dob, req.numerology_system())
+        req = AnalysisRequest.model_validate(record)
+        start_age, end_age = req.essence_window()
+        return context.analyze_person(req.name, req.dob, req.gender, start_age, end_age, req.numerology_system())
+    except ValidationError as e:
+        return {"error": validation_message(e)}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def columnar_row(record: Any, result: dict) -> dict:
+    """
+    Puts an analyze_record result in the numerology_cli result shape that
+    columnar.record_batch takes, with name/dob/gender from the record.
+    """
+    if not isinstance(record, dict):
+        return result
+    row = {field: record.get(field) for field in ("name", "dob", "gender")}
+    if "error" in result:
+        row["error"] = result["error"]
+        return row
+    for kind in analysis.NUMBER_TOTALS:
+        if f"{kind}_number" in record:
+            row[kind] = result
+            return row
+    row["analysis"] = result
+    return row
+
+
+def encode_arrow(records: list) -> bytes:
+    """
+    Analyzes a chunk of records into one Arrow IPC record batch message
+    (see columnar.serialize_batch), one row per record.
+    """
+    context = analysis.BatchContext()
+    rows = [columnar_row(record, analyze_record(context, record)) for record in records]
+    return columnar.serialize_batch(columnar.record_batch(rows))
+
+
+def encode_records(records: list) -> bytes:
+    """
+    Analyzes a chunk of records and returns their JSON results joined by
+    commas (a JSON array body without the brackets).
+    """
+    context = analysis.BatchContext()
+    return b",".join(fastjson.dumps(analyze_record(context, record)) for record in records)
@@ -0,0 +1,82 @@
+"""
+Per-request microbenchmark of string DOBs, parsed again by every
+function, against one BirthDate parsed up front (the parse is included
+in the timing):
+
+- DOB calculations: what an /analyze request computes when its DOB
+  misses the precomputed table (or uses a non-default system).
+- analyze_person: the whole payload for a DOB in the table.
+
+    python bench_birthdate.py
+"""
+import random
+import timeit
+from datetime import date
+
+import analysis
+import numerology
+from birthdate import BirthDate
+
+TARGET_DATE = "2025-06-15"
+
+
+def dob_calculations(dob, gender):
+    mulank = numerology.calculate_mulank(dob)
+    bhagyank = numerology.calculate_bhagyank(dob)
+    kua = numerology.calculate_kua(dob, gender)
+    numerology.generate_lo_shu_grid(dob, mulank, bhagyank, kua)
+    numerology.calculate_pinnacles_and_challenges(dob)
+    numerology.calculate_personal_periods(dob, TARGET_DATE)
+    for _ in numerology.iter_essence(dob, "Asha Rao", 30, 30):
+        pass
+
+
+def with_string(dob, gender):
+    dob_calculations(dob, gender)
+
+
+def with_birthdate(dob, gender):
+    dob_calculations(BirthDate.parse(dob), gender)
+
+
+def analyze_string(dob, gender):
+    analysis.analyze_person("Asha Rao", dob, gender)
+
+
+def analyze_birthdate(dob, gender):
+    analysis.analyze_person("Asha Rao", BirthDate.parse(dob), gender)
+
+
+def per_call_ns(fn, args, repeat=11):
+    def run():
+        for a in args:
+            fn(*a)
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return best / len(args) * 1e9
+
+
+def main():
+    rng = random.Random(21)
+    first = date(1900, 1, 1).toordinal()
+    args = [
+        (date.fromordinal(first + rng.randrange(73049)).isoformat(), rng.choice(("male", "female")))
+        for _ in range(20_000)
+    ]
+
+    analysis.dob_profile(args[0][0], "male")  # builds the DOB table outside the timing
+    cases = [
+        ("DOB calculations", with_string, with_birthdate, args),
+        ("analyze_person", analyze_string, analyze_birthdate, args[:5000]),
+    ]
+
+    print(f"{'per request':<26}{'str ns':>10}{'BirthDate ns':>14}{'speedup':>9}")
+    for name, old, new, case_args in cases:
+        old_ns = per_call_ns(old, case_args)
+        new_ns = per_call_ns(new, case_args)
+        print(f"{name:<26}{old_ns:>10.0f}{new_ns:>14.0f}{old_ns / new_ns:>8.2f}x")
+    parse_ns = per_call_ns(BirthDate.parse, [(dob,) for dob, _ in args])
+    print(f"BirthDate.parse alone: {parse_ns:.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+File size, write time and load time of bulk scoring output: the full
+NDJSON (what analytics converts today), NDJSON holding only the
+columnar.COLUMNS fields, an Arrow IPC file and a Parquet file.
+
+Every format holds the same scored records; writing starts from the
+scored results (the column-only NDJSON from rows already projected), so
+scoring itself is not timed. Loading means getting per-column values:
+json.loads plus picking the fields out for NDJSON, reading the table for
+Arrow (memory-mapped, so zero-copy) and Parquet.
+
+    python bench_columnar.py [records]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date
+
+import analysis
+import columnar
+import numerology_cli
+import results
+from columnar import pa, pq
+
+CHUNK = 1000
+
+
+def make_records(count: int) -> list:
+    rng = random.Random(23)
+    first = date(1920, 1, 1).toordinal()
+    return [
+        numerology_cli.normalize_record({
+            "name": f"Person {i}",
+            "dob": date.fromordinal(first + rng.randrange(33000)).isoformat(),
+            "gender": rng.choice(("male", "female")),
+            "mobile": str(rng.randrange(7_000_000_000, 10_000_000_000)) if i % 2 else "",
+            "house": str(rng.randrange(1, 500)) if i % 5 == 0 else "",
+        })
+        for i in range(count)
+    ]
+
+
+def columns_from_full(lines) -> dict:
+    columns = {name: [] for name in columnar.COLUMN_NAMES}
+    for line in lines:
+        result = json.loads(line)
+        person = result.get("analysis") or {}
+        numbers = {kind: result.get(kind) or {} for kind in analysis.NUMBER_TOTALS}
+        cycles = person.get("life_roadmap", {}).get("pinnacles_challenges", [{}] * 4)
+        row = {
+            "name": result["name"], "dob": result["dob"], "gender": result["gender"],
+            "mulank": person.get("mulank"), "bhagyank": person.get("bhagyank"), "kua": person.get("kua"),
+            "name_total": person.get("name_number", {}).get("total_sum"),
+            "name_number": person.get("name_number", {}).get("single_digit"),
+            "error": result.get("error"),
+        }
+        for kind, data in numbers.items():
+            row[f"{kind}_total"] = data.get(f"{kind}_total")
+            row[f"{kind}_compound"] = data.get(f"{kind}_compound")
+            row[f"{kind}_status"] = data.get("compatibility", {}).get("status")
+        for i, column in enumerate(columnar.GRID_COLUMNS, 1):
+            row[column] = person.get("loshu", {}).get(str(i))
+        for column, cycle in zip(columnar.PINNACLE_COLUMNS, cycles):
+            row[column] = cycle.get("pinnacle")
+        for column, cycle in zip(columnar.CHALLENGE_COLUMNS, cycles):
+            row[column] = cycle.get("challenge")
+        for name in columnar.COLUMN_NAMES:
+            columns[name].append(row[name])
+    return columns
+
+
+def columns_from_flat(lines) -> dict:
+    columns = {name: [] for name in columnar.COLUMN_NAMES}
+    for line in lines:
+        row = json.loads(line)
+        for name in columnar.COLUMN_NAMES:
+            columns[name].append(row.get(name))
+    return columns
+
+
+def write_ndjson(path, scored, encode):
+    with open(path, "w", encoding="utf-8") as f:
+        for start in range(0, len(scored), CHUNK):
+            f.write("".join(encode(result) + "\n" for result in scored[start:start + CHUNK]))
+
+
+def write_columnar(path, scored, output_format):
+    with columnar.BatchWriter(path, output_format) as writer:
+        for start in range(0, len(scored), CHUNK):
+            writer.write(columnar.record_batch(scored[start:start + CHUNK]))
+
+
+def load_ndjson(path, to_columns):
+    with open(path, encoding="utf-8") as f:
+        return to_columns(f)
+
+
+def timed(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        began = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - began
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    columnar.require_pyarrow()
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    context = analysis.BatchContext()
+    scored = [numerology_cli.score_record(context, record) for record in make_records(count)]
+    flat_rows = [
+        {name: value for name, value in row.items() if value is not None}
+        for start in range(0, count, CHUNK)
+        for row in columnar.record_batch(scored[start:start + CHUNK]).to_pylist()
+    ]
+
+    def full(result):
+        return json.dumps(result, separators=(",", ":"), default=results.default)
+
+    def flat(row):
+        return json.dumps(row, separators=(",", ":"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = [
+            ("NDJSON (full)", "full.ndjson",
+             lambda path: write_ndjson(path, scored, full), lambda path: load_ndjson(path, columns_from_full)),
+            ("NDJSON (columns)", "flat.ndjson",
+             lambda path: write_ndjson(path, flat_rows, flat), lambda path: load_ndjson(path, columns_from_flat)),
+            ("Arrow IPC file", "scored.arrow",
+             lambda path: write_columnar(path, scored, "arrow"),
+             lambda path: pa.ipc.open_file(pa.memory_map(path)).read_all()),
+            ("Parquet", "scored.parquet",
+             lambda path: write_columnar(path, scored, "parquet"), lambda path: pq.read_table(path)),
+        ]
+        print(f"{count} scored records")
+        print(f"{'format':<18}{'size KiB':>11}{'write ms':>10}{'load ms':>10}")
+        for label, filename, write, load in cases:
+            path = os.path.join(tmp, filename)
+            write_s = timed(lambda: write(path))
+            load_s = timed(lambda: load(path))
+            print(f"{label:<18}{os.path.getsize(path) / 1024:>11.0f}{write_s * 1e3:>10.1f}{load_s * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Pairwise matching over a group, MatchGroup against a naive loop over
+get_compatibility:
+
+- one person: naive scores everyone else both ways and sorts; the group
+  expands only the top_k.
+- whole group: the score distribution over every pair. Naive time is
+  extrapolated from a sample of pairs (all n^2 / 2 would take hours).
+- everyone's top_k (match_all), in-process and across a process pool.
+
+    python bench_matching.py [people] [workers]
+"""
+import os
+import random
+import sys
+import time
+from datetime import date
+from itertools import islice
+
+import matching
+import numerology
+from birthdate import BirthDate
+
+TOP_K = 10
+POINTS = matching.STATUS_POINTS
+
+
+def naive_pair_score(a: int, b: int) -> int:
+    return POINTS[numerology.get_compatibility(a, b)["status"]] + POINTS[numerology.get_compatibility(b, a)["status"]]
+
+
+def naive_matches(mulanks, index: int, top_k: int) -> list:
+    a = mulanks[index]
+    scored = [
+        (-naive_pair_score(a, b), -POINTS[numerology.get_compatibility(a, b)["status"]], b, other)
+        for other, b in enumerate(mulanks) if other != index
+    ]
+    scored.sort()
+    return [other for *_, other in scored[:top_k]]
+
+
+def timed(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        began = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - began
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    rng = random.Random(24)
+    first = date(1940, 1, 1).toordinal()
+    dobs = [BirthDate.parse(date.fromordinal(first + rng.randrange(25000)).isoformat()) for _ in range(count)]
+
+    build_s, group = timed(lambda: matching.MatchGroup(dobs))
+    print(f"{count} people; MatchGroup built in {build_s * 1e3:.1f} ms\n")
+    print(f"{'query':<32}{'naive ms':>12}{'MatchGroup ms':>15}")
+
+    targets = [rng.randrange(count) for _ in range(5)]
+    naive_s, naive = timed(lambda: [naive_matches(group.mulanks, i, TOP_K) for i in targets], repeat=1)
+    fast_s, fast = timed(lambda: [group.matches(i, TOP_K) for i in targets])
+    assert naive == [[m["index"] for m in result["results"]] for result in fast]
+    print(f"{'top 10 for one person':<32}{naive_s / len(targets) * 1e3:>12.1f}{fast_s / len(targets) * 1e3:>15.3f}")
+
+    pairs = count * (count - 1) // 2
+    sample = 200_000
+    def naive_sample():
+        mulanks = group.mulanks
+        for _ in range(sample):
+            naive_pair_score(mulanks[rng.randrange(count)], mulanks[rng.randrange(count)])
+    naive_s, _ = timed(naive_sample, repeat=1)
+    fast_s, _ = timed(lambda: group.summary(TOP_K))
+    print(f"{'score distribution, all pairs':<32}{naive_s / sample * pairs * 1e3:>12.0f}{fast_s * 1e3:>15.3f}  (naive extrapolated)")
+
+    def run_all(pool_workers):
+        return sum(people for people, _ in matching.match_all(group, TOP_K, workers=pool_workers))
+    serial_s, _ = timed(lambda: run_all(1), repeat=1)
+    print(f"\nmatch_all, top {TOP_K} for everyone: {serial_s:.2f} s in-process", end="")
+    if workers > 1:
+        pool_s, _ = timed(lambda: run_all(workers), repeat=1)
+        print(f", {pool_s:.2f} s with {workers} workers")
+    else:
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Per-call microbenchmark of the arithmetic reductions in numerology.py
+against the string-based loops they replaced.
+
+    python bench_reduction.py
+"""
+import random
+import timeit
+
+import numerology
+
+
+def string_single_digit(n):
+    while n > 9:
+        n = sum(int(digit) for digit in str(n))
+    return n
+
+
+def string_master(n):
+    while n > 9 and n not in [11, 22]:
+        n = sum(int(d) for d in str(n))
+    return n
+
+
+def per_call_ns(fn, values, repeat=5):
+    def run():
+        for n in values:
+            fn(n)
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return best / len(values) * 1e9
+
+
+def main():
+    rng = random.Random(7)
+    # Typical inputs: DOB digit sums, years, and mobile-length totals
+    samples = {
+        "dob sums (1-60)": [rng.randint(1, 60) for _ in range(100_000)],
+        "years (1900-2099)": [rng.randint(1900, 2099) for _ in range(100_000)],
+        "large (< 10^10)": [rng.randrange(10**10) for _ in range(100_000)],
+    }
+    pairs = [
+        ("reduce_to_single_digit", string_single_digit, numerology.reduce_to_single_digit),
+        ("reduce_preserving_master", string_master, numerology.reduce_preserving_master),
+    ]
+
+    print(f"{'function':<26}{'input':<20}{'string ns':>11}{'arith ns':>10}{'speedup':>9}")
+    for name, old, new in pairs:
+        for label, values in samples.items():
+            old_ns = per_call_ns(old, values)
+            new_ns = per_call_ns(new, values)
+            print(f"{name:<26}{label:<20}{old_ns:>11.0f}{new_ns:>10.0f}{old_ns / new_ns:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Memory held by analysis results kept in memory (cache entries, batch
+memos), typed results.py objects against the nested dicts they replace,
+plus the cost of encoding each form to JSON:
+
+    python bench_results.py
+"""
+import random
+import timeit
+import tracemalloc
+from datetime import date
+
+import analysis
+import fastjson
+import results
+from birthdate import BirthDate
+
+COUNT = 5000
+
+
+def retained_bytes(build):
+    tracemalloc.start()
+    held = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, held
+
+
+def main():
+    rng = random.Random(22)
+    first = date(1900, 1, 1).toordinal()
+    people = [
+        (BirthDate.parse(date.fromordinal(first + rng.randrange(73049)).isoformat()), rng.choice(("male", "female")))
+        for _ in range(COUNT)
+    ]
+    analysis.dob_profile(people[0][0], "male")  # builds the DOB table outside the measurement
+
+    typed_size, typed = retained_bytes(lambda: [analysis.analyze_person("Asha Rao", dob, gender) for dob, gender in people])
+    dict_size, dicts = retained_bytes(lambda: [results.plain(analysis.analyze_person("Asha Rao", dob, gender)) for dob, gender in people])
+    assert fastjson.dumps(typed) == fastjson.dumps(dicts)
+
+    print(f"{COUNT} analyze_person results held in memory")
+    print(f"{'form':<10}{'total KiB':>12}{'per result B':>14}{'encode us':>11}")
+    for name, size, held in (("dicts", dict_size, dicts), ("typed", typed_size, typed)):
+        encode_us = min(timeit.repeat(lambda: [fastjson.dumps(r) for r in held], number=1, repeat=5)) / COUNT * 1e6
+        print(f"{name:<10}{size / 1024:>12.0f}{size / COUNT:>14.0f}{encode_us:>11.1f}")
+    print(f"typed / dicts: {typed_size / dict_size:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Compares /analyze latency and throughput with the default FastAPI
+serialization (dict -> jsonable_encoder -> JSONResponse) and the
+FAST_JSON path (pre-encoded byte fragments), in-process over ASGI.
+
+    python bench_serialization.py
+    python bench_serialization.py --requests 5000 --people 500
+"""
+import argparse
+import random
+import statistics
+import time
+
+import main
+from asgi_client import ASGIClient
+
+NAMES = ["Shivam Ahuja", "Anna Maria de la Cruz", "Jean Luc Picard", "Priya Sharma", "Mohammed Al Rashid"]
+
+
+def make_people(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [
+        {
+            "name": rng.choice(NAMES),
+            "dob": f"{rng.randint(1940, 2010)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "gender": rng.choice(["male", "female"]),
+        }
+        for _ in range(count)
+    ]
+
+
+def run(client: ASGIClient, bodies: list) -> dict:
+    latencies = []
+    began = time.perf_counter()
+    for body in bodies:
+        start = time.perf_counter()
+        status, _ = client.post("/analyze", body)
+        latencies.append(time.perf_counter() - start)
+        assert status == 200
+    elapsed = time.perf_counter() - began
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "rps": len(bodies) / elapsed,
+    }
+
+
+def main_bench():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--people", type=int, default=300, help="Distinct inputs cycled through (repeat scenario)")
+    args = parser.parse_args()
+
+    client = ASGIClient(main.app)
+    scenarios = {
+        "repeat": [make_people(args.people, 1)[i % args.people] for i in range(args.requests)],
+        "unique": make_people(args.requests, 2),
+    }
+
+    print(f"{'scenario':<10}{'path':<10}{'p50 ms':>9}{'p99 ms':>9}{'req/s':>9}")
+    for scenario, bodies in scenarios.items():
+        for label, fast in (("default", False), ("fast", True)):
+            main.FAST_JSON = fast
+            main.analysis_cache.clear()
+            main.fragment_cache.clear()
+            run(client, bodies[:50])  # warm up imports and code paths
+            result = run(client, bodies)
+            print(f"{scenario:<10}{label:<10}{result['p50_ms']:>9.3f}{result['p99_ms']:>9.3f}{result['rps']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main_bench()
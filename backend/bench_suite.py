@@ -0,0 +1,650 @@
+"""
+Benchmark suite for every calculation in numerology.py and every API
+route, run in-process (routes go through asgi_client.ASGIClient, so no
+server is needed).
+
+Inputs follow realistic distributions: multi-part names of 2-5 parts
+(some with accents or hyphens), dates of birth drawn from every day in
+1900-2099, 10-digit mobiles with country codes, Indian-style vehicle
+registrations and house numbers.
+
+Each benchmark reports the best per-call time over several rounds. The
+first --save stores the results as a baseline; later runs compare
+against it and exit with status 1 when any benchmark is slower than its
+baseline by more than --threshold. Without a baseline file the run
+fails (status 2) rather than passing with nothing compared. The
+committed bench_baseline.json records the machine and Python version it
+was taken on; timings are only comparable on a similar machine, so
+re-record it (--save) after changing hardware.
+
+    python bench_suite.py --save              # record a baseline
+    python bench_suite.py                     # compare with the baseline
+    python bench_suite.py -k analyze --rounds 7
+    python bench_suite.py --all-dobs          # DOB functions over all 73,049 dates
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import date
+
+import calendar_forecast
+import matching
+import population_stats
+import numerology
+from birthdate import BirthDate
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str, kind: str = "function"):
+    """
+    Registers a benchmark. The decorated function takes the Inputs and
+    returns (fn, args_list); fn(*args) is timed for every args in the list.
+    It may return (fn, args_list, reset) to run reset (untimed) before
+    each round.
+    """
+    def register(setup):
+        BENCHMARKS[name] = (kind, setup)
+        return setup
+    return register
+
+
+# ---------------------------------------------------------------- inputs
+
+SYLLABLES = [
+    "a", "an", "ar", "ash", "bha", "ra", "de", "el", "fa", "ga", "ha", "is", "ja", "ka", "la",
+    "li", "ma", "mo", "na", "ni", "o", "pa", "pri", "qui", "ro", "sa", "sha", "ta", "u", "va",
+    "vi", "wa", "xe", "ya", "za", "chr", "ste", "phen", "jo", "han", "nes", "mü", "lé", "ño",
+]
+
+
+class Inputs:
+    def __init__(self, samples: int, all_dobs: bool, seed: int = 16):
+        rng = random.Random(seed)
+        self.rng = rng
+        first = date(1900, 1, 1).toordinal()
+        last = date(2099, 12, 31).toordinal()
+        every_dob = [date.fromordinal(o).isoformat() for o in range(first, last + 1)]
+        rng.shuffle(every_dob)
+        self.samples = samples
+        self.dobs = every_dob if all_dobs else every_dob[:samples]
+        self.names = [self.name() for _ in range(samples)]
+        self.genders = [rng.choice(("male", "female")) for _ in range(samples)]
+        self.mobiles = [self.mobile() for _ in range(samples)]
+        self.vehicles = [self.vehicle() for _ in range(samples)]
+        self.houses = [self.house() for _ in range(samples)]
+
+    def name(self) -> str:
+        rng = self.rng
+        parts = []
+        for _ in range(rng.choice((2, 2, 3, 3, 3, 4, 5))):
+            part = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+            if rng.random() < 0.05:
+                part += "-" + "".join(rng.choice(SYLLABLES) for _ in range(2)).capitalize()
+            parts.append(part)
+        return " ".join(parts)
+
+    def mobile(self) -> str:
+        rng = self.rng
+        digits = str(rng.randint(6, 9)) + "".join(str(rng.randint(0, 9)) for _ in range(9))
+        return rng.choice(("", "+91 ", "+91-", "0", "+1 ")) + digits
+
+    def vehicle(self) -> str:
+        rng = self.rng
+        state = rng.choice(("MH", "DL", "KA", "TN", "UP", "GJ"))
+        letters = "".join(rng.choice("ABCDEFGHJKLMNPRSTUVWXYZ") for _ in range(2))
+        return f"{state}{rng.randint(1, 50):02d}{letters}{rng.randint(1, 9999):04d}"
+
+    def house(self) -> str:
+        rng = self.rng
+        return rng.choice((str(rng.randint(1, 999)), f"{rng.choice('ABCD')}-{rng.randint(101, 1504)}",
+                           f"{rng.randint(1, 99)}/{rng.randint(1, 20)}"))
+
+    def people(self, count: int = None) -> list:
+        count = count or self.samples
+        return [
+            {"name": self.names[i % self.samples], "dob": self.dobs[i % len(self.dobs)],
+             "gender": self.genders[i % self.samples]}
+            for i in range(count)
+        ]
+
+
+# ---------------------------------------------------------------- numerology.py
+
+@benchmark("numerology.reduce_to_single_digit")
+def _(inputs):
+    return numerology.reduce_to_single_digit, [(inputs.rng.randint(0, 10**6),) for _ in range(inputs.samples)]
+
+
+@benchmark("numerology.digit_sum")
+def _(inputs):
+    return numerology.digit_sum, [(inputs.rng.randint(0, 10**10),) for _ in range(inputs.samples)]
+
+
+@benchmark("numerology.reduce_preserving_master")
+def _(inputs):
+    return numerology.reduce_preserving_master, [(inputs.rng.randint(0, 10**6),) for _ in range(inputs.samples)]
+
+
+@benchmark("numerology.reduce_for_py_calculation")
+def _(inputs):
+    return numerology.reduce_for_py_calculation, [(inputs.rng.randint(1900, 2099),) for _ in range(inputs.samples)]
+
+
+@benchmark("numerology.calculate_mulank")
+def _(inputs):
+    return numerology.calculate_mulank, [(dob,) for dob in inputs.dobs]
+
+
+@benchmark("numerology.calculate_bhagyank")
+def _(inputs):
+    return numerology.calculate_bhagyank, [(dob,) for dob in inputs.dobs]
+
+
+@benchmark("numerology.calculate_kua")
+def _(inputs):
+    return numerology.calculate_kua, [(dob, inputs.genders[i % inputs.samples]) for i, dob in enumerate(inputs.dobs)]
+
+
+@benchmark("numerology.generate_lo_shu_grid")
+def _(inputs):
+    args = []
+    for i, dob in enumerate(inputs.dobs):
+        mulank = numerology.calculate_mulank(dob)
+        bhagyank = numerology.calculate_bhagyank(dob)
+        kua = numerology.calculate_kua(dob, inputs.genders[i % inputs.samples])
+        args.append((dob, mulank, bhagyank, kua))
+    return numerology.generate_lo_shu_grid, args
+
+
+@benchmark("numerology.calculate_personal_periods")
+def _(inputs):
+    return numerology.calculate_personal_periods, [(dob, "2025-06-15") for dob in inputs.dobs]
+
+
+@benchmark("numerology.calculate_pinnacles_and_challenges")
+def _(inputs):
+    return numerology.calculate_pinnacles_and_challenges, [(dob,) for dob in inputs.dobs]
+
+
+@benchmark("numerology.lo_shu_grid")
+def _(inputs):
+    args = []
+    for i, dob in enumerate(inputs.dobs):
+        mulank = numerology.calculate_mulank(dob)
+        bhagyank = numerology.calculate_bhagyank(dob)
+        kua = numerology.calculate_kua(dob, inputs.genders[i % inputs.samples])
+        args.append((dob, mulank, bhagyank, kua))
+    return numerology.lo_shu_grid, args
+
+
+@benchmark("numerology.personal_periods")
+def _(inputs):
+    return numerology.personal_periods, [(dob, "2025-06-15") for dob in inputs.dobs]
+
+
+@benchmark("numerology.pinnacle_cycles")
+def _(inputs):
+    return numerology.pinnacle_cycles, [(dob,) for dob in inputs.dobs]
+
+
+@benchmark("numerology.calculate_name_number")
+def _(inputs):
+    return numerology.calculate_name_number, [(name,) for name in inputs.names]
+
+
+@benchmark("numerology.calculate_mobile_total")
+def _(inputs):
+    return numerology.calculate_mobile_total, [(m,) for m in inputs.mobiles]
+
+
+@benchmark("numerology.calculate_vehicle_total")
+def _(inputs):
+    return numerology.calculate_vehicle_total, [(v,) for v in inputs.vehicles]
+
+
+@benchmark("numerology.calculate_house_total")
+def _(inputs):
+    return numerology.calculate_house_total, [(h,) for h in inputs.houses]
+
+
+@benchmark("numerology.get_compatibility")
+def _(inputs):
+    return numerology.get_compatibility, [(inputs.rng.randint(1, 9), inputs.rng.randint(1, 9)) for _ in range(inputs.samples)]
+
+
+@benchmark("numerology.calculate_essence")
+def _(inputs):
+    return numerology.calculate_essence, [(p["dob"], p["name"]) for p in inputs.people()]
+
+
+@benchmark("numerology.essence_timeline")
+def _(inputs):
+    return numerology.essence_timeline, [(p["dob"], p["name"]) for p in inputs.people()]
+
+
+@benchmark("numerology.iter_essence")
+def _(inputs):
+    # A 10-year window deep into the timeline
+    def window(dob, name):
+        for _ in numerology.iter_essence(dob, name, 60, 70):
+            pass
+    return window, [(p["dob"], p["name"]) for p in inputs.people()]
+
+
+@benchmark("numerology.personal_year_base")
+def _(inputs):
+    return numerology.personal_year_base, [(dob,) for dob in inputs.dobs]
+
+
+@benchmark("numerology.personal_year")
+def _(inputs):
+    return numerology.personal_year, [(inputs.rng.randint(2, 18), inputs.rng.randint(1900, 2099)) for _ in range(inputs.samples)]
+
+
+@benchmark("numerology.personal_month")
+def _(inputs):
+    return numerology.personal_month, [(inputs.rng.randint(1, 9), inputs.rng.randint(1, 12)) for _ in range(inputs.samples)]
+
+
+@benchmark("numerology.personal_day")
+def _(inputs):
+    return numerology.personal_day, [(inputs.rng.randint(1, 9), inputs.rng.randint(1, 31)) for _ in range(inputs.samples)]
+
+
+# ---------------------------------------------------------------- birthdate.py
+
+@benchmark("birthdate.BirthDate.parse")
+def _(inputs):
+    return BirthDate.parse, [(dob,) for dob in inputs.dobs]
+
+
+@benchmark("numerology DOB calculations [BirthDate]")
+def _(inputs):
+    # Every DOB-based calculation of one request on a pre-parsed BirthDate
+    def calculations(dob, gender):
+        mulank = numerology.calculate_mulank(dob)
+        bhagyank = numerology.calculate_bhagyank(dob)
+        kua = numerology.calculate_kua(dob, gender)
+        numerology.generate_lo_shu_grid(dob, mulank, bhagyank, kua)
+        numerology.calculate_pinnacles_and_challenges(dob)
+        numerology.calculate_personal_periods(dob, "2025-06-15")
+    return calculations, [(BirthDate.parse(dob), inputs.genders[i % inputs.samples]) for i, dob in enumerate(inputs.dobs)]
+
+
+# ---------------------------------------------------------------- calendar_forecast.py
+
+@benchmark("calendar_forecast.iter_days")
+def _(inputs):
+    # One year of days per person
+    def year(dob):
+        for _ in calendar_forecast.iter_days(dob, date(2025, 1, 1), date(2025, 12, 31)):
+            pass
+    return year, [(dob,) for dob in inputs.dobs[:max(inputs.samples // 20, 1)]]
+
+
+@benchmark("calendar_forecast.iter_days [per-day baseline]")
+def _(inputs):
+    # The same year computed by calling calculate_personal_periods for every day
+    days = [date.fromordinal(o).isoformat() for o in range(date(2025, 1, 1).toordinal(), date(2026, 1, 1).toordinal())]
+    def year(dob):
+        for day in days:
+            numerology.calculate_personal_periods(dob, day)
+    return year, [(dob,) for dob in inputs.dobs[:max(inputs.samples // 20, 1)]]
+
+
+@benchmark("calendar_forecast.encode_ndjson")
+def _(inputs):
+    # Ten years for 100 people per call
+    dobs = inputs.dobs[:100]
+    def encode(start, end):
+        for _ in calendar_forecast.encode_ndjson(dobs, start, end):
+            pass
+    return encode, [(date(2025, 1, 1), date(2034, 12, 31))] * max(inputs.samples // 200, 1)
+
+
+# ---------------------------------------------------------------- matching.py
+
+@benchmark("matching.MatchGroup")
+def _(inputs):
+    return matching.MatchGroup, [(inputs.dobs,)] * max(inputs.samples // 1000, 1)
+
+
+@benchmark("matching.MatchGroup.matches")
+def _(inputs):
+    group = matching.MatchGroup(inputs.dobs)
+    return group.matches, [(inputs.rng.randrange(group.size), 10) for _ in range(inputs.samples)]
+
+
+@benchmark("matching.MatchGroup.summary")
+def _(inputs):
+    group = matching.MatchGroup(inputs.dobs)
+    return group.summary, [(10,)] * max(inputs.samples // 10, 1)
+
+
+# ---------------------------------------------------------------- population_stats.py
+
+def _population_records(inputs, count: int) -> list:
+    return [
+        dict(p, mobile=inputs.mobiles[i % inputs.samples] if i % 2 else "")
+        for i, p in enumerate(inputs.people(count))
+    ]
+
+
+@benchmark("population_stats.PopulationStats.add_records")
+def _(inputs):
+    # 1000 records per call
+    def add(records):
+        population_stats.PopulationStats().add_records(records)
+    return add, [(_population_records(inputs, 1000),)] * max(inputs.samples // 100, 1)
+
+
+@benchmark("population_stats.RecordDecoder")
+def _(inputs):
+    records = _population_records(inputs, 1000)
+    body = ("name,dob,gender,mobile\n" + "".join(
+        f"{r['name']},{r['dob']},{r['gender']},{r['mobile']}\n" for r in records
+    )).encode()
+    def decode(data):
+        decoder = population_stats.RecordDecoder("csv")
+        for start in range(0, len(data), 65536):
+            decoder.feed(data[start:start + 65536])
+        decoder.close()
+    return decode, [(body,)] * max(inputs.samples // 100, 1)
+
+
+# ---------------------------------------------------------------- routes
+
+def _route(client, method, path, bodies):
+    def call(body):
+        status, _ = client.request(method, path, body)
+        if status != 200:
+            raise AssertionError(f"{method} {path} returned {status} for {body}")
+    return call, [(body,) for body in bodies]
+
+
+def route_benchmark(method: str, path: str, label: str = None, reset=None):
+    """
+    Registers a route benchmark; the decorated function returns the request bodies.
+    """
+    def setup(make_bodies, inputs, client):
+        fn, args_list = _route(client, method, path, make_bodies(inputs))
+        return fn, args_list, reset
+
+    def register(make_bodies):
+        BENCHMARKS[f"{method} {path}" + (f" [{label}]" if label else "")] = (
+            "route", lambda inputs, client: setup(make_bodies, inputs, client),
+        )
+        return make_bodies
+    return register
+
+
+def _clear_result_caches():
+    import main as api
+    api.analysis_cache.clear()
+    api.fragment_cache.clear()
+
+
+def _route_samples(inputs):
+    return max(inputs.samples // 4, 1)
+
+
+@route_benchmark("GET", "/")
+def _(inputs):
+    return [None] * _route_samples(inputs)
+
+
+@route_benchmark("GET", "/metrics")
+def _(inputs):
+    return [None] * _route_samples(inputs)
+
+
+@route_benchmark("GET", "/systems")
+def _(inputs):
+    return [None] * _route_samples(inputs)
+
+
+@route_benchmark("GET", "/stats/dob-table")
+def _(inputs):
+    return [None] * _route_samples(inputs)
+
+
+@route_benchmark("GET", "/stats/cache")
+def _(inputs):
+    return [None] * _route_samples(inputs)
+
+
+@route_benchmark("GET", "/stats/executor")
+def _(inputs):
+    return [None] * _route_samples(inputs)
+
+
+@route_benchmark("POST", "/analyze", "unique", reset=_clear_result_caches)
+def _(inputs):
+    # Distinct people and cleared caches, so every request misses the result cache
+    return [dict(p, name=f"{p['name']} {i}") for i, p in enumerate(inputs.people(_route_samples(inputs)))]
+
+
+@route_benchmark("POST", "/analyze", "repeat")
+def _(inputs):
+    people = inputs.people(20)
+    return [people[i % len(people)] for i in range(_route_samples(inputs))]
+
+
+@route_benchmark("POST", "/analyze", "pythagorean", reset=_clear_result_caches)
+def _(inputs):
+    return [dict(p, name=f"{p['name']} {i}", system="pythagorean")
+            for i, p in enumerate(inputs.people(_route_samples(inputs)))]
+
+
+@route_benchmark("POST", "/analyze/mobile")
+def _(inputs):
+    return [{"mobile_number": inputs.mobiles[i], "dob": inputs.dobs[i]} for i in range(_route_samples(inputs))]
+
+
+@route_benchmark("POST", "/analyze/vehicle")
+def _(inputs):
+    return [{"vehicle_number": inputs.vehicles[i], "dob": inputs.dobs[i]} for i in range(_route_samples(inputs))]
+
+
+@route_benchmark("POST", "/analyze/house")
+def _(inputs):
+    return [{"house_number": inputs.houses[i], "dob": inputs.dobs[i]} for i in range(_route_samples(inputs))]
+
+
+@route_benchmark("POST", "/analyze/batch")
+def _(inputs):
+    # Inline-sized batches of mixed records
+    people = inputs.people(50)
+    records = people[:40] + [{"mobile_number": m, "dob": d} for m, d in zip(inputs.mobiles[:10], inputs.dobs[:10])]
+    return [{"records": records}] * max(_route_samples(inputs) // 20, 1)
+
+
+@route_benchmark("POST", "/analyze/batch/arrow")
+def _(inputs):
+    people = inputs.people(50)
+    records = people[:40] + [{"mobile_number": m, "dob": d} for m, d in zip(inputs.mobiles[:10], inputs.dobs[:10])]
+    return [{"records": records}] * max(_route_samples(inputs) // 20, 1)
+
+
+@route_benchmark("POST", "/search/dob")
+def _(inputs):
+    rng = inputs.rng
+    return [
+        {"mulank": rng.randint(1, 9), "bhagyank": rng.randint(1, 9), "gender": rng.choice(("male", "female")),
+         "present": [rng.randint(1, 9)], "limit": 100}
+        for _ in range(max(_route_samples(inputs) // 10, 1))
+    ]
+
+
+@route_benchmark("POST", "/recommend/numbers")
+def _(inputs):
+    return [{"dob": inputs.dobs[i], "kind": "mobile", "candidates": inputs.mobiles[:100], "top_k": 10}
+            for i in range(max(_route_samples(inputs) // 10, 1))]
+
+
+@route_benchmark("POST", "/match")
+def _(inputs):
+    # Ranked matches for one person in a group of 1000
+    dobs = inputs.dobs[:1000]
+    return [{"dobs": dobs, "target": inputs.rng.randrange(len(dobs)), "top_k": 10}
+            for _ in range(max(_route_samples(inputs) // 20, 1))]
+
+
+@benchmark("POST /stats/population", "route")
+def _(inputs, client):
+    # A 1000-row CSV upload per request
+    records = _population_records(inputs, 1000)
+    body = ("name,dob,gender,mobile\n" + "".join(
+        f"{r['name']},{r['dob']},{r['gender']},{r['mobile']}\n" for r in records
+    )).encode()
+
+    def upload(data):
+        status, _ = client.request("POST", "/stats/population", headers={"content-type": "text/csv"}, body=data)
+        if status != 200:
+            raise AssertionError(f"POST /stats/population returned {status}")
+    return upload, [(body,)] * max(_route_samples(inputs) // 20, 1)
+
+
+@route_benchmark("POST", "/suggest/name")
+def _(inputs):
+    return [{"name": inputs.names[i], "dob": inputs.dobs[i], "max_edits": 2, "limit": 10}
+            for i in range(max(_route_samples(inputs) // 10, 1))]
+
+
+@route_benchmark("POST", "/forecast/calendar")
+def _(inputs):
+    # A year of days for 20 people per request
+    return [{"dobs": inputs.dobs[i:i + 20], "target_date": "2025-01-01"}
+            for i in range(max(_route_samples(inputs) // 10, 1))]
+
+
+# ---------------------------------------------------------------- runner
+
+def coverage_gaps(app) -> list:
+    """
+    Public numerology functions and app routes without a benchmark.
+    """
+    gaps = []
+    for name, fn in inspect.getmembers(numerology, inspect.isfunction):
+        if not name.startswith("_") and fn.__module__ == "numerology" and f"numerology.{name}" not in BENCHMARKS:
+            gaps.append(f"numerology.{name}")
+    routes = {name.split(" [")[0] for name, (kind, _) in BENCHMARKS.items() if kind == "route"}
+    for route in app.routes:
+        for method in getattr(route, "methods", None) or ():
+            if method in ("GET", "POST") and route.path not in ("/openapi.json", "/docs", "/redoc", "/docs/oauth2-redirect") \
+                    and not route.path.startswith("/admin/"):
+                if f"{method} {route.path}" not in routes:
+                    gaps.append(f"{method} {route.path}")
+    return gaps
+
+
+def time_calls(fn, args_list: list, rounds: int, reset=None) -> float:
+    """
+    Best per-call time in microseconds over rounds passes through args_list.
+    """
+    best = float("inf")
+    for _ in range(rounds):
+        if reset is not None:
+            reset()
+        start = time.perf_counter()
+        for args in args_list:
+            fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best / len(args_list) * 1e6
+
+
+def load_baseline(path: str) -> dict:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--samples", type=int, default=2000, help="Inputs per function benchmark")
+    parser.add_argument("--rounds", type=int, default=5, help="Passes per benchmark; the best is kept")
+    parser.add_argument("--all-dobs", action="store_true", help="Run DOB functions over every date in 1900-2099")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown against the baseline before failing (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    import main as api
+    from asgi_client import ASGIClient
+
+    gaps = coverage_gaps(api.app)
+    if gaps:
+        print(f"warning: no benchmark for {', '.join(gaps)}", file=sys.stderr)
+
+    inputs = Inputs(args.samples, args.all_dobs)
+    client = ASGIClient(api.app)
+    baseline = None if args.save else load_baseline(args.baseline)
+    if baseline is None and not args.save:
+        print(f"No baseline at {args.baseline}; run with --save to create one", file=sys.stderr)
+        sys.exit(2)
+    if baseline is not None and (baseline.get("python"), baseline.get("machine")) != (
+        platform.python_version(), platform.platform(),
+    ):
+        print(f"warning: baseline was recorded on {baseline.get('machine')} with Python {baseline.get('python')}",
+              file=sys.stderr)
+    results = {}
+    regressions = []
+
+    print(f"{'benchmark':<46}{'us/call':>11}{'baseline':>11}{'change':>9}")
+    for name, (kind, setup) in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        fn, args_list, *reset = setup(inputs, client) if kind == "route" else setup(inputs)
+        reset = reset[0] if reset else None
+        # One untimed pass warms lazily built tables and imports
+        time_calls(fn, args_list[:50], 1, reset)
+        us = time_calls(fn, args_list, args.rounds, reset)
+        results[name] = {"us_per_call": round(us, 3), "calls": len(args_list)}
+
+        line = f"{name:<46}{us:>11.2f}"
+        previous = (baseline or {}).get("results", {}).get(name)
+        if previous:
+            change = us / previous["us_per_call"] - 1
+            line += f"{previous['us_per_call']:>11.2f}{change:>+8.0%}"
+            if change > args.threshold:
+                regressions.append((name, change))
+                line += "  REGRESSION"
+        print(line)
+    client.close()
+
+    if args.save:
+        if args.filter and os.path.exists(args.baseline):
+            # A filtered run only replaces the benchmarks it ran
+            merged = load_baseline(args.baseline)["results"]
+            merged.update(results)
+            results = merged
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "machine": platform.platform(),
+                "samples": args.samples,
+                "results": results,
+            }, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed more than {args.threshold:.0%}:", file=sys.stderr)
+        for name, change in regressions:
+            print(f"  {name}: {change:+.0%}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
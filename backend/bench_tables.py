@@ -0,0 +1,93 @@
+"""
+Per-call microbenchmark of the table-driven calculations in numerology.py
+against the per-call dict and list building they replaced.
+
+    python bench_tables.py
+"""
+import random
+import string
+import timeit
+
+import numerology
+
+
+def dict_name_number(name):
+    chaldean_map = {
+        'a': 1, 'i': 1, 'j': 1, 'q': 1, 'y': 1,
+        'b': 2, 'k': 2, 'r': 2,
+        'c': 3, 'g': 3, 'l': 3, 's': 3,
+        'd': 4, 'm': 4, 't': 4,
+        'e': 5, 'h': 5, 'n': 5, 'x': 5,
+        'u': 6, 'v': 6, 'w': 6,
+        'o': 7, 'z': 7,
+        'f': 8, 'p': 8
+    }
+    clean_name = ''.join(c.lower() for c in name if c.isalpha())
+    total_sum = sum(chaldean_map.get(char, 0) for char in clean_name)
+    return {"total_sum": total_sum, "single_digit": numerology.reduce_to_single_digit(total_sum)}
+
+
+def list_compatibility(mulank, number):
+    compatibility_data = {
+        1: {"lucky": [1, 2, 3, 5, 9], "unlucky": [8],       "neutral": [4, 6, 7]},
+        2: {"lucky": [1, 3, 5],       "unlucky": [4, 8, 9], "neutral": [2, 6, 7]},
+        3: {"lucky": [1, 2, 3, 5, 9], "unlucky": [6],       "neutral": [4, 7, 8]},
+        4: {"lucky": [1, 5, 6, 7, 8], "unlucky": [2, 9],    "neutral": [3, 4]},
+        5: {"lucky": [1, 2, 3, 5, 6], "unlucky": [],        "neutral": [4, 7, 8, 9]},
+        6: {"lucky": [1, 5, 6, 7],    "unlucky": [3],       "neutral": [2, 4, 8, 9]},
+        7: {"lucky": [1, 3, 4, 5, 6], "unlucky": [],        "neutral": [2, 7, 8, 9]},
+        8: {"lucky": [3, 5, 6, 7],    "unlucky": [1, 2],    "neutral": [4, 8, 9]},
+        9: {"lucky": [1, 2, 3, 9],    "unlucky": [4, 5],    "neutral": [6, 7, 8]},
+    }
+    data = compatibility_data.get(mulank, {"lucky": [], "unlucky": [], "neutral": []})
+    if number in data["lucky"]:
+        status = "Lucky"
+    elif number in data["unlucky"]:
+        status = "Unlucky"
+    else:
+        status = "Neutral"
+    return {"status": status, "lucky_numbers": data["lucky"]}
+
+
+def int_mobile_total(mobile_number):
+    digits = [int(d) for d in mobile_number if d.isdigit()]
+    total = sum(digits)
+    return {"total_sum": total, "single_digit": numerology.reduce_to_single_digit(total)}
+
+
+def per_call_ns(fn, args, repeat=5):
+    def run():
+        for a in args:
+            fn(*a)
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return best / len(args) * 1e9
+
+
+def main():
+    rng = random.Random(7)
+    letters = string.ascii_letters
+
+    def random_name():
+        return " ".join(
+            "".join(rng.choice(letters) for _ in range(rng.randint(3, 10)))
+            for _ in range(rng.randint(2, 3))
+        )
+
+    names = [(random_name(),) for _ in range(50_000)]
+    pairs = [(rng.randint(1, 9), rng.randint(1, 9)) for _ in range(50_000)]
+    mobiles = [("+91 " + "".join(rng.choice(string.digits) for _ in range(10)),) for _ in range(50_000)]
+    cases = [
+        ("calculate_name_number", dict_name_number, numerology.calculate_name_number, names),
+        ("get_compatibility", list_compatibility, numerology.get_compatibility, pairs),
+        ("calculate_mobile_total", int_mobile_total, numerology.calculate_mobile_total, mobiles),
+    ]
+
+    print(f"{'function':<26}{'per-call ns':>12}{'table ns':>10}{'speedup':>9}")
+    for name, old, new, args in cases:
+        old_ns = per_call_ns(old, args)
+        new_ns = per_call_ns(new, args)
+        print(f"{name:<26}{old_ns:>12.0f}{new_ns:>10.0f}{old_ns / new_ns:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmarks the NumPy kernels in vectorized.py against the scalar functions
+in numerology.py, after checking both give identical results.
+
+    python bench_vectorized.py            # 10^6 rows
+    python bench_vectorized.py --rows 100000
+"""
+import argparse
+import time
+
+import numpy as np
+
+import numerology
+import vectorized
+
+
+def timed(fn):
+    began = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - began
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    start = np.datetime64("1900-01-01")
+    span = (np.datetime64("2099-12-31") - start).astype(int) + 1
+    dates = start + rng.integers(0, span, args.rows)
+    male = rng.integers(0, 2, args.rows).astype(bool)
+    mobiles = np.char.add(rng.choice([b"9", b"8", b"7", b"6"], args.rows), rng.integers(0, 10**9, args.rows).astype("S9"))
+    target = np.datetime64("2025-06-15")
+
+    dob_strs = dates.astype(str).tolist()
+    genders = ["male" if m else "female" for m in male]
+    mobile_strs = [m.decode() for m in mobiles.tolist()]
+
+    kernels = [
+        ("mulank",
+         lambda: [numerology.calculate_mulank(d) for d in dob_strs],
+         lambda: vectorized.mulank(dates)),
+        ("bhagyank",
+         lambda: [numerology.calculate_bhagyank(d) for d in dob_strs],
+         lambda: vectorized.bhagyank(dates)),
+        ("kua",
+         lambda: [numerology.calculate_kua(d, g) for d, g in zip(dob_strs, genders)],
+         lambda: vectorized.kua(dates, male)),
+        ("personal_year",
+         lambda: [numerology.calculate_personal_periods(d, "2025-06-15")["current"]["personal_year"] for d in dob_strs],
+         lambda: vectorized.personal_periods(dates, target)[0]),
+        ("mobile_total",
+         lambda: [numerology.calculate_mobile_total(m)["single_digit"] for m in mobile_strs],
+         lambda: vectorized.mobile_totals(mobiles)[1]),
+    ]
+
+    print(f"--- {args.rows:,} rows ---")
+    print(f"{'kernel':<16}{'scalar s':>10}{'numpy s':>10}{'speedup':>10}")
+    for name, scalar, vector in kernels:
+        expected, scalar_s = timed(scalar)
+        actual, vector_s = timed(vector)
+        assert np.array_equal(np.asarray(expected), actual), f"{name} differs from scalar"
+        print(f"{name:<16}{scalar_s:>10.3f}{vector_s:>10.3f}{scalar_s / vector_s:>9.0f}x")
+
+    # Month and day periods share the personal_year pass above
+    pys, pms, pds = vectorized.personal_periods(dates, target)
+    for i in range(0, args.rows, max(1, args.rows // 1000)):
+        current = numerology.calculate_personal_periods(dob_strs[i], "2025-06-15")["current"]
+        assert (pys[i], pms[i], pds[i]) == (current["personal_year"], current["personal_month"], current["personal_day"])
+    print("All kernels identical to numerology.py")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Parse-once date of birth.
+
+Every DOB-based calculation in numerology.py used to split and int() the
+"YYYY-MM-DD" string again (one /analyze request parsed it around ten
+times) and none of them checked that the date exists. BirthDate parses
+and validates the string once, at the API boundary, and carries the
+derived values the calculations need:
+
+    dob = BirthDate.parse("1990-05-15")
+    dob.mulank, dob.bhagyank, dob.digit_total, dob.digits
+
+Instances are immutable and hash and compare by their text, so they work
+as cache keys wherever the string did, and str(dob) is the original
+text. All numerology functions accept either a BirthDate or a string;
+strings keep the old unvalidated behaviour.
+"""
+from datetime import date
+
+import tables
+
+
+def _root(n: int) -> int:
+    # Same as numerology.reduce_to_single_digit for n >= 1
+    return 1 + (n - 1) % 9
+
+
+class BirthDate:
+    __slots__ = (
+        "text", "year", "month", "day", "ordinal",
+        "digits", "digit_total", "mulank", "bhagyank", "kua_factor", "personal_year_base",
+    )
+
+    def __init__(self, year: int, month: int, day: int, text: str = None):
+        """
+        Raises ValueError if year-month-day is not a calendar date.
+        """
+        ordinal = date(year, month, day).toordinal()
+        if text is None:
+            text = f"{year:04d}-{month:02d}-{day:02d}"
+        digits = text.encode().translate(tables.DIGIT_BYTES)
+        digit_total = sum(digits)
+        kua_total = year // 10 % 10 + year % 10
+        init = object.__setattr__
+        init(self, "text", text)
+        init(self, "year", year)
+        init(self, "month", month)
+        init(self, "day", day)
+        init(self, "ordinal", ordinal)
+        # Value of each digit in the text, in order (bytes 0-9), for the Lo Shu Grid
+        init(self, "digits", digits)
+        # The unreduced Bhagyank / Life Path total
+        init(self, "digit_total", digit_total)
+        init(self, "mulank", _root(day))
+        init(self, "bhagyank", _root(digit_total))
+        # Last two digits of the year, summed and reduced (0 for years ending in 00)
+        init(self, "kua_factor", _root(kua_total) if kua_total else 0)
+        # Reduced birth day + reduced birth month
+        init(self, "personal_year_base", _root(day) + _root(month))
+
+    @classmethod
+    def parse(cls, text: str) -> "BirthDate":
+        """
+        Parses a YYYY-MM-DD string; raises ValueError for anything else,
+        including dates that do not exist such as 2023-02-30.
+        """
+        if type(text) is cls:
+            return text
+        if not isinstance(text, str):
+            raise ValueError(f"date of birth must be a YYYY-MM-DD string, got {type(text).__name__}")
+        parts = text.split("-")
+        if len(parts) != 3 or not (text.isascii() and "".join(parts).isdigit() and all(parts)):
+            raise ValueError(f"{text!r} is not a YYYY-MM-DD date")
+        try:
+            return cls(int(parts[0]), int(parts[1]), int(parts[2]), text)
+        except ValueError:
+            raise ValueError(f"{text!r} is not a valid calendar date") from None
+
+    @classmethod
+    def from_date(cls, value: date) -> "BirthDate":
+        return cls(value.year, value.month, value.day)
+
+    def to_date(self) -> date:
+        return date.fromordinal(self.ordinal)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("BirthDate is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("BirthDate is immutable")
+
+    def __reduce__(self):
+        # Slots plus the immutability guard need an explicit recipe for pickling (process pools)
+        return (BirthDate.parse, (self.text,))
+
+    def __eq__(self, other):
+        if type(other) is BirthDate:
+            return self.text == other.text
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.text)
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"BirthDate({self.text!r})"
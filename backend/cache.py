@@ -0,0 +1,465 @@
+"""
+Bounded caches for API results, with pluggable storage.
+
+Backends share one interface: get(key) returns the value or None,
+set(key, value, expires_at=None) stores it, plus clear() and stats().
+Keys are strings and values are JSON-serializable.
+
+- LRUCache: in-process LRU (the default).
+- SQLiteBackend: a local SQLite file (WAL + mmap) shared by every worker
+  on a host.
+- RedisBackend: a Redis-compatible server shared across hosts.
+- FakeRedis: an in-process stand-in for a Redis client, for tests.
+
+Shared backends are wrapped in FallbackBackend, which switches to an
+in-process LRU while the shared store is unavailable.
+
+AnalysisCache splits an /analyze response into the part that never
+changes for the same inputs and the personal periods, which depend on
+today's date and expire at local midnight.
+"""
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+import results
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class LRUCache:
+    """
+    Least-recently-used cache holding at most max_entries items.
+    ttl (seconds) is the default lifetime of an entry; None keeps entries
+    until they are evicted. set() can also take an absolute expires_at.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        # Sync routes, cache-backed /analyze calls and FallbackBackend all
+        # reach an LRUCache from threadpool threads, so entry moves and
+        # evictions are locked
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, expires_at: float = None):
+        if self.max_entries <= 0:
+            return
+        if expires_at is None and self.ttl:
+            expires_at = time.time() + self.ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class SQLiteBackend:
+    """
+    Cache table in a local SQLite file. Every worker process on the host
+    opens the same file, so entries computed by one worker serve all.
+    Least-recently-used rows beyond max_entries are pruned every
+    PRUNE_EVERY writes.
+    """
+
+    PRUNE_EVERY = 256
+
+    def __init__(self, path: str, namespace: str = "default", max_entries: int = 100000, ttl: float = None):
+        if not re.fullmatch(r"\w+", namespace):
+            raise ValueError(f"Invalid cache namespace: {namespace!r}")
+        self.path = path
+        self.table = f"cache_{namespace}"
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = threading.local()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections are per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA mmap_size=67108864")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, accessed REAL NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table} (accessed)")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, default=None):
+        conn = self._connect()
+        row = conn.execute(f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        now = time.time()
+        if row is None or (row[1] is not None and row[1] <= now):
+            self.misses += 1
+            return default
+        conn.execute(f"UPDATE {self.table} SET accessed = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value, expires_at: float = None):
+        if self.max_entries <= 0:
+            return
+        now = time.time()
+        if expires_at is None and self.ttl:
+            expires_at = now + self.ttl
+        conn = self._connect()
+        conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value, separators=(",", ":"), default=results.default), expires_at, now),
+        )
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self):
+        conn = self._connect()
+        conn.execute(f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+        excess = self._count() - self.max_entries
+        if excess > 0:
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY accessed LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+
+    def _count(self) -> int:
+        return self._connect().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def clear(self):
+        self._connect().execute(f"DELETE FROM {self.table}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "entries": self._count(),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+class RedisBackend:
+    """
+    Cache on a Redis-compatible server. Entries get a server-side expiry;
+    size limits and LRU eviction are left to the server's maxmemory policy.
+    client needs get/set(ex=)/delete/scan_iter, e.g. redis.Redis or FakeRedis.
+    """
+
+    def __init__(self, client, namespace: str = "default", ttl: float = None):
+        self.client = client
+        self.prefix = f"numerology:{namespace}:"
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, default=None):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key: str, value, expires_at: float = None):
+        ex = None
+        if expires_at is not None:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                return
+            ex = max(1, math.ceil(remaining))
+        elif self.ttl:
+            ex = max(1, math.ceil(self.ttl))
+        self.client.set(self.prefix + key, json.dumps(value, separators=(",", ":"), default=results.default), ex=ex)
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "redis",
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class FakeRedis:
+    """
+    In-process stand-in for the subset of the redis.Redis client used by
+    RedisBackend. available=False makes every call raise ConnectionError,
+    to exercise the fallback path.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self.available = True
+
+    def _check(self):
+        if not self.available:
+            raise ConnectionError("fake redis unavailable")
+
+    def get(self, name):
+        self._check()
+        entry = self._data.get(name)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._data[name]
+            return None
+        return value
+
+    def set(self, name, value, ex=None):
+        self._check()
+        if isinstance(value, str):
+            value = value.encode()
+        self._data[name] = (value, time.time() + ex if ex else None)
+        return True
+
+    def delete(self, *names):
+        self._check()
+        return sum(self._data.pop(name, None) is not None for name in names)
+
+    def scan_iter(self, match=None):
+        self._check()
+        prefix = match[:-1] if match and match.endswith("*") else match
+        return [name for name in list(self._data) if prefix is None or name.startswith(prefix)]
+
+
+class FallbackBackend:
+    """
+    Uses primary while it works. When a call fails, it logs the error and
+    serves from fallback for retry_after seconds before trying primary again.
+    """
+
+    def __init__(self, primary, fallback, retry_after: float = 30.0):
+        self.primary = primary
+        self.fallback = fallback
+        self.retry_after = retry_after
+        self.errors = 0
+        self._retry_at = 0.0
+
+    @property
+    def available(self) -> bool:
+        return time.time() >= self._retry_at
+
+    def _call(self, method: str, *args, **kwargs):
+        if self.available:
+            try:
+                return getattr(self.primary, method)(*args, **kwargs)
+            except Exception as e:
+                self.errors += 1
+                self._retry_at = time.time() + self.retry_after
+                logger.warning("Cache backend %s failed (%s); using in-process cache for %.0fs",
+                               type(self.primary).__name__, e, self.retry_after)
+        return getattr(self.fallback, method)(*args, **kwargs)
+
+    def get(self, key: str, default=None):
+        return self._call("get", key, default)
+
+    def set(self, key: str, value, expires_at: float = None):
+        return self._call("set", key, value, expires_at)
+
+    def clear(self):
+        self.fallback.clear()
+        self._call("clear")
+
+    def stats(self) -> dict:
+        try:
+            primary = self.primary.stats()
+        except Exception as e:
+            primary = {"error": str(e)}
+        return {
+            "backend": primary.get("backend", type(self.primary).__name__),
+            "available": self.available,
+            "errors": self.errors,
+            "primary": primary,
+            "fallback": self.fallback.stats(),
+        }
+
+
+def make_backend(url: str, namespace: str, max_entries: int = 10000, ttl: float = None):
+    """
+    Builds a backend from a URL:
+    memory://                   in-process LRU (default)
+    sqlite:///cache.db          SQLite file shared by workers on this host
+                                (relative path; sqlite:////abs/path for absolute)
+    redis://host:6379/0         Redis-compatible server (needs the redis package)
+    fake-redis://               in-process FakeRedis, for tests
+    Shared backends fall back to an in-process LRU if they cannot be
+    reached, at startup or later.
+    """
+    memory = LRUCache(max_entries, ttl)
+    if not url or url.startswith("memory://"):
+        return memory
+
+    try:
+        if url.startswith("sqlite://"):
+            path = url[len("sqlite:///"):]
+            if not path:
+                raise ValueError("sqlite cache URL needs a file path")
+            primary = SQLiteBackend(path, namespace, max_entries, ttl)
+        elif url.startswith("fake-redis://"):
+            primary = RedisBackend(FakeRedis(), namespace, ttl)
+        elif url.startswith(("redis://", "rediss://", "unix://")):
+            import redis
+            primary = RedisBackend(redis.Redis.from_url(url, socket_timeout=0.5), namespace, ttl)
+        else:
+            raise ValueError(f"Unsupported cache URL: {url}")
+    except Exception as e:
+        logger.warning("Cache backend %s unavailable (%s); using in-process cache", url, e)
+        return memory
+
+    return FallbackBackend(primary, memory)
+
+
+def next_midnight() -> float:
+    """
+    Timestamp of the next local midnight, when personal periods roll over.
+    """
+    tomorrow = date.today() + timedelta(days=1)
+    return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
+
+def normalize_name(name: str) -> str:
+    # Whitespace runs never change the result. Case is folded for ASCII
+    # names only, since some non-ASCII letters change length when cased.
+    name = " ".join(name.split())
+    return name.lower() if name.isascii() else name
+
+
+def normalize_gender(gender: str) -> str:
+    # calculate_kua treats anything other than "male" as female
+    return "male" if gender.lower() == "male" else "female"
+
+
+class AnalysisCache:
+    """
+    Caches /analyze results in two parts:
+    - static: everything except periods, keyed on normalized
+      name/dob/gender, the essence window and the numerology system;
+      lives until evicted (or ttl).
+    - periods: keyed on dob and today's date; expires at midnight.
+    Each part lives in its own backend namespace.
+    """
+
+    def __init__(self, static=None, periods=None):
+        self.static = static if static is not None else LRUCache()
+        self.periods = periods if periods is not None else LRUCache()
+
+    @property
+    def blocking(self) -> bool:
+        """
+        True when a backend does I/O (SQLite, Redis), so lookups belong
+        off the event loop.
+        """
+        return not (isinstance(self.static, LRUCache) and isinstance(self.periods, LRUCache))
+
+    def static_key(self, name: str, dob: str, gender: str, start_age: int, end_age: int, system=None) -> str:
+        parts = [normalize_name(name), str(dob), normalize_gender(gender), start_age, end_age]
+        if system is not None:
+            # Built-in system keys carry no system name, so existing entries stay valid
+            parts.append(system.name)
+        return json.dumps(parts)
+
+    def get_static(self, key: str):
+        return self.static.get(key)
+
+    def set_static(self, key: str, value: dict):
+        self.static.set(key, value)
+
+    def get_periods(self, dob: str):
+        return self.periods.get(f"{dob}|{date.today().isoformat()}")
+
+    def set_periods(self, dob: str, value: dict):
+        self.periods.set(f"{dob}|{date.today().isoformat()}", value, expires_at=next_midnight())
+
+    def clear(self):
+        self.static.clear()
+        self.periods.clear()
+
+    def stats(self) -> dict:
+        return {"static": self.static.stats(), "periods": self.periods.stats()}
+
+
+def analysis_cache_from_env() -> AnalysisCache:
+    """
+    CACHE_URL: storage backend, see make_backend (default memory://).
+    ANALYZE_CACHE_SIZE: max entries per part (default 10000, 0 disables).
+    ANALYZE_CACHE_TTL: seconds the static part lives (default 0, no expiry).
+    """
+    url = os.getenv("CACHE_URL", "memory://")
+    size = int(os.getenv("ANALYZE_CACHE_SIZE", "10000"))
+    ttl = float(os.getenv("ANALYZE_CACHE_TTL", "0")) or None
+    return AnalysisCache(
+        static=make_backend(url, "analyze_static", size, ttl),
+        periods=make_backend(url, "analyze_periods", size),
+    )
@@ -0,0 +1,155 @@
+"""
+Personal Year / Month / Day calendars over date ranges.
+
+calculate_personal_periods answers for a single date. Planners need a
+value for every day over several years, and re-reducing each date from
+scratch repeats the same work: the Personal Year only changes on Jan 1,
+the Personal Month on the 1st, and within a month the Personal Day just
+steps 1, 2, ... 9, 1, ... (PD = PM + day, reduced). So the generators
+here reduce once per year and once per month and count the days.
+
+- iter_days(dob, start, end): (date, py, pm, pd) for every day.
+- iter_months(dob, start, end): one dict per calendar month with that
+  month's Personal Days as a list.
+- encode_ndjson(dobs, start, end): the months of many people as NDJSON
+  bytes, in chunks of about CHUNK_BYTES for streaming responses.
+
+vectorized.personal_calendar computes the same values as NumPy arrays
+for many DOBs at once.
+"""
+import calendar
+from datetime import date, timedelta
+
+import numerology
+
+CHUNK_BYTES = 64 * 1024
+
+# (personal_month, first_day, last_day) -> encoded personal_days list; at most 9 * 31 * 31 entries
+_day_lists = {}
+
+
+def add_years(day: date, years: int) -> date:
+    """
+    The same calendar day years later; Feb 29 moves to Mar 1 in common years.
+    """
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:
+        return date(day.year + years, 3, 1)
+
+
+def default_range(target_date: date = None, years: int = 1) -> tuple:
+    """
+    (start, end) covering years whole years from target_date (today if omitted).
+    """
+    start = target_date or date.today()
+    return start, add_years(start, years) - timedelta(days=1)
+
+
+def _months(start: date, end: date):
+    """
+    (year, month, first_day, last_day) for each calendar month touched by start..end.
+    """
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        first_day = start.day if (year, month) == (start.year, start.month) else 1
+        if (year, month) == (end.year, end.month):
+            last_day = end.day
+        else:
+            last_day = calendar.monthrange(year, month)[1]
+        yield year, month, first_day, last_day
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+
+
+def _periods(dob: str, start: date, end: date):
+    """
+    (year, month, first_day, last_day, py, pm) per month; py is reduced once per year.
+    """
+    base = numerology.personal_year_base(dob)
+    year = py = None
+    for y, month, first_day, last_day in _months(start, end):
+        if y != year:
+            year, py = y, numerology.personal_year(base, y)
+        yield y, month, first_day, last_day, py, numerology.personal_month(py, month)
+
+
+def iter_days(dob: str, start: date, end: date):
+    """
+    Yields (date, personal_year, personal_month, personal_day) for each day from start to end inclusive.
+    """
+    for year, month, first_day, last_day, py, pm in _periods(dob, start, end):
+        pd = numerology.personal_day(pm, first_day)
+        for day in range(first_day, last_day + 1):
+            yield date(year, month, day), py, pm, pd
+            pd = pd % 9 + 1
+
+
+def iter_months(dob: str, start: date, end: date):
+    """
+    Yields one dict per calendar month from start to end inclusive; personal_days[0]
+    belongs to first_day (the 1st except in a range's first month).
+    """
+    for year, month, first_day, last_day, py, pm in _periods(dob, start, end):
+        pd = numerology.personal_day(pm, first_day)
+        days = []
+        for _ in range(first_day, last_day + 1):
+            days.append(pd)
+            pd = pd % 9 + 1
+        yield {
+            "dob": dob,
+            "year": year,
+            "month": month,
+            "personal_year": py,
+            "personal_month": pm,
+            "first_day": first_day,
+            "personal_days": days,
+        }
+
+
+def _day_list(pm: int, first_day: int, last_day: int) -> str:
+    key = (pm, first_day, last_day)
+    encoded = _day_lists.get(key)
+    if encoded is None:
+        pd = numerology.personal_day(pm, first_day)
+        days = []
+        for _ in range(first_day, last_day + 1):
+            days.append(str(pd))
+            pd = pd % 9 + 1
+        encoded = _day_lists[key] = "[" + ",".join(days) + "]"
+    return encoded
+
+
+def encode_ndjson(dobs: list, start: date, end: date, chunk_bytes: int = CHUNK_BYTES):
+    """
+    Yields the iter_months dicts of every DOB as NDJSON lines, batched into
+    byte chunks of about chunk_bytes. DOBs are BirthDates or already
+    validated YYYY-MM-DD strings; they are written into the JSON unescaped.
+
+    A month's personal_days list depends only on its Personal Month and day
+    range, so the encoded lists are shared across people and years.
+    """
+    months = list(_months(start, end))
+    parts = []
+    size = 0
+    for dob in dobs:
+        base = numerology.personal_year_base(dob)
+        year = py = None
+        for y, month, first_day, last_day in months:
+            if y != year:
+                year, py = y, numerology.personal_year(base, y)
+            pm = numerology.personal_month(py, month)
+            line = (
+                f'{{"dob":"{dob}","year":{y},"month":{month},"personal_year":{py},'
+                f'"personal_month":{pm},"first_day":{first_day},'
+                f'"personal_days":{_day_list(pm, first_day, last_day)}}}\n'
+            )
+            parts.append(line)
+            size += len(line)
+            if size >= chunk_bytes:
+                yield "".join(parts).encode()
+                parts = []
+                size = 0
+    if parts:
+        yield "".join(parts).encode()
@@ -0,0 +1,183 @@
+"""
+Columnar (Apache Arrow / Parquet) output for bulk scoring.
+
+One row per scored record, with the numbers an analytics load needs as
+typed columns instead of nested JSON:
+
+    name, dob, gender, mulank, bhagyank, kua, name_total, name_number,
+    {mobile,vehicle,house}_{total,compound,status},
+    loshu_1..loshu_9, pinnacle_1..4, challenge_1..4, error
+
+Columns that do not apply to a record (no mobile given, an error) are
+null. Rows are built a chunk at a time (record_batch) and written by
+BatchWriter, which groups chunks into row groups of ROWS_PER_GROUP, so
+memory stays bounded by one row group whatever the input size:
+
+    python numerology_cli.py score clients.csv -o scored.parquet
+    python numerology_cli.py score clients.csv --output-format arrow -o scored.arrow
+
+The API streams the same columns as Arrow IPC (stream_header,
+serialize_batch, STREAM_END). pyarrow is optional; without it the
+functions here raise RuntimeError.
+"""
+import analysis
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+FORMATS = ("arrow", "parquet")
+
+# Rows per Parquet row group / Arrow record batch in written files
+ROWS_PER_GROUP = 65536
+
+# End-of-stream marker of the Arrow IPC streaming format
+STREAM_END = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+GRID_COLUMNS = [f"loshu_{d}" for d in range(1, 10)]
+PINNACLE_COLUMNS = [f"pinnacle_{i}" for i in range(1, 5)]
+CHALLENGE_COLUMNS = [f"challenge_{i}" for i in range(1, 5)]
+
+# (column, Arrow type name); every column is nullable
+COLUMNS = (
+    [("name", "string"), ("dob", "string"), ("gender", "string"),
+     ("mulank", "int8"), ("bhagyank", "int8"), ("kua", "int8"),
+     ("name_total", "int32"), ("name_number", "int8")]
+    + [column for kind in analysis.NUMBER_TOTALS for column in (
+        (f"{kind}_total", "int8"), (f"{kind}_compound", "int32"), (f"{kind}_status", "string"),
+    )]
+    + [(column, "int8") for column in GRID_COLUMNS + PINNACLE_COLUMNS + CHALLENGE_COLUMNS]
+    + [("error", "string")]
+)
+COLUMN_NAMES = [name for name, _ in COLUMNS]
+
+_schema = None
+
+
+def require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Arrow/Parquet output needs pyarrow (pip install pyarrow)")
+
+
+def schema():
+    global _schema
+    require_pyarrow()
+    if _schema is None:
+        _schema = pa.schema([(name, getattr(pa, type_name)()) for name, type_name in COLUMNS])
+    return _schema
+
+
+def _fill_person(columns: dict, i: int, person: dict):
+    columns["mulank"][i] = person["mulank"]
+    columns["bhagyank"][i] = person["bhagyank"]
+    columns["kua"][i] = person["kua"]
+    columns["name_total"][i] = person["name_number"]["total_sum"]
+    columns["name_number"][i] = person["name_number"]["single_digit"]
+    grid = person["loshu"]
+    for column, count in zip(GRID_COLUMNS, grid.counts):
+        columns[column][i] = count
+    cycles = person["life_roadmap"]["pinnacles_challenges"]
+    for column, value in zip(PINNACLE_COLUMNS, cycles.pinnacles):
+        columns[column][i] = value
+    for column, value in zip(CHALLENGE_COLUMNS, cycles.challenges):
+        columns[column][i] = value
+
+
+def _fill_number(columns: dict, i: int, kind: str, data: dict):
+    columns["mulank"][i] = data["mulank"]
+    columns["bhagyank"][i] = data["bhagyank"]
+    columns[f"{kind}_total"][i] = data[f"{kind}_total"]
+    columns[f"{kind}_compound"][i] = data[f"{kind}_compound"]
+    columns[f"{kind}_status"][i] = data["compatibility"]["status"]
+
+
+def record_batch(scored: list):
+    """
+    Builds one RecordBatch from scored results in the numerology_cli
+    shape: {"name", "dob", "gender"} plus "analysis" (an analyze_person
+    payload), mobile/vehicle/house (analyze_number payloads) and "error",
+    each present or not.
+    """
+    require_pyarrow()
+    count = len(scored)
+    columns = {name: [None] * count for name in COLUMN_NAMES}
+    for i, result in enumerate(scored):
+        columns["name"][i] = result.get("name")
+        columns["dob"][i] = result.get("dob")
+        columns["gender"][i] = result.get("gender")
+        person = result.get("analysis")
+        if person:
+            _fill_person(columns, i, person)
+        for kind in analysis.NUMBER_TOTALS:
+            data = result.get(kind)
+            if data:
+                _fill_number(columns, i, kind, data)
+        columns["error"][i] = result.get("error")
+    arrays = [pa.array(columns[field.name], type=field.type) for field in schema()]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema())
+
+
+class BatchWriter:
+    """
+    Writes record batches to an Arrow IPC file or a Parquet file, buffering
+    them into groups of rows_per_group rows. sink is a path or a binary
+    file object.
+    """
+
+    def __init__(self, sink, output_format: str, rows_per_group: int = ROWS_PER_GROUP):
+        require_pyarrow()
+        if output_format not in FORMATS:
+            raise ValueError(f"output_format must be one of {FORMATS}")
+        if output_format == "parquet":
+            self.writer = pq.ParquetWriter(sink, schema())
+        else:
+            self.writer = pa.ipc.new_file(sink, schema())
+        self.rows_per_group = rows_per_group
+        self.pending = []
+        self.pending_rows = 0
+        self.rows = 0
+
+    def write(self, batch):
+        self.pending.append(batch)
+        self.pending_rows += batch.num_rows
+        if self.pending_rows >= self.rows_per_group:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        table = pa.Table.from_batches(self.pending, schema=schema()).combine_chunks()
+        # One row group / record batch per flush
+        self.writer.write_table(table, self.pending_rows)
+        self.rows += self.pending_rows
+        self.pending = []
+        self.pending_rows = 0
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def stream_header() -> bytes:
+    """
+    The schema message that opens an Arrow IPC stream.
+    """
+    return schema().serialize().to_pybytes()
+
+
+def serialize_batch(batch) -> bytes:
+    """
+    One record batch as an Arrow IPC stream message. A stream is
+    stream_header(), any number of these, then STREAM_END.
+    """
+    return batch.serialize().to_pybytes()
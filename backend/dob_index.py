@@ -0,0 +1,139 @@
+"""
+Inverted index over the DOB profile table for reverse searches, e.g.
+"dates in 1990-1995 with Mulank 5, Bhagyank 1 and 7 and 8 present in
+the Lo Shu grid".
+
+Every attribute value maps to a bitset (a Python int) with bit i set when
+table row i has that value. A query ANDs the bitsets together and pages
+through the set bits, so it never touches individual dates until the
+requested page is produced.
+"""
+from datetime import date
+
+import dob_table
+
+GENDERS = ("male", "female")
+
+
+def _bitset(rows, size: int) -> int:
+    """
+    Packs the row indices into an int with those bits set.
+    """
+    packed = bytearray((size + 7) // 8)
+    for i in rows:
+        packed[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(packed, "little")
+
+
+class DobIndex:
+    def __init__(self, table: dob_table.DobTable = None):
+        self.table = table or dob_table.get_table()
+        size = self.table.size
+        self.all_rows = (1 << size) - 1
+
+        mulank = {v: [] for v in range(1, 10)}
+        bhagyank = {v: [] for v in range(1, 10)}
+        # Kua is 0 for male births in 2009 (9 - 9), so it spans 0-9
+        kua = {g: {v: [] for v in range(10)} for g in GENDERS}
+        base_present = {d: [] for d in range(1, 10)}
+        pinnacles = {}
+        challenges = {}
+
+        t = self.table
+        for i in range(size):
+            mulank[t.mulank[i]].append(i)
+            bhagyank[t.bhagyank[i]].append(i)
+            kua["male"][t.kua_male[i]].append(i)
+            kua["female"][t.kua_female[i]].append(i)
+            row = i * 9
+            for d in range(9):
+                if t.grid[row + d]:
+                    base_present[d + 1].append(i)
+            row = i * 4
+            pinnacles.setdefault(tuple(t.pinnacles[row:row + 4]), []).append(i)
+            challenges.setdefault(tuple(t.challenges[row:row + 4]), []).append(i)
+
+        self.mulank = {v: _bitset(rows, size) for v, rows in mulank.items()}
+        self.bhagyank = {v: _bitset(rows, size) for v, rows in bhagyank.items()}
+        self.kua = {g: {v: _bitset(rows, size) for v, rows in by_value.items()} for g, by_value in kua.items()}
+        # A digit is present when layers 1-3 put it in the grid or it is the Kua digit
+        base = {d: _bitset(rows, size) for d, rows in base_present.items()}
+        self.present = {g: {d: base[d] | self.kua[g][d] for d in range(1, 10)} for g in GENDERS}
+        self.pinnacles = {key: _bitset(rows, size) for key, rows in pinnacles.items()}
+        self.challenges = {key: _bitset(rows, size) for key, rows in challenges.items()}
+
+    def _range_mask(self, start: date = None, end: date = None) -> int:
+        lo = 0 if start is None else max(0, start.toordinal() - self.table.base)
+        hi = self.table.size - 1 if end is None else min(self.table.size - 1, end.toordinal() - self.table.base)
+        if hi < lo:
+            return 0
+        return ((1 << (hi + 1)) - 1) ^ ((1 << lo) - 1)
+
+    def match(self, mulank: int = None, bhagyank: int = None, kua: int = None, gender: str = None,
+              present=(), missing=(), pinnacles=None, challenges=None,
+              start: date = None, end: date = None) -> int:
+        """
+        Returns the bitset of rows matching every given criterion.
+        gender is required for kua, present and missing, since the Kua digit
+        is part of the Lo Shu grid.
+        """
+        if (kua is not None or present or missing) and gender is None:
+            raise ValueError("gender is required to search by kua or Lo Shu digits")
+        if gender is not None:
+            gender = "male" if gender.lower() == "male" else "female"
+
+        bits = self._range_mask(start, end)
+        if mulank is not None:
+            bits &= self.mulank.get(mulank, 0)
+        if bhagyank is not None:
+            bits &= self.bhagyank.get(bhagyank, 0)
+        if kua is not None:
+            bits &= self.kua[gender].get(kua, 0)
+        for digit in present:
+            bits &= self.present[gender].get(digit, 0)
+        for digit in missing:
+            bits &= self.all_rows ^ self.present[gender].get(digit, 0)
+        if pinnacles is not None:
+            bits &= self.pinnacles.get(tuple(pinnacles), 0)
+        if challenges is not None:
+            bits &= self.challenges.get(tuple(challenges), 0)
+        return bits
+
+    def page(self, bits: int, offset: int = 0, limit: int = 100) -> list:
+        """
+        Returns the ISO dates of set bits offset to offset + limit, in date order.
+        """
+        # bin() is C-speed; reversed, character k is row k
+        flags = bin(bits)[:1:-1]
+        dates = []
+        pos = -1
+        for _ in range(offset + 1):
+            pos = flags.find("1", pos + 1)
+            if pos < 0:
+                return dates
+        while pos >= 0 and len(dates) < limit:
+            dates.append(date.fromordinal(self.table.base + pos).isoformat())
+            pos = flags.find("1", pos + 1)
+        return dates
+
+    def search(self, offset: int = 0, limit: int = 100, **criteria) -> dict:
+        bits = self.match(**criteria)
+        return {
+            "total": bin(bits).count("1"),
+            "offset": offset,
+            "limit": limit,
+            "dates": self.page(bits, offset, limit),
+        }
+
+
+_index = None
+
+
+def get_index() -> DobIndex:
+    """
+    Returns the process-wide index, building it on first use.
+    """
+    global _index
+    if _index is None:
+        _index = DobIndex()
+    return _index
@@ -0,0 +1,193 @@
+"""
+Precomputed DOB profile table.
+
+Every result that depends only on the date of birth (Mulank, Bhagyank,
+Kua for both genders, the Lo Shu base grid and the Pinnacles/Challenges)
+is computed once for every calendar date from 1900-01-01 to 2099-12-31
+(the range calculate_kua supports) and stored in flat byte arrays
+indexed by day ordinal. A lookup is then a handful of array reads.
+"""
+import sys
+import time
+from array import array
+from datetime import date
+
+import numerology
+from birthdate import BirthDate
+from results import LoShuGrid, PinnacleCycles
+
+TABLE_START = date(1900, 1, 1)
+TABLE_END = date(2099, 12, 31)
+
+def parse_dob_ordinal(dob: str):
+    """
+    Returns the proleptic ordinal for a strict YYYY-MM-DD string, or None
+    if the string is not a valid all-digit calendar date.
+    """
+    parts = dob.split("-")
+    if len(parts) != 3 or not all(p.isdigit() for p in parts):
+        return None
+    try:
+        return date(int(parts[0]), int(parts[1]), int(parts[2])).toordinal()
+    except ValueError:
+        return None
+
+
+class DobTable:
+    """
+    Array-backed table of DOB-only results keyed by day ordinal.
+
+    Columns are one byte per date. The Lo Shu grid is stored without the
+    Kua layer (9 bytes per date) so one grid serves both genders; the Kua
+    digit is added at lookup time.
+    """
+
+    def __init__(self, start: date = TABLE_START, end: date = TABLE_END):
+        self.start = start
+        self.end = end
+        self.base = start.toordinal()
+        self.size = end.toordinal() - self.base + 1
+
+        self.mulank = array("B", bytes(self.size))
+        self.bhagyank = array("B", bytes(self.size))
+        self.kua_male = array("B", bytes(self.size))
+        self.kua_female = array("B", bytes(self.size))
+        self.first_pinnacle_end = array("B", bytes(self.size))
+        # 4 pinnacles / 4 challenges per date, row-major
+        self.pinnacles = bytearray(self.size * 4)
+        self.challenges = bytearray(self.size * 4)
+        # Lo Shu counts for digits 1-9 (layers 1-3), row-major
+        self.grid = bytearray(self.size * 9)
+
+        began = time.perf_counter()
+        self._build()
+        self.build_seconds = time.perf_counter() - began
+
+    def _build(self):
+        for i in range(self.size):
+            d = date.fromordinal(self.base + i)
+            dob = f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
+
+            mulank = numerology.calculate_mulank(dob)
+            bhagyank = numerology.calculate_bhagyank(dob)
+            self.mulank[i] = mulank
+            self.bhagyank[i] = bhagyank
+            self.kua_male[i] = numerology.calculate_kua(dob, "male")
+            self.kua_female[i] = numerology.calculate_kua(dob, "female")
+
+            # Kua 0 falls outside the 1-9 grid, so this yields layers 1-3 only
+            row = i * 9
+            self.grid[row:row + 9] = numerology.lo_shu_grid(dob, mulank, bhagyank, 0).counts
+
+            cycles = numerology.pinnacle_cycles(dob)
+            row = i * 4
+            self.pinnacles[row:row + 4] = cycles.pinnacles
+            self.challenges[row:row + 4] = cycles.challenges
+            self.first_pinnacle_end[i] = cycles.first_end
+
+    def index(self, dob: str):
+        """
+        Returns the row index for dob, or None if it is malformed or out of range.
+        """
+        ordinal = dob.ordinal if type(dob) is BirthDate else parse_dob_ordinal(dob)
+        if ordinal is None:
+            return None
+        i = ordinal - self.base
+        if 0 <= i < self.size:
+            return i
+        return None
+
+    def kua(self, i: int, gender: str) -> int:
+        if gender.lower() == "male":
+            return self.kua_male[i]
+        return self.kua_female[i]
+
+    def lo_shu(self, i: int, kua: int) -> LoShuGrid:
+        row = i * 9
+        counts = self.grid[row:row + 9]
+        if 1 <= kua <= 9:
+            counts[kua - 1] += 1
+        return LoShuGrid(counts)
+
+    def pinnacles_and_challenges(self, i: int) -> PinnacleCycles:
+        row = i * 4
+        return PinnacleCycles(
+            self.pinnacles[row:row + 4],
+            self.challenges[row:row + 4],
+            self.first_pinnacle_end[i],
+        )
+
+    def lookup(self, dob: str, gender: str):
+        """
+        Returns every DOB-only result for dob/gender, or None if dob is not
+        covered by the table (callers should then compute directly).
+        """
+        i = self.index(dob)
+        if i is None:
+            return None
+        kua = self.kua(i, gender)
+        return {
+            "mulank": self.mulank[i],
+            "bhagyank": self.bhagyank[i],
+            "kua": kua,
+            "loshu": self.lo_shu(i, kua),
+            "pinnacles_challenges": self.pinnacles_and_challenges(i),
+        }
+
+    def nbytes(self) -> int:
+        columns = [
+            self.mulank, self.bhagyank, self.kua_male, self.kua_female,
+            self.first_pinnacle_end, self.pinnacles, self.challenges, self.grid,
+        ]
+        return sum(sys.getsizeof(c) for c in columns)
+
+    def stats(self) -> dict:
+        return {
+            "rows": self.size,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "build_seconds": round(self.build_seconds, 3),
+            "bytes": self.nbytes(),
+        }
+
+    def verify(self) -> list:
+        """
+        Recomputes every row with the functions in numerology.py and returns
+        a list of (dob, gender) pairs whose table lookup disagrees.
+        """
+        mismatches = []
+        for i in range(self.size):
+            d = date.fromordinal(self.base + i)
+            dob = f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
+            mulank = numerology.calculate_mulank(dob)
+            bhagyank = numerology.calculate_bhagyank(dob)
+            cycles = numerology.pinnacle_cycles(dob)
+            for gender in ("male", "female"):
+                kua = numerology.calculate_kua(dob, gender)
+                expected = {
+                    "mulank": mulank,
+                    "bhagyank": bhagyank,
+                    "kua": kua,
+                    "loshu": numerology.lo_shu_grid(dob, mulank, bhagyank, kua),
+                    "pinnacles_challenges": cycles,
+                }
+                if self.lookup(dob, gender) != expected:
+                    mismatches.append((dob, gender))
+        return mismatches
+
+
+_table = None
+
+
+def get_table() -> DobTable:
+    """
+    Returns the process-wide table, building it on first use.
+    """
+    global _table
+    if _table is None:
+        _table = DobTable()
+    return _table
+
+
+def lookup(dob: str, gender: str):
+    return get_table().lookup(dob, gender)
@@ -0,0 +1,130 @@
+"""
+Bounded process pool for CPU-heavy batch work.
+
+Each batch request is admitted as one job. At most max_jobs run at once;
+further requests are rejected immediately (the route answers 503) rather
+than queued, so a flood of batch uploads cannot build an unbounded
+backlog. Within a job, at most `window` chunks are in flight, which keeps
+memory flat and leaves pool capacity for other jobs.
+
+Single-record routes never touch the pool; they run inline on the event loop.
+"""
+import asyncio
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+
+class BatchJob:
+    """
+    An admitted job's slot. release() is idempotent so it can be called from
+    both the response stream and its cleanup task.
+    """
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.owner.active_jobs -= 1
+
+
+class BoundedExecutor:
+    def __init__(self, workers: int = None, max_jobs: int = None, window: int = 2):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_jobs = max_jobs or 2 * self.workers
+        self.window = window
+        self._pool = None
+        self.active_jobs = 0
+        self.queued_tasks = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.completed_tasks = 0
+        self.failed_tasks = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Created on first use, after the DOB table is built, so forked
+        # workers inherit it instead of rebuilding it
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def try_admit(self):
+        """
+        Claims a job slot, returning a BatchJob to release() when the work is
+        done, or None (counting a rejection) when all max_jobs slots are busy.
+        """
+        if self.active_jobs >= self.max_jobs:
+            self.rejected += 1
+            return None
+        self.active_jobs += 1
+        self.admitted += 1
+        return BatchJob(self)
+
+    async def run(self, fn, *args):
+        """
+        Runs fn(*args) in the pool and waits for the result.
+        """
+        loop = asyncio.get_running_loop()
+        self.queued_tasks += 1
+        try:
+            result = await loop.run_in_executor(self._get_pool(), fn, *args)
+        except Exception:
+            self.failed_tasks += 1
+            raise
+        finally:
+            self.queued_tasks -= 1
+        self.completed_tasks += 1
+        return result
+
+    async def map_ordered(self, fn, chunks):
+        """
+        Async generator yielding fn(chunk) for each chunk in input order,
+        with at most `window` chunks submitted ahead of the consumer.
+        """
+        pending = []
+        try:
+            for chunk in chunks:
+                pending.append(asyncio.ensure_future(self.run(fn, chunk)))
+                if len(pending) >= self.window:
+                    yield await pending.pop(0)
+            while pending:
+                yield await pending.pop(0)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def shutdown(self):
+        if self._pool is not None:
+            if sys.version_info >= (3, 9):
+                self._pool.shutdown(cancel_futures=True)
+            else:  # cancel_futures is new in 3.9
+                self._pool.shutdown()
+            self._pool = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_jobs": self.max_jobs,
+            "window": self.window,
+            "active_jobs": self.active_jobs,
+            "queued_tasks": self.queued_tasks,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "completed_tasks": self.completed_tasks,
+            "failed_tasks": self.failed_tasks,
+        }
+
+
+def executor_from_env() -> BoundedExecutor:
+    """
+    BATCH_WORKERS: pool processes (default: CPU count).
+    BATCH_MAX_JOBS: concurrent batch requests before 503 (default: 2 x workers).
+    BATCH_WINDOW: chunks in flight per batch request (default: 2).
+    """
+    workers = int(os.getenv("BATCH_WORKERS", "0")) or None
+    max_jobs = int(os.getenv("BATCH_MAX_JOBS", "0")) or None
+    window = int(os.getenv("BATCH_WINDOW", "2"))
+    return BoundedExecutor(workers, max_jobs, window)
@@ -0,0 +1,121 @@
+"""
+Direct-to-bytes JSON encoding for API responses.
+
+Encodes payloads with orjson when it is installed (stdlib json otherwise),
+bypassing FastAPI's jsonable_encoder. For /analyze, the sections that do
+not change for the same inputs are kept as pre-encoded byte fragments, so
+a repeat request only concatenates bytes:
+
+    {"mulank":..,"bhagyank":..,"kua":..,"name_number":..,"loshu":..,   <- head (static)
+    "periods":{..},                                                     <- per dob per day
+    "life_roadmap":{..}}                                                <- tail (static)
+
+Output is byte-identical to FastAPI's default JSONResponse.
+"""
+import json
+from datetime import date
+
+import analysis
+import metrics
+import numerology
+import results
+from cache import LRUCache, next_midnight
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+if orjson is not None:
+    def _default(obj):
+        # Essence timelines go in as pre-encoded text rather than 101 dicts
+        if type(obj) is results.EssenceTimeline:
+            return orjson.Fragment(obj.json_text())
+        return results.default(obj)
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=_default)
+else:
+    def dumps(obj) -> bytes:
+        # Same settings as starlette's JSONResponse.render
+        return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+                          default=results.default).encode("utf-8")
+
+
+def encode_static(static: dict) -> tuple:
+    """
+    Splits static_analysis output into the (head, tail) byte fragments
+    that surround "periods" in the /analyze response.
+    """
+    head = b"".join([
+        b'{"mulank":', dumps(static["mulank"]),
+        b',"bhagyank":', dumps(static["bhagyank"]),
+        b',"kua":', dumps(static["kua"]),
+        b',"name_number":', dumps(static["name_number"]),
+        b',"loshu":', dumps(static["loshu"]),
+        b',',
+    ])
+    tail = b"".join([
+        b'"life_roadmap":{"pinnacles_challenges":', dumps(static["pinnacles_challenges"]),
+        b',"essence":', dumps(static["essence"]),
+        b'}}',
+    ])
+    return head, tail
+
+
+def encode_periods(periods: dict) -> bytes:
+    return b'"periods":' + dumps(periods) + b','
+
+
+class FragmentCache:
+    """
+    Per-process cache of encoded /analyze fragments, layered over an
+    AnalysisCache that holds the decoded results.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.static = LRUCache(max_entries)
+        self.periods = LRUCache(max_entries)
+
+    def analyze_person(self, analysis_cache, name: str, dob: str, gender: str,
+                       essence_start_age: int = 0, essence_end_age: int = 100, system=None) -> bytes:
+        """
+        Encoded /analyze payload; analysis_cache is the cache.AnalysisCache consulted
+        when a fragment is not already encoded.
+        """
+        key = analysis_cache.static_key(name, dob, gender, essence_start_age, essence_end_age, system)
+        parts = self.static.get(key)
+        if parts is None:
+            with metrics.stage("cache_get"):
+                static = analysis_cache.get_static(key)
+            if static is None:
+                static = analysis.static_analysis(name, dob, gender, None, essence_start_age, essence_end_age, system)
+                with metrics.stage("cache_set"):
+                    analysis_cache.set_static(key, static)
+            with metrics.stage("serialize"):
+                parts = encode_static(static)
+            self.static.set(key, parts)
+
+        periods_key = f"{dob}|{date.today().isoformat()}"
+        periods_part = self.periods.get(periods_key)
+        if periods_part is None:
+            with metrics.stage("cache_get"):
+                periods = analysis_cache.get_periods(dob)
+            if periods is None:
+                with metrics.stage("periods"):
+                    periods = numerology.personal_periods(dob)
+                with metrics.stage("cache_set"):
+                    analysis_cache.set_periods(dob, periods)
+            with metrics.stage("serialize"):
+                periods_part = encode_periods(periods)
+            self.periods.set(periods_key, periods_part, expires_at=next_midnight())
+
+        return parts[0] + periods_part + parts[1]
+
+    def clear(self):
+        self.static.clear()
+        self.periods.clear()
+
+    def stats(self) -> dict:
+        return {"static": self.static.stats(), "periods": self.periods.stats()}
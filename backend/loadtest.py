@@ -0,0 +1,325 @@
+"""
+Load generator for the API: starts main:app under uvicorn, drives a mix
+of /analyze, /analyze/mobile, /analyze/vehicle and /analyze/house
+requests from concurrent keep-alive connections, and writes throughput,
+latency percentiles, latency histograms and error rates to a JSON file.
+
+Each concurrency level is a closed loop: every connection sends its next
+request as soon as the previous response arrives. Pass several levels to
+find where p99 latency starts to climb:
+
+    python loadtest.py --concurrency 1,8,32,64 --duration 15
+    python loadtest.py --workers 4 --mix analyze=100 -o loadtest-4w.json
+    python loadtest.py --url http://127.0.0.1:8000   # an already running server
+
+Only the standard library and uvicorn are needed; requests are written
+as raw HTTP/1.1 over asyncio streams so the client stays cheap next to
+the server it measures.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from bench_suite import Inputs
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ROUTES = {
+    "analyze": "/analyze",
+    "mobile": "/analyze/mobile",
+    "vehicle": "/analyze/vehicle",
+    "house": "/analyze/house",
+}
+
+# Histogram bucket upper bounds in milliseconds (1-2-5 steps); the last bucket is open
+BUCKETS_MS = [b * 10 ** e for e in range(-1, 4) for b in (1, 2, 5)] + [10000]
+
+
+def parse_mix(text: str) -> dict:
+    """
+    "analyze=70,mobile=10,..." -> {"analyze": 70.0, ...}
+    """
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ROUTES:
+            raise argparse.ArgumentTypeError(f"unknown route {name!r}; choose from {', '.join(ROUTES)}")
+        mix[name] = float(weight or 1)
+    if sum(mix.values()) <= 0:
+        raise argparse.ArgumentTypeError("mix weights must add up to more than 0")
+    return mix
+
+
+def make_bodies(pool: int, seed: int) -> dict:
+    """
+    Pre-encoded request bodies per route, from realistic inputs.
+    """
+    inputs = Inputs(pool, all_dobs=False, seed=seed)
+    people = inputs.people(pool)
+
+    def encode(payload):
+        return json.dumps(payload).encode()
+
+    return {
+        "analyze": [encode(p) for p in people],
+        "mobile": [encode({"mobile_number": m, "dob": d}) for m, d in zip(inputs.mobiles, inputs.dobs)],
+        "vehicle": [encode({"vehicle_number": v, "dob": d}) for v, d in zip(inputs.vehicles, inputs.dobs)],
+        "house": [encode({"house_number": h, "dob": d}) for h, d in zip(inputs.houses, inputs.dobs)],
+    }
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = {name: [] for name in ROUTES}
+        self.errors = {name: 0 for name in ROUTES}
+        self.error_samples = []
+
+    def record(self, route: str, seconds: float, error: str = None):
+        self.latencies[route].append(seconds)
+        if error:
+            self.errors[route] += 1
+            if len(self.error_samples) < 10:
+                self.error_samples.append(f"{route}: {error}")
+
+
+async def read_response(reader: asyncio.StreamReader) -> tuple:
+    """
+    Reads one HTTP/1.1 response; returns (status, body).
+    """
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    if "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding") == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            chunks.append(await reader.readexactly(size + 2))
+            if size == 0:
+                break
+        body = b"".join(chunk[:-2] for chunk in chunks)
+    else:
+        body = await reader.read()
+    return status, body
+
+
+async def virtual_user(host: str, port: int, routes: list, weights: list, bodies: dict,
+                       recorder: Recorder, warmup_until: float, stop_at: float, seed: int):
+    rng = random.Random(seed)
+    reader = writer = None
+    while time.perf_counter() < stop_at:
+        route = rng.choices(routes, weights)[0]
+        body = rng.choice(bodies[route])
+        request = (
+            f"POST {ROUTES[route]} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        ).encode() + body
+        start = time.perf_counter()
+        error = None
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            await writer.drain()
+            status, payload = await read_response(reader)
+            if status >= 400:
+                error = f"HTTP {status}"
+            elif payload.startswith(b'{"error"'):
+                # The analyze routes report failures in a 200 body
+                error = json.loads(payload)["error"]
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            error = f"{type(e).__name__}: {e}"
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+        if start >= warmup_until:
+            recorder.record(route, time.perf_counter() - start, error)
+    if writer is not None:
+        writer.close()
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: list, errors: int, seconds: float) -> dict:
+    values = sorted(latencies)
+    ms = [v * 1000 for v in values]
+    histogram = []
+    position = 0
+    for bound in BUCKETS_MS:
+        count = 0
+        while position < len(ms) and ms[position] <= bound:
+            count += 1
+            position += 1
+        histogram.append({"le_ms": bound, "count": count})
+    histogram.append({"le_ms": None, "count": len(ms) - position})
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "error_rate": errors / len(values) if values else 0.0,
+        "throughput_rps": len(values) / seconds if seconds else 0.0,
+        "latency_ms": {
+            "mean": sum(ms) / len(ms) if ms else 0.0,
+            "p50": percentile(ms, 0.50),
+            "p95": percentile(ms, 0.95),
+            "p99": percentile(ms, 0.99),
+            "max": ms[-1] if ms else 0.0,
+        },
+        "histogram": histogram,
+    }
+
+
+async def run_level(host: str, port: int, concurrency: int, duration: float, warmup: float,
+                    mix: dict, bodies: dict, seed: int) -> dict:
+    recorder = Recorder()
+    routes = list(mix)
+    weights = [mix[r] for r in routes]
+    began = time.perf_counter()
+    warmup_until = began + warmup
+    stop_at = warmup_until + duration
+    await asyncio.gather(*(
+        virtual_user(host, port, routes, weights, bodies, recorder, warmup_until, stop_at, seed + i)
+        for i in range(concurrency)
+    ))
+    # Requests still in flight at stop_at finish after it; count the real window
+    measured = max(time.perf_counter() - warmup_until, 1e-9)
+
+    everything = [v for values in recorder.latencies.values() for v in values]
+    level = {"concurrency": concurrency, "duration_s": round(measured, 3)}
+    level.update(summarize(everything, sum(recorder.errors.values()), measured))
+    level["routes"] = {
+        route: summarize(recorder.latencies[route], recorder.errors[route], measured)
+        for route in routes
+    }
+    level["error_samples"] = recorder.error_samples
+    return level
+
+
+def free_port(host: str) -> int:
+    with socket.socket() as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+def start_server(host: str, port: int, workers: int, env: dict) -> subprocess.Popen:
+    command = [sys.executable, "-m", "uvicorn", "main:app", "--host", host, "--port", str(port),
+               "--workers", str(workers), "--log-level", "warning", "--no-access-log"]
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env={**os.environ, **env})
+
+
+def wait_until_ready(host: str, port: int, server: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"server exited with status {server.returncode}")
+        try:
+            with socket.create_connection((host, port), timeout=1) as s:
+                s.sendall(f"GET / HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+                if s.recv(12).startswith(b"HTTP/1.1 200"):
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server not ready on {host}:{port} after {timeout:.0f}s")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,8,32",
+                        help="Comma-separated concurrent connections per level (default 1,8,32)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per level")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each level")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("analyze=70,mobile=10,vehicle=10,house=10"),
+                        help="Route weights, e.g. analyze=70,mobile=10,vehicle=10,house=10")
+    parser.add_argument("--pool", type=int, default=1000,
+                        help="Distinct request bodies per route; repeats exercise the result cache")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=0, help="Port for the started server (default: a free one)")
+    parser.add_argument("--url", help="Load an already running server instead of starting one")
+    parser.add_argument("--env", action="append", default=[], metavar="NAME=VALUE",
+                        help="Environment for the started server, e.g. --env FAST_JSON=1")
+    parser.add_argument("--seed", type=int, default=17)
+    parser.add_argument("-o", "--output", default="loadtest.json")
+    args = parser.parse_args()
+
+    levels = [int(c) for c in args.concurrency.split(",")]
+    env = dict(item.split("=", 1) for item in args.env)
+    bodies = make_bodies(args.pool, args.seed)
+
+    server = None
+    if args.url:
+        target = urlsplit(args.url)
+        host, port = target.hostname, target.port or 80
+    else:
+        host = "127.0.0.1"
+        port = args.port or free_port(host)
+        server = start_server(host, port, args.workers, env)
+
+    report = {
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "target": args.url or f"uvicorn main:app on {host}:{port}",
+        "workers": None if args.url else args.workers,
+        "server_env": env,
+        "mix": args.mix,
+        "pool": args.pool,
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "cpus": os.cpu_count(),
+        "levels": [],
+    }
+    try:
+        wait_until_ready(host, port, server)
+        for concurrency in levels:
+            level = asyncio.run(run_level(host, port, concurrency, args.duration, args.warmup,
+                                          args.mix, bodies, args.seed))
+            report["levels"].append(level)
+            latency = level["latency_ms"]
+            print(
+                f"c={concurrency:<4} {level['throughput_rps']:>9.1f} req/s  "
+                f"p50 {latency['p50']:>7.2f}  p95 {latency['p95']:>7.2f}  p99 {latency['p99']:>7.2f}  "
+                f"max {latency['max']:>8.2f} ms  errors {level['error_rate']:.2%}",
+                flush=True,
+            )
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,117 @@
+import functools
 import os
-from fastapi import FastAPI
-from pydantic import BaseModel
+import logging
+from contextlib import asynccontextmanager
+from itertools import islice
+from typing import Any, List, Literal, Optional
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-import numerology
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+import analysis
+import batch
+import cache
+import calendar_forecast
+import columnar
+import dob_index
+import dob_table
+import executor
+import fastjson
+import matching
+import metrics
+import profiling
+import name_variants
+import population_stats
+import recommend
+import results
+import systems
+from schemas import (
+    AnalysisRequest,
+    BatchAnalysisRequest,
+    CalendarForecastRequest,
+    DobSearchRequest,
+    HouseAnalysisRequest,
+    MatchRequest,
+    MobileAnalysisRequest,
+    NameSuggestionRequest,
+    RecommendRequest,
+    VehicleAnalysisRequest,
+)
+
+logger = logging.getLogger("uvicorn.error")
+
+# Build the DOB profile table once per worker so DOB-only results are array reads
+dob_profiles = dob_table.get_table()
+_table_stats = dob_profiles.stats()
+logger.info(
+    "DOB table: %d rows built in %.3fs, %.1f KiB",
+    _table_stats["rows"], _table_stats["build_seconds"], _table_stats["bytes"] / 1024,
+)
+
+# Inverted index over the table for reverse DOB searches
+dob_search_index = dob_index.get_index()
+
+# Compile the numerology systems once so a bad systems.json fails at startup
+systems.get_system()
 
-app = FastAPI()
+# Process pool for batch work; single-record routes run inline on the event loop
+batch_executor = executor.executor_from_env()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    batch_executor.shutdown()
+
+class TimedJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        with metrics.stage("serialize"):
+            return super().render(content)
+
+app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=TimedJSONResponse if metrics.ENABLED else JSONResponse,
+)
 
 # Read allowed origins from environment variable (comma-separated)
 # Defaults to localhost for development
 cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
 
+# Results of /analyze, reused for repeated name/dob/gender submissions
+analysis_cache = cache.analysis_cache_from_env()
+
+# Opt-in fast serialization: encode responses straight to bytes and reuse
+# pre-encoded fragments of repeat /analyze results
+FAST_JSON = os.getenv("FAST_JSON", "0") == "1"
+fragment_cache = fastjson.FragmentCache(int(os.getenv("ANALYZE_CACHE_SIZE", "10000")))
+
+def _respond(payload: dict):
+    if FAST_JSON:
+        with metrics.stage("serialize"):
+            body = fastjson.dumps(payload)
+        return Response(body, media_type="application/json")
+    return payload
+
+# Upper bound on records accepted by /analyze/batch in one request
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "100000"))
+# Batches up to this size are computed inline; larger ones go to the pool
+BATCH_INLINE_LIMIT = int(os.getenv("BATCH_INLINE_LIMIT", "100"))
+# Records per pool task
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "1000"))
+# Upper bound on candidate numbers accepted by /recommend/numbers
+MAX_RECOMMEND_CANDIDATES = int(os.getenv("MAX_RECOMMEND_CANDIDATES", "1000000"))
+# Candidate numbers per pool task
+RECOMMEND_CHUNK_SIZE = int(os.getenv("RECOMMEND_CHUNK_SIZE", "100000"))
+# Limits for /forecast/calendar: days in the range, people per request, and people x days
+FORECAST_MAX_DAYS = int(os.getenv("FORECAST_MAX_DAYS", "3660"))
+FORECAST_MAX_PEOPLE = int(os.getenv("FORECAST_MAX_PEOPLE", "10000"))
+FORECAST_MAX_CELLS = int(os.getenv("FORECAST_MAX_CELLS", "5000000"))
+# /suggest/name searches with at most this time budget run in the threadpool;
+# longer ones go to the batch pool so they cannot tie up request threads
+SUGGEST_INLINE_BUDGET_MS = float(os.getenv("SUGGEST_INLINE_BUDGET_MS", "250"))
+# Upper bound on people in one /match group
+MATCH_MAX_PEOPLE = int(os.getenv("MATCH_MAX_PEOPLE", "100000"))
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
@@ -18,112 +120,345 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-class AnalysisRequest(BaseModel):
-    name: str
-    dob: str  # YYYY-MM-DD
-    gender: str
+# Opt-in cProfile sampling; not installed at all unless NUMEROLOGY_PROFILING=1
+profiler = profiling.profiler_from_env()
+if profiler is not None:
+    app.add_middleware(profiling.ProfilingMiddleware, profiler=profiler)
+
+# Added last so it is outermost and times CORS handling too
+if metrics.ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+def _cache_layers(name: str, stats: dict):
+    # A fallback backend reports its primary and fallback layers separately
+    if "primary" in stats:
+        yield from _cache_layers(name, dict(stats["primary"], backend=stats["backend"]))
+        yield from _cache_layers(name, dict(stats["fallback"], backend="fallback"))
+    elif "hits" in stats:
+        yield name, stats
+
+@metrics.registry.collector
+def _cache_metrics():
+    caches = analysis_cache.stats()
+    if FAST_JSON:
+        caches.update({f"fragments_{name}": stats for name, stats in fragment_cache.stats().items()})
+    layers = [
+        ((("cache", name), ("backend", stats.get("backend", "memory"))), stats)
+        for cache_name, cache_stats in caches.items()
+        for name, stats in _cache_layers(cache_name, cache_stats)
+    ]
+    return [
+        ("numerology_cache_hits_total", "counter", "Result cache hits",
+         [(labels, stats["hits"]) for labels, stats in layers]),
+        ("numerology_cache_misses_total", "counter", "Result cache misses",
+         [(labels, stats["misses"]) for labels, stats in layers]),
+        ("numerology_cache_hit_ratio", "gauge", "Result cache hits / lookups",
+         [(labels, float(stats["hit_rate"])) for labels, stats in layers]),
+        ("numerology_cache_entries", "gauge", "Entries held by the result cache",
+         [(labels, stats["entries"]) for labels, stats in layers if "entries" in stats]),
+    ]
+
+@metrics.registry.collector
+def _executor_metrics():
+    stats = batch_executor.stats()
+    return [
+        ("numerology_batch_active_jobs", "gauge", "Batch jobs in progress", [((), stats["active_jobs"])]),
+        ("numerology_batch_queued_tasks", "gauge", "Batch chunks queued in the process pool", [((), stats["queued_tasks"])]),
+        ("numerology_batch_rejected_total", "counter", "Batch requests rejected with 503", [((), stats["rejected"])]),
+    ]
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Numerology API is running"}
 
+@app.get("/metrics")
+async def metrics_endpoint():
+    if not metrics.ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (NUMEROLOGY_METRICS=0)")
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/systems")
+async def list_systems():
+    return {
+        "default": systems.default_name(),
+        "systems": [systems.get_system(name).describe() for name in systems.names()],
+    }
+
+@app.get("/stats/dob-table")
+async def dob_table_stats():
+    return dob_profiles.stats()
+
+@app.get("/stats/cache")
+async def cache_stats():
+    stats = analysis_cache.stats()
+    if FAST_JSON:
+        stats["fragments"] = fragment_cache.stats()
+    return stats
+
+@app.get("/stats/executor")
+async def executor_stats():
+    return batch_executor.stats()
+
 @app.post("/analyze")
-def analyze(request: AnalysisRequest):
+async def analyze(request: AnalysisRequest):
     try:
-        mulank = numerology.calculate_mulank(request.dob)
-        bhagyank = numerology.calculate_bhagyank(request.dob)
-        kua = numerology.calculate_kua(request.dob, request.gender)
-        loshu = numerology.generate_lo_shu_grid(request.dob, mulank, bhagyank, kua)
-        name_number = numerology.calculate_name_number(request.name)
-        periods = numerology.calculate_personal_periods(request.dob)
-        
-        life_roadmap = {
-            "pinnacles_challenges": numerology.calculate_pinnacles_and_challenges(request.dob),
-            "essence": numerology.calculate_essence(request.dob, request.name)
-        }
-        
-        return {
-            "mulank": mulank,
-            "bhagyank": bhagyank,
-            "kua": kua,
-            "name_number": name_number,
-            "loshu": loshu,
-            "periods": periods,
-            "life_roadmap": life_roadmap
-        }
+        start_age, end_age = request.essence_window()
+        system = request.numerology_system()
+        compute = functools.partial(
+            fragment_cache.analyze_person if FAST_JSON else analysis.analyze_person_cached,
+            analysis_cache, request.name, request.dob, request.gender,
+            essence_start_age=start_age, essence_end_age=end_age, system=system,
+        )
+        # SQLite/Redis lookups block, so those run in the threadpool
+        payload = await run_in_threadpool(compute) if analysis_cache.blocking else compute()
+        if FAST_JSON:
+            return Response(payload, media_type="application/json")
+        return results.plain(payload)
     except Exception as e:
         import traceback
         return {"error": str(e), "traceback": traceback.format_exc()}
 
-class MobileAnalysisRequest(BaseModel):
-    mobile_number: str
-    dob: str
-
-class VehicleAnalysisRequest(BaseModel):
-    vehicle_number: str
-    dob: str
-
-class HouseAnalysisRequest(BaseModel):
-    house_number: str
-    dob: str
-
 @app.post("/analyze/mobile")
-def analyze_mobile(request: MobileAnalysisRequest):
+async def analyze_mobile(request: MobileAnalysisRequest):
     try:
-        mulank = numerology.calculate_mulank(request.dob)
-        bhagyank = numerology.calculate_bhagyank(request.dob)
-        mobile_data = numerology.calculate_mobile_total(request.mobile_number)
-        
-        compatibility = numerology.get_compatibility(mulank, mobile_data["single_digit"])
-        
-        return {
-            "mulank": mulank,
-            "bhagyank": bhagyank,
-            "mobile_total": mobile_data["single_digit"],
-            "mobile_compound": mobile_data["total_sum"],
-            "compatibility": compatibility
-        }
+        return _respond(analysis.analyze_number("mobile", request.mobile_number, request.dob, system=request.numerology_system()))
     except Exception as e:
         import traceback
         return {"error": str(e), "traceback": traceback.format_exc()}
 
 @app.post("/analyze/vehicle")
-def analyze_vehicle(request: VehicleAnalysisRequest):
+async def analyze_vehicle(request: VehicleAnalysisRequest):
     try:
-        mulank = numerology.calculate_mulank(request.dob)
-        bhagyank = numerology.calculate_bhagyank(request.dob)
-        vehicle_data = numerology.calculate_vehicle_total(request.vehicle_number)
-        
-        compatibility = numerology.get_compatibility(mulank, vehicle_data["single_digit"])
-        
-        return {
-            "mulank": mulank,
-            "bhagyank": bhagyank,
-            "vehicle_total": vehicle_data["single_digit"],
-            "vehicle_compound": vehicle_data["total_sum"],
-            "compatibility": compatibility
-        }
+        return _respond(analysis.analyze_number("vehicle", request.vehicle_number, request.dob, system=request.numerology_system()))
     except Exception as e:
         import traceback
         return {"error": str(e), "traceback": traceback.format_exc()}
 
 @app.post("/analyze/house")
-def analyze_house(request: HouseAnalysisRequest):
+async def analyze_house(request: HouseAnalysisRequest):
     try:
-        mulank = numerology.calculate_mulank(request.dob)
-        bhagyank = numerology.calculate_bhagyank(request.dob)
-        house_data = numerology.calculate_house_total(request.house_number)
-        
-        compatibility = numerology.get_compatibility(mulank, house_data["single_digit"])
-        
-        return {
-            "mulank": mulank,
-            "bhagyank": bhagyank,
-            "house_total": house_data["single_digit"],
-            "house_compound": house_data["total_sum"],
-            "compatibility": compatibility
-        }
+        return _respond(analysis.analyze_number("house", request.house_number, request.dob, system=request.numerology_system()))
     except Exception as e:
         import traceback
         return {"error": str(e), "traceback": traceback.format_exc()}
 
+def _chunks(records: List[Any], size: int):
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+async def _stream_batch(records: List[Any], job: executor.BatchJob):
+    # Chunks are encoded in the pool and streamed in order as they finish,
+    # so the encoded output is never held in memory as a whole
+    try:
+        yield b'{"results":['
+        first = True
+        async for encoded in batch_executor.map_ordered(batch.encode_records, _chunks(records, BATCH_CHUNK_SIZE)):
+            if not first:
+                yield b","
+            yield encoded
+            first = False
+        yield b"]}"
+    finally:
+        job.release()
+
+@app.post("/analyze/batch")
+async def analyze_batch(request: BatchAnalysisRequest):
+    if len(request.records) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(request.records)} records exceeds the limit of {MAX_BATCH_SIZE}",
+        )
+    if len(request.records) <= BATCH_INLINE_LIMIT:
+        body = b'{"results":[' + batch.encode_records(request.records) + b"]}"
+        return Response(body, media_type="application/json")
+
+    job = batch_executor.try_admit()
+    if job is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many batch requests in progress, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    # The background task also releases the slot if the stream never starts
+    return StreamingResponse(
+        _stream_batch(request.records, job),
+        media_type="application/json",
+        background=BackgroundTask(job.release),
+    )
+
+async def _stream_arrow(records: List[Any], job: executor.BatchJob):
+    # Same pipeline as _stream_batch, one Arrow record batch per chunk
+    try:
+        yield columnar.stream_header()
+        async for encoded in batch_executor.map_ordered(batch.encode_arrow, _chunks(records, BATCH_CHUNK_SIZE)):
+            yield encoded
+        yield columnar.STREAM_END
+    finally:
+        job.release()
+
+@app.post("/analyze/batch/arrow")
+async def analyze_batch_arrow(request: BatchAnalysisRequest):
+    # /analyze/batch as an Arrow IPC stream of columnar.COLUMNS rows
+    if columnar.pa is None:
+        raise HTTPException(status_code=501, detail="Arrow output needs pyarrow installed on the server")
+    if len(request.records) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(request.records)} records exceeds the limit of {MAX_BATCH_SIZE}",
+        )
+    if len(request.records) <= BATCH_INLINE_LIMIT:
+        body = columnar.stream_header() + batch.encode_arrow(request.records) + columnar.STREAM_END
+        return Response(body, media_type=columnar.STREAM_MEDIA_TYPE)
+
+    job = batch_executor.try_admit()
+    if job is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many batch requests in progress, retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    return StreamingResponse(
+        _stream_arrow(request.records, job),
+        media_type=columnar.STREAM_MEDIA_TYPE,
+        background=BackgroundTask(job.release),
+    )
+
+@app.post("/search/dob")
+async def search_dob(request: DobSearchRequest):
+    return dob_search_index.search(**request.model_dump())
+
+@app.post("/recommend/numbers")
+async def recommend_numbers(request: RecommendRequest):
+    if len(request.candidates) > MAX_RECOMMEND_CANDIDATES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"{len(request.candidates)} candidates exceeds the limit of {MAX_RECOMMEND_CANDIDATES}",
+        )
+    args = (request.dob, request.candidates, request.kind, request.top_k, request.preferred_compounds)
+    try:
+        if len(request.candidates) <= BATCH_INLINE_LIMIT:
+            return recommend.recommend(*args)
+
+        job = batch_executor.try_admit()
+        if job is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many batch requests in progress, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            # Chunks are ranked across the pool and their top_k lists merged
+            mulank = recommend.mulank_for(request.dob, request.kind)
+            preferred = tuple(request.preferred_compounds)
+            tasks = recommend.tasks(
+                request.candidates, mulank, request.kind, request.top_k, preferred, RECOMMEND_CHUNK_SIZE,
+            )
+            ranked = (0, 0, [])
+            async for part in batch_executor.map_ordered(recommend.rank_task, tasks):
+                ranked = recommend.merge(ranked, part, request.top_k)
+            return recommend.summarize(mulank, request.kind, preferred, ranked)
+        finally:
+            job.release()
+    except (ValueError, IndexError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@app.post("/match")
+async def match(request: MatchRequest):
+    if len(request.dobs) > MATCH_MAX_PEOPLE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"{len(request.dobs)} dobs exceeds the limit of {MATCH_MAX_PEOPLE}",
+        )
+    group = matching.MatchGroup(request.dobs, request.ids, request.numerology_system())
+    if request.target is None:
+        return _respond(group.summary(request.top_k, request.min_score))
+    return _respond(group.matches(request.target, request.top_k, request.min_score))
+
+@app.post("/stats/population")
+async def upload_population_stats(
+    request: Request,
+    input_format: Optional[Literal["csv", "ndjson"]] = None,
+    top_patterns: int = Query(20, ge=1, le=512),
+):
+    # The body is the uploaded file itself (curl --data-binary @users.csv),
+    # aggregated chunk by chunk as it arrives, so its size does not matter
+    if input_format is None:
+        content_type = request.headers.get("content-type", "")
+        input_format = "ndjson" if "ndjson" in content_type or "jsonl" in content_type else "csv"
+    decoder = population_stats.RecordDecoder(input_format)
+    stats = population_stats.PopulationStats()
+    async for chunk in request.stream():
+        rows = decoder.feed(chunk)
+        if rows:
+            await run_in_threadpool(stats.add_records, rows)
+    stats.add_records(decoder.close())
+    return _respond(stats.report(top_patterns))
+
+@app.post("/suggest/name")
+async def suggest_name(request: NameSuggestionRequest):
+    # The search is CPU-bound for up to time_budget_ms, so it never runs on the event loop
+    args = request.model_dump()
+    try:
+        if request.time_budget_ms <= SUGGEST_INLINE_BUDGET_MS:
+            return await run_in_threadpool(name_variants.suggest, **args)
+
+        job = batch_executor.try_admit()
+        if job is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many batch requests in progress, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            return await batch_executor.run(functools.partial(name_variants.suggest, **args))
+        finally:
+            job.release()
+    except (ValueError, IndexError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@app.post("/forecast/calendar")
+async def forecast_calendar(request: CalendarForecastRequest):
+    start, end = request.date_range()
+    days = (end - start).days + 1
+    people = len(request.dobs)
+    if days > FORECAST_MAX_DAYS:
+        raise HTTPException(status_code=413, detail=f"Range of {days} days exceeds the limit of {FORECAST_MAX_DAYS}")
+    if people > FORECAST_MAX_PEOPLE:
+        raise HTTPException(status_code=413, detail=f"{people} dobs exceeds the limit of {FORECAST_MAX_PEOPLE}")
+    if people * days > FORECAST_MAX_CELLS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"{people} dobs x {days} days exceeds the limit of {FORECAST_MAX_CELLS} values",
+        )
+    # A sync generator, so Starlette encodes the chunks in its threadpool
+    return StreamingResponse(
+        calendar_forecast.encode_ndjson(request.dobs, start, end),
+        media_type="application/x-ndjson",
+    )
+
+def _check_admin(token: str):
+    if profiler is None:
+        raise HTTPException(status_code=404, detail="Profiling is disabled (NUMEROLOGY_PROFILING=1 enables it)")
+    if not profiler.check_token(token):
+        raise HTTPException(status_code=403, detail="A valid X-Admin-Token is required")
+
+@app.get("/admin/profiles")
+async def list_profiles(x_admin_token: str = Header(None)):
+    _check_admin(x_admin_token)
+    return {"settings": profiler.stats(), "profiles": profiler.list()}
+
+@app.get("/admin/profiles/{profile_id}")
+async def download_profile(profile_id: str, format: Literal["pstats", "text"] = "pstats",
+                           sort: Literal["cumulative", "tottime", "ncalls"] = "cumulative",
+                           x_admin_token: str = Header(None)):
+    _check_admin(x_admin_token)
+    path = profiler.path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"No profile {profile_id!r}")
+    if format == "text":
+        return PlainTextResponse(profiling.render_text(path, sort))
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.pstats")
@@ -0,0 +1,215 @@
+"""
+Pairwise compatibility across a group of people.
+
+How person B looks to person A is get_compatibility(A's Mulank, B's
+Mulank): Lucky, Neutral or Unlucky. A pair scores both directions,
+2 / 1 / 0 points each, so 0-4. The score depends only on the two
+Mulanks, so the group is split into the 9 Mulank groups. The 45 group
+pairs are each scored once from a 9x9 matrix. Counts and distributions
+need no per-pair work, and individual pairs are only expanded, in score
+order, for top-k or filtered queries:
+
+    group = MatchGroup(dobs, ids)
+    group.summary(top_k=10)            # group pair scores and counts, best pairs
+    group.matches(index, top_k=10)     # ranked matches for one person
+
+Matching everyone in a large group (match_all) is output-bound; with
+workers > 1 it is split into chunks of people, matched and encoded in a
+process pool.
+"""
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, islice, product
+
+import numerology
+import tables
+
+MULANKS = range(1, 10)
+STATUS_POINTS = {"Lucky": 2, "Neutral": 1, "Unlucky": 0}
+MAX_SCORE = 4
+
+
+def status_matrix(system=None) -> tuple:
+    """
+    STATUS[a][b]: how Mulank b looks to Mulank a, as get_compatibility
+    reports it. Row and column 0 are unused.
+    """
+    matrix = tables.STATUS if system is None else system.status
+    return ((),) + tuple(tuple(matrix[a][b] for b in range(10)) for a in MULANKS)
+
+
+def score_matrix(statuses: tuple) -> tuple:
+    """
+    SCORE[a][b]: the pair score (0-4) of Mulanks a and b.
+    """
+    return ((),) + tuple(
+        tuple(0 if b == 0 else STATUS_POINTS[statuses[a][b]] + STATUS_POINTS[statuses[b][a]] for b in range(10))
+        for a in MULANKS
+    )
+
+
+class MatchGroup:
+    """
+    A group of people indexed by Mulank. dobs are date of birth strings or
+    BirthDates; ids (optional, same length) are echoed in results.
+    """
+
+    def __init__(self, dobs, ids=None, system=None):
+        self.mulanks = bytes(numerology.calculate_mulank(dob) for dob in dobs)
+        self.size = len(self.mulanks)
+        self.ids = list(ids) if ids is not None else None
+        if self.ids is not None and len(self.ids) != self.size:
+            raise ValueError(f"{len(self.ids)} ids for {self.size} people")
+        # People of each Mulank, in input order
+        self.groups = {mulank: [] for mulank in MULANKS}
+        for index, mulank in enumerate(self.mulanks):
+            self.groups[mulank].append(index)
+        self.status = status_matrix(system)
+        self.lucky_numbers = tables.LUCKY_NUMBERS if system is None else system.lucky_numbers
+        self.score = score_matrix(self.status)
+        # Mulanks in match order for each Mulank: pair score, then how
+        # they look to that Mulank, then Mulank
+        self.ranked = {
+            a: sorted(MULANKS, key=lambda b: (-self.score[a][b], -STATUS_POINTS[self.status[a][b]], b))
+            for a in MULANKS
+        }
+
+    def _person(self, index: int) -> dict:
+        person = {"index": index, "mulank": self.mulanks[index]}
+        if self.ids is not None:
+            person["id"] = self.ids[index]
+        return person
+
+    def _match(self, a: int, index: int) -> dict:
+        match = self._person(index)
+        b = match["mulank"]
+        match["score"] = self.score[a][b]
+        match["status"] = self.status[a][b]
+        match["their_status"] = self.status[b][a]
+        return match
+
+    def _group_pairs(self):
+        # (a, b, pair count) for a <= b with at least one pair
+        for a in MULANKS:
+            for b in range(a, 10):
+                na, nb = len(self.groups[a]), len(self.groups[b])
+                count = na * (na - 1) // 2 if a == b else na * nb
+                if count:
+                    yield a, b, count
+
+    def summary(self, top_k: int = 10, min_score: int = 0) -> dict:
+        """
+        Pair counts per Mulank group pair and per score, without expanding
+        pairs, plus the top_k individual pairs scoring at least min_score.
+        """
+        group_pairs = sorted(self._group_pairs(), key=lambda pair: (-self.score[pair[0]][pair[1]], pair[0], pair[1]))
+        distribution = dict.fromkeys(range(MAX_SCORE, -1, -1), 0)
+        for a, b, count in group_pairs:
+            distribution[self.score[a][b]] += count
+
+        def expanded():
+            for a, b, _ in group_pairs:
+                if self.score[a][b] < min_score:
+                    return
+                pairs = combinations(self.groups[a], 2) if a == b else product(self.groups[a], self.groups[b])
+                for i, j in pairs:
+                    yield a, i, j
+
+        return {
+            "people": self.size,
+            "pairs": self.size * (self.size - 1) // 2,
+            "groups": [{"mulank": mulank, "people": len(self.groups[mulank])} for mulank in MULANKS],
+            "score_distribution": [{"score": score, "pairs": count} for score, count in distribution.items()],
+            "group_pairs": [
+                {
+                    "mulanks": [a, b],
+                    "pairs": count,
+                    "score": self.score[a][b],
+                    "statuses": [self.status[a][b], self.status[b][a]],
+                }
+                for a, b, count in group_pairs
+            ],
+            "top_pairs": [
+                {"score": self.score[a][self.mulanks[j]], "people": [self._person(i), self._person(j)]}
+                for a, i, j in islice(expanded(), top_k)
+            ],
+        }
+
+    def candidates(self, index: int, min_score: int = 0):
+        """
+        Yields the indices of everyone else in match order for person
+        index, stopping below min_score.
+        """
+        a = self.mulanks[index]
+        for b in self.ranked[a]:
+            if self.score[a][b] < min_score:
+                return
+            for other in self.groups[b]:
+                if other != index:
+                    yield other
+
+    def matches(self, index: int, top_k: int = 10, min_score: int = 0) -> dict:
+        """
+        Ranked matches for person index against the rest of the group.
+        """
+        if not 0 <= index < self.size:
+            raise IndexError(f"person {index} is not in a group of {self.size}")
+        a = self.mulanks[index]
+        matched = sum(
+            len(self.groups[b]) - (b == a)
+            for b in MULANKS if self.score[a][b] >= min_score
+        )
+        return {
+            "person": self._person(index),
+            "lucky_numbers": list(self.lucky_numbers.get(a, ())),
+            "candidates": self.size - 1,
+            "matched": matched,
+            "results": [self._match(a, other) for other in islice(self.candidates(index, min_score), top_k)],
+        }
+
+
+# --- Matching everyone ---
+
+_worker_group = None
+
+
+def _init_worker(group: MatchGroup):
+    global _worker_group
+    _worker_group = group
+
+
+def encode_matches(start: int, stop: int, top_k: int, min_score: int, group: MatchGroup = None) -> str:
+    """
+    NDJSON lines of matches() for people start to stop - 1. Pool workers
+    use the group they were initialized with.
+    """
+    group = group or _worker_group
+    return "".join(
+        json.dumps(group.matches(index, top_k, min_score), separators=(",", ":")) + "\n"
+        for index in range(start, stop)
+    )
+
+
+def match_all(group: MatchGroup, top_k: int = 10, min_score: int = 0, workers: int = 1, chunk_size: int = 5000):
+    """
+    Yields (people, NDJSON text) per chunk of chunk_size people, in input
+    order. With workers > 1 the group is sent to each worker once and at
+    most 2 * workers chunks are in flight.
+    """
+    ranges = ((start, min(start + chunk_size, group.size)) for start in range(0, group.size, chunk_size))
+    if workers <= 1:
+        for start, stop in ranges:
+            yield stop - start, encode_matches(start, stop, top_k, min_score, group)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(group,)) as pool:
+        pending = deque()
+        for start, stop in ranges:
+            pending.append((stop - start, pool.submit(encode_matches, start, stop, top_k, min_score)))
+            if len(pending) >= 2 * workers:
+                count, future = pending.popleft()
+                yield count, future.result()
+        while pending:
+            count, future = pending.popleft()
+            yield count, future.result()
@@ -0,0 +1,219 @@
+"""
+Lightweight in-process metrics with Prometheus text exposition.
+
+- stage(name): a context manager that times one step of a request
+  (validation, each numerology calculation, cache lookups, serialization)
+  into numerology_stage_duration_seconds{stage=...}.
+- MetricsMiddleware: request counts and latency histograms per route,
+  method and status.
+- Registry.collector: callbacks that report gauges at scrape time (cache
+  hit rates, executor state), so nothing is counted twice on the hot path.
+
+Recording a value is a perf_counter pair, a bisect into a short bucket
+tuple and two additions under a lock. The lock is needed because stages
+are also timed on threadpool threads (/analyze with an SQLite or Redis
+cache, /suggest/name, /stats/population, the calendar stream), and
+unlocked read-modify-writes there could lose updates. Set NUMEROLOGY_METRICS=0 to turn everything into
+no-ops (stage() returns a shared null context and the middleware is not
+installed).
+
+Each process keeps its own metrics: with several uvicorn workers, each
+scrape reports the worker that served it, and stages timed inside the
+batch process pool are not reported.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+
+ENABLED = os.getenv("NUMEROLOGY_METRICS", "1") != "0"
+
+# Guards every histogram and counter update and the series dicts
+_lock = threading.Lock()
+
+# Upper bounds in seconds
+STAGE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1)
+REQUEST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    "numerology_stage_duration_seconds": "Time spent in each stage of request handling",
+    "numerology_http_request_duration_seconds": "Request latency from first byte in to last byte out",
+    "numerology_http_requests_total": "Requests handled",
+}
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        # One slot per bucket plus +Inf; cumulated when rendered
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with _lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+
+class _Stage:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Registry:
+    def __init__(self):
+        self.histograms = {}  # metric name -> {labels tuple: Histogram}
+        self.counters = {}    # metric name -> {labels tuple: int}
+        self.collectors = []
+
+    def histogram(self, name: str, labels: tuple = (), buckets: tuple = STAGE_BUCKETS) -> Histogram:
+        with _lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(labels)
+            if histogram is None:
+                histogram = series[labels] = Histogram(buckets)
+        return histogram
+
+    def inc(self, name: str, labels: tuple = (), amount: int = 1):
+        with _lock:
+            series = self.counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0) + amount
+
+    def collector(self, fn):
+        """
+        Registers fn() -> iterable of (name, type, help, [(labels tuple, value)]),
+        called on every scrape.
+        """
+        self.collectors.append(fn)
+        return fn
+
+    def clear(self):
+        with _lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def render(self) -> str:
+        lines = []
+        # A consistent snapshot, and no series added mid-iteration
+        with _lock:
+            for name, series in self.counters.items():
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in series.items():
+                    lines.append(f"{name}{_labels(labels)} {value}")
+            for name, series in self.histograms.items():
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in series.items():
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', _number(bound)),))} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.sum)}")
+                    lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        for collect in self.collectors:
+            for name, kind, help_text, samples in collect():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+_NOOP = nullcontext()
+_stages = {}
+
+
+def stage(name: str):
+    """
+    Times the enclosed block as stage name:
+
+        with metrics.stage("essence"):
+            ...
+    """
+    if not ENABLED:
+        return _NOOP
+    histogram = _stages.get(name)
+    if histogram is None:
+        histogram = _stages[name] = registry.histogram(
+            "numerology_stage_duration_seconds", (("stage", name),), STAGE_BUCKETS,
+        )
+    return _Stage(histogram)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts and latency per route.
+    Routes are labelled by their path template; unmatched paths share
+    one label so arbitrary URLs cannot create new series.
+    """
+
+    def __init__(self, app, registry: Registry = registry):
+        self.app = app
+        self.registry = registry
+        self._paths = None
+
+    def _route_label(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        if self._paths is None:
+            router = scope.get("router")
+            self._paths = {route.endpoint: route.path for route in getattr(router, "routes", ()) if hasattr(route, "endpoint")}
+        return self._paths.get(endpoint, "unmatched")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            labels = (("route", self._route_label(scope)), ("method", scope["method"]), ("status", str(status)))
+            self.registry.inc("numerology_http_requests_total", labels)
+            self.registry.histogram(
+                "numerology_http_request_duration_seconds", labels[:2], REQUEST_BUCKETS,
+            ).observe(time.perf_counter() - start)
@@ -0,0 +1,168 @@
+"""
+Spelling suggestions that move a name's Chaldean Name Number to a digit
+that is Lucky for the person's Mulank.
+
+Variants are built from small edits to the original spelling: doubling a
+letter, adding a vowel after a letter, or removing a vowel. Each edit
+changes the Chaldean total by the value of the letter added or removed,
+so a variant is scored as the base total plus its edits' deltas, without
+re-scoring the whole name. When choosing the last edit of a variant,
+only edits whose delta lands the total on a target digit (mod 9) are
+considered, so most combinations are never generated. The search stops
+at a time budget.
+"""
+import time
+from functools import lru_cache
+
+import analysis
+import numerology
+import tables
+
+VOWELS = "aeiou"
+
+
+@lru_cache(maxsize=None)
+def letter_value(char: str) -> int:
+    """
+    The Chaldean value one character adds to calculate_name_number's total.
+    """
+    return numerology.calculate_name_number(char)["total_sum"]
+
+
+def _matching_case(char: str, like: str) -> str:
+    return char.upper() if like.isupper() else char
+
+
+def single_edits(name: str) -> list:
+    """
+    All one-step edits of name as (anchor, kind, text, delta) tuples.
+    anchor is the index of the letter the edit applies to; kind is
+    "double", "add" (insert text after the anchor) or "remove". Letters
+    with no Chaldean value are skipped since editing them cannot change
+    the Name Number, and a word's first letter is never removed.
+    """
+    edits = []
+    for i, char in enumerate(name):
+        if not char.isalpha():
+            continue
+        value = letter_value(char)
+        if not value:
+            continue
+        # The copy of a word's initial capital is lower case ("Sshiva", not "SShiva")
+        word_start = i == 0 or not name[i - 1].isalpha()
+        edits.append((i, "double", char.lower() if word_start else char, value))
+        # An added vowel takes the case of the letter it is inserted before,
+        # or at the end of a word of the letter before it ("Oa'Neil", "JEANA")
+        if i + 1 < len(name) and name[i + 1].isalpha():
+            follower = name[i + 1]
+        else:
+            follower = char.lower() if word_start else char
+        for vowel in VOWELS:
+            vowel = _matching_case(vowel, follower)
+            edits.append((i, "add", vowel, letter_value(vowel)))
+        if char.lower() in VOWELS and i > 0 and name[i - 1].isalpha():
+            edits.append((i, "remove", char, -value))
+    return edits
+
+
+def apply_edits(name: str, edits) -> str:
+    """
+    Applies edits with distinct anchors, right to left so earlier indices stay valid.
+    """
+    chars = list(name)
+    for anchor, kind, text, _ in sorted(edits, reverse=True):
+        if kind == "remove":
+            del chars[anchor]
+        else:
+            chars.insert(anchor + 1, text)
+    return "".join(chars)
+
+
+def describe(edit) -> str:
+    anchor, kind, text, _ = edit
+    if kind == "double":
+        return f"double '{text}' at {anchor}"
+    if kind == "add":
+        return f"add '{text}' after {anchor}"
+    return f"remove '{text}' at {anchor}"
+
+
+def suggest(name: str, dob: str, max_edits: int = 2, limit: int = 20, time_budget_ms: float = 200,
+            targets=None) -> dict:
+    """
+    Returns up to limit spelling variants whose Name Number is in targets
+    (default: the Lucky digits for dob's Mulank), fewest edits first, then
+    variants landing on the Mulank itself, then smallest change to the total.
+    """
+    mulank, _ = analysis.core_numbers(dob)
+    if targets is None:
+        targets = tables.LUCKY_NUMBERS.get(mulank, ())
+    targets = set(targets)
+    residues = {t % 9 for t in targets}
+
+    base = numerology.calculate_name_number(name)
+    base_total = base["total_sum"]
+    edits = single_edits(name)
+
+    # Edits grouped by delta mod 9, for picking a final edit that hits a target
+    by_residue = {}
+    for index, edit in enumerate(edits):
+        by_residue.setdefault(edit[3] % 9, []).append(index)
+
+    deadline = time.perf_counter() + time_budget_ms / 1000
+    found = {}
+    complete = True
+
+    def record(chosen, delta):
+        variant = apply_edits(name, [edits[i] for i in chosen])
+        total = base_total + delta
+        previous = found.get(variant)
+        if previous is None or len(chosen) < len(previous["edits"]):
+            found[variant] = {
+                "name": variant,
+                "total_sum": total,
+                "single_digit": numerology.reduce_to_single_digit(total),
+                "edits": [describe(edits[i]) for i in chosen],
+            }
+
+    def search(chosen, anchors, delta, depth, first):
+        # depth edits remain to choose from edits[first:]; anchors must be distinct
+        nonlocal complete
+        if time.perf_counter() > deadline:
+            complete = False
+            return False
+        if depth == 1:
+            needed = {(r - base_total - delta) % 9 for r in residues}
+            for residue in needed:
+                for index in by_residue.get(residue, ()):
+                    if index >= first and edits[index][0] not in anchors:
+                        total = base_total + delta + edits[index][3]
+                        if total > 0 and numerology.reduce_to_single_digit(total) in targets:
+                            record(chosen + [index], delta + edits[index][3])
+            return True
+        for index in range(first, len(edits)):
+            anchor = edits[index][0]
+            if anchor in anchors:
+                continue
+            if not search(chosen + [index], anchors | {anchor}, delta + edits[index][3], depth - 1, index + 1):
+                return False
+        return True
+
+    for depth in range(1, max_edits + 1):
+        # Suggestions are ranked by edit count first, so once limit are
+        # found, variants with more edits could not make the cut
+        if len(found) >= limit or not search([], frozenset(), 0, depth, 0):
+            break
+
+    suggestions = sorted(
+        found.values(),
+        key=lambda s: (len(s["edits"]), s["single_digit"] != mulank, abs(s["total_sum"] - base_total), s["name"]),
+    )
+    return {
+        "name": name,
+        "mulank": mulank,
+        "current": base,
+        "targets": sorted(targets),
+        "complete": complete,
+        "suggestions": suggestions[:limit],
+    }
@@ -1,18 +1,76 @@
+from datetime import date
+
+import tables
+from birthdate import BirthDate
+from results import EssenceTimeline, LoShuGrid, PersonalPeriods, PinnacleCycles
+
+MASTER_NUMBERS = (11, 22)
+
 def reduce_to_single_digit(n: int) -> int:
     """
-    Recursively sums the digits of n until a single digit (1-9) is obtained.
+    Reduces n to a single digit (1-9) by repeated digit summing.
     Example: 38 -> 11 -> 2
+    Uses the digital root formula 1 + (n - 1) % 9; values up to 9 are returned as-is.
+    """
+    if n > 9:
+        return 1 + (n - 1) % 9
+    return n
+
+def digit_sum(n: int) -> int:
+    """
+    Sums the decimal digits of a non-negative integer arithmetically.
     """
-    while n > 9:
-        n = sum(int(digit) for digit in str(n))
+    total = 0
+    while n:
+        n, digit = divmod(n, 10)
+        total += digit
+    return total
+
+def _reduce_master_slow(n: int) -> int:
+    while n > 9 and n not in MASTER_NUMBERS:
+        n = digit_sum(n)
     return n
 
+# Master-preserving reductions of 0-999; any larger n has a digit sum in this range
+_MASTER_REDUCED = tuple(_reduce_master_slow(n) for n in range(1000))
+
+def reduce_preserving_master(n: int) -> int:
+    """
+    Repeatedly sums the digits of n until it is a single digit or a
+    Master Number (11, 22).
+    Example: 38 -> 11, 49 -> 13 -> 4
+    """
+    if n < 10:
+        return n
+    if n < 1000:
+        return _MASTER_REDUCED[n]
+    return reduce_preserving_master(digit_sum(n))
+
+def _digit_total(text: str) -> int:
+    """
+    Sum of the digit characters in text.
+    """
+    if text.isascii():
+        return sum(text.encode().translate(tables.DIGIT_BYTES))
+    return sum(int(d) for d in text if d.isdigit())
+
+def _dob_parts(dob) -> tuple:
+    """
+    (year, month, day) of a BirthDate or a YYYY-MM-DD string.
+    """
+    if type(dob) is BirthDate:
+        return dob.year, dob.month, dob.day
+    parts = dob.split("-")
+    return int(parts[0]), int(parts[1]), int(parts[2])
+
 def calculate_mulank(dob: str) -> int:
     """
     Calculates Mulank (Psychic Number) from the Day of Birth.
-    Format: YYYY-MM-DD
+    Format: YYYY-MM-DD (or a BirthDate, as for every dob argument below)
     Logic: Sum of day digits reduced to single digit.
     """
+    if type(dob) is BirthDate:
+        return dob.mulank
     parts = dob.split("-")
     day = int(parts[2])
     return reduce_to_single_digit(day)
@@ -22,10 +80,12 @@ def calculate_bhagyank(dob: str) -> int:
     Calculates Bhagyank (Destiny Number) from the full DOB.
     Logic: Sum of all digits in DOB reduced to single digit.
     """
-    total = sum(int(digit) for digit in dob if digit.isdigit())
+    if type(dob) is BirthDate:
+        return dob.bhagyank
+    total = _digit_total(dob)
     return reduce_to_single_digit(total)
 
-def calculate_kua(dob: str, gender: str) -> int:
+def calculate_kua(dob: str, gender: str, system=None) -> int:
     """
     Calculates Kua Number based on Year and Gender.
     Logic:
@@ -33,39 +93,42 @@ def calculate_kua(dob: str, gender: str) -> int:
     2. Apply century-based formula.
     3. Special rule for outcome 5.
     """
-    year_str = dob.split("-")[0]
-    year = int(year_str)
-    
     # Step 1: Kua Factor (sum of last 2 digits reduced)
     # Example 1981: 8+1=9.
-    last_two_digits = year_str[-2:]
-    kua_factor = reduce_to_single_digit(int(last_two_digits[0]) + int(last_two_digits[1]))
+    if type(dob) is BirthDate:
+        year, kua_factor = dob.year, dob.kua_factor
+    else:
+        year_str = dob.split("-")[0]
+        year = int(year_str)
+        last_two_digits = year_str[-2:]
+        kua_factor = reduce_to_single_digit(int(last_two_digits[0]) + int(last_two_digits[1]))
     
     gender = gender.lower()
     kua = 0
+    if system is None:
+        centuries, five = tables.KUA_CENTURIES, tables.KUA_FIVE
+    else:
+        centuries, five = system.kua_centuries, system.kua_five
     
     # Step 2: Apply Gender limits
-    if 1900 <= year <= 1999:
-        if gender == "male":
-            kua = 10 - kua_factor
-        else: # female
-            kua = 5 + kua_factor
-    elif 2000 <= year <= 2099:
-        if gender == "male":
-            kua = 9 - kua_factor
-        else: # female
-            kua = 6 + kua_factor
+    # 1900-1999: male 10 - factor, female 5 + factor
+    # 2000-2099: male 9 - factor, female 6 + factor
+    for first_year, last_year, male, female in centuries:
+        if first_year <= year <= last_year:
+            base, sign = male if gender == "male" else female
+            kua = base + sign * kua_factor
+            break
             
     # Reduce result if double digit (e.g. 5+9 = 14 -> 5)
     kua = reduce_to_single_digit(kua)
     
     # Step 3: Special Rule for 5
     if kua == 5:
-        return 2 if gender == "male" else 8
+        return five[0] if gender == "male" else five[1]
         
     return kua
 
-def generate_lo_shu_grid(dob: str, mulank: int, bhagyank: int, kua: int) -> dict:
+def lo_shu_grid(dob: str, mulank: int, bhagyank: int, kua: int) -> LoShuGrid:
     """
     Generates Lo Shu Grid with 4-layer filling algorithm.
     Layer 1: Raw DOB digits.
@@ -73,31 +136,37 @@ def generate_lo_shu_grid(dob: str, mulank: int, bhagyank: int, kua: int) -> dict
     Layer 3: Bhagyank (Always).
     Layer 4: Kua Number (Always).
     """
-    # Initialize grid counts
-    grid_counts = {str(i): 0 for i in range(1, 10)}
-    
-    # Layer 1: Raw DOB Digits
-    digits = [d for d in dob if d.isdigit() and d != '0']
-    for d in digits:
-        if d in grid_counts:
-            grid_counts[d] += 1
+    # Layer 1: Raw DOB Digits (counts[d] for digit d; zeros are not plotted)
+    if type(dob) is BirthDate:
+        counts = bytearray(map(dob.digits.count, range(10)))
+        day = dob.day
+    else:
+        counts = bytearray(10)
+        for d in dob:
+            if "1" <= d <= "9":
+                counts[ord(d) - 48] += 1
+        day = int(dob.split("-")[2])
             
     # Layer 2: Mulank Mapping
     # Rule: Only add if birth day was double digit
-    day = int(dob.split("-")[2])
-    if day > 9:
-        if str(mulank) in grid_counts:
-            grid_counts[str(mulank)] += 1
+    if day > 9 and 1 <= mulank <= 9:
+        counts[mulank] += 1
             
     # Layer 3: Bhagyank Mapping (Always)
-    if str(bhagyank) in grid_counts:
-        grid_counts[str(bhagyank)] += 1
+    if 1 <= bhagyank <= 9:
+        counts[bhagyank] += 1
         
     # Layer 4: Kua Number Mapping (Always)
-    if str(kua) in grid_counts:
-        grid_counts[str(kua)] += 1
+    if 1 <= kua <= 9:
+        counts[kua] += 1
             
-    return grid_counts
+    return LoShuGrid(counts[1:])
+
+def generate_lo_shu_grid(dob: str, mulank: int, bhagyank: int, kua: int) -> dict:
+    """
+    lo_shu_grid as a {"1": count, ..., "9": count} dict.
+    """
+    return lo_shu_grid(dob, mulank, bhagyank, kua).to_json()
 
 def reduce_for_py_calculation(n: int) -> int:
     """
@@ -106,15 +175,42 @@ def reduce_for_py_calculation(n: int) -> int:
     """
     return reduce_to_single_digit(n)
 
-def calculate_personal_periods(dob: str, target_date: str = None) -> dict:
-    from datetime import datetime
-    
+def personal_year_base(dob: str) -> int:
+    """
+    The birth part of the Personal Year sum: reduced birth day + reduced birth month.
+    """
+    if type(dob) is BirthDate:
+        return dob.personal_year_base
+    _, birth_month, birth_day = _dob_parts(dob)
+    # Born on 29th: 2+9=11 -> 2 (No longer keeping 11)
+    return reduce_to_single_digit(birth_day) + reduce_to_single_digit(birth_month)
+
+def personal_year(base: int, year: int) -> int:
+    """
+    PY = (Birth Day + Birth Month + Current Year), each reduced; base is personal_year_base(dob).
+    """
+    return reduce_to_single_digit(base + reduce_to_single_digit(year))
+
+def personal_month(py: int, month: int) -> int:
+    """
+    PM = (Personal Year + Calendar Month Number)
+    "Where January = 1, December = 12/3 (1+2=3)" -> Checks out with standard reduction
+    """
+    return reduce_to_single_digit(py + reduce_to_single_digit(month))
+
+def personal_day(pm: int, day: int) -> int:
+    """
+    PD = (Personal Month + Calendar Day)
+    """
+    return reduce_to_single_digit(pm + reduce_to_single_digit(day))
+
+def personal_periods(dob: str, target_date: str = None) -> PersonalPeriods:
+    """
+    Personal Year, Month and Day on target_date (default today), with a
+    10-year Personal Year forecast and the 12 Personal Months of its year.
+    """
     if target_date is None:
-        target_date = datetime.now().strftime("%Y-%m-%d")
-        
-    dob_parts = dob.split("-")
-    birth_day = int(dob_parts[2])
-    birth_month = int(dob_parts[1])
+        target_date = date.today().isoformat()
     
     target_parts = target_date.split("-")
     current_year = int(target_parts[0])
@@ -124,78 +220,37 @@ def calculate_personal_periods(dob: str, target_date: str = None) -> dict:
     # --- 1. Personal Year (PY) Calculation ---
     # Formula: PY = (Birth Day + Birth Month + Current Year)
     # Special Rule: "If born on the 29th: 2+9 = 11. (Keep 11 for the sum)."
-    
-    # Reduce Birth Day (Standard Reduction)
-    # Born on 29th: 2+9=11 -> 2 (No longer keeping 11)
-    r_day = reduce_to_single_digit(birth_day)
-    r_month = reduce_to_single_digit(birth_month)
-    r_year = reduce_to_single_digit(current_year)
-    
-    # Final Sum: Day + Month + Year
-    total_sum = r_day + r_month + r_year
-    personal_year = reduce_to_single_digit(total_sum)
+    personal_year_value = personal_year(personal_year_base(dob), current_year)
     
     # --- 2. Personal Month (PM) Calculation ---
-    # Formula: PM = (Personal Year + Calendar Month Number)
-    # "Where January = 1, December = 12/3 (1+2=3)" -> Checks out with standard reduction
-    r_current_month = reduce_to_single_digit(current_month_num)
-    personal_month = reduce_to_single_digit(personal_year + r_current_month)
+    personal_month_value = personal_month(personal_year_value, current_month_num)
     
     # --- 3. Personal Day (PD) Calculation ---
-    # Formula: PD = (Personal Month + Calendar Day)
-    r_current_day = reduce_to_single_digit(current_day_num)
-    personal_day = reduce_to_single_digit(personal_month + r_current_day)
+    personal_day_value = personal_day(personal_month_value, current_day_num)
     
     # --- 4. Forecasting ---
     
-    # Yearly Forecast (Next 9 years logic, but let's just show next 5-10 years)
+    # Yearly Forecast (Current + 9 years)
     # "Logic Flow for 9-Year Cycle: NextYear_PY = (CurrentYear_PY + 1) IF NextYear_PY > 9 THEN NextYear_PY = 1"
-    yearly_forecast = []
-    temp_py = personal_year
-    for i in range(10): # Current + 9 years
-        year_val = current_year + i
-        yearly_forecast.append({
-            "year": year_val,
-            "personal_year": temp_py
-        })
-        # Increment Logic
-        temp_py += 1
-        if temp_py > 9:
-            temp_py = 1
+    yearly_forecast = [(personal_year_value + i - 1) % 9 + 1 for i in range(10)]
             
     # Monthly Forecast (For current year)
-    monthly_forecast = []
-    # If PY is 5. Jan: 5+1=6. Feb: 5+2=7 ...
-    # Wait, the prompt says "If PY is 5... Sept: 5+9=14 -> 5"
-    # So we use the FIXED current Personal Year for all months of THIS calendar year.
-    # Note: Personal Year changes on Jan 1st. So for the whole calendar year, PY is constant.
-    
-    months = [
-        "January", "February", "March", "April", "May", "June", 
-        "July", "August", "September", "October", "November", "December"
-    ]
-    
-    for idx, m_name in enumerate(months):
-        m_num = idx + 1
-        pm_val = reduce_to_single_digit(personal_year + reduce_to_single_digit(m_num))
-        monthly_forecast.append({
-            "month": m_name,
-            "month_num": m_num,
-            "personal_month": pm_val
-        })
+    # If PY is 5. Jan: 5+1=6. Feb: 5+2=7 ... "Sept: 5+9=14 -> 5"
+    # Personal Year changes on Jan 1st, so the current PY is used for every month of this calendar year.
+    monthly_forecast = [personal_month(personal_year_value, m_num) for m_num in range(1, 13)]
         
-    return {
-        "current": {
-            "personal_year": personal_year,
-            "personal_month": personal_month,
-            "personal_day": personal_day,
-            "date": target_date
-        },
-        "yearly_forecast": yearly_forecast,
-        "monthly_forecast": monthly_forecast
-    }
+    return PersonalPeriods(
+        target_date, personal_year_value, personal_month_value, personal_day_value,
+        yearly_forecast, monthly_forecast,
+    )
 
-def calculate_name_number(name: str) -> dict:
+def calculate_personal_periods(dob: str, target_date: str = None) -> dict:
+    """
+    personal_periods as the nested {"current", "yearly_forecast", "monthly_forecast"} dict.
+    """
+    return personal_periods(dob, target_date).to_json()
+
+def calculate_name_number(name: str, system=None) -> dict:
     """
     Calculates Name Number using Chaldean Numerology method.
     Mapping:
@@ -207,23 +262,22 @@ def calculate_name_number(name: str) -> dict:
     6: U, V, W
     7: O, Z
     8: F, P
+    Pass a systems.System to use its letter values instead.
     """
     if not name:
         return {"total_sum": 0, "single_digit": 0}
-        
-    chaldean_map = {
-        'a': 1, 'i': 1, 'j': 1, 'q': 1, 'y': 1,
-        'b': 2, 'k': 2, 'r': 2,
-        'c': 3, 'g': 3, 'l': 3, 's': 3,
-        'd': 4, 'm': 4, 't': 4,
-        'e': 5, 'h': 5, 'n': 5, 'x': 5,
-        'u': 6, 'v': 6, 'w': 6,
-        'o': 7, 'z': 7,
-        'f': 8, 'p': 8
-    }
-    
-    clean_name = ''.join(c.lower() for c in name if c.isalpha())
-    total_sum = sum(chaldean_map.get(char, 0) for char in clean_name)
+
+    if system is None:
+        letter_bytes, letters = tables.CHALDEAN_BYTES, tables.CHALDEAN
+    else:
+        letter_bytes, letters = system.letter_bytes, system.letters
+
+    if name.isascii():
+        # Non-letters translate to 0, so no filtering pass is needed
+        total_sum = sum(name.encode().translate(letter_bytes))
+    else:
+        clean_name = ''.join(c.lower() for c in name if c.isalpha())
+        total_sum = sum(letters.get(char, 0) for char in clean_name)
     single_digit = reduce_to_single_digit(total_sum)
     
     return {
@@ -238,8 +292,7 @@ def calculate_mobile_total(mobile_number: str) -> dict:
     Returns { "total_sum": int, "single_digit": int }
     """
     # Filter only digits just in case
-    digits = [int(d) for d in mobile_number if d.isdigit()]
-    total = sum(digits)
+    total = _digit_total(mobile_number)
     single = reduce_to_single_digit(total)
     return {"total_sum": total, "single_digit": single}
 
@@ -248,8 +301,7 @@ def calculate_vehicle_total(vehicle_number: str) -> dict:
     Sums only the digits in the vehicle registration number.
     Returns { "total_sum": int, "single_digit": int }
     """
-    digits = [int(d) for d in vehicle_number if d.isdigit()]
-    total = sum(digits)
+    total = _digit_total(vehicle_number)
     single = reduce_to_single_digit(total)
     return {"total_sum": total, "single_digit": single}
 
@@ -258,13 +310,12 @@ def calculate_house_total(house_number: str) -> dict:
     Sums the digits of the house number.
     Returns { "total_sum": int, "single_digit": int }
     """
-    digits = [int(d) for d in house_number if d.isdigit()]
-    total = sum(digits)
+    total = _digit_total(house_number)
     single = reduce_to_single_digit(total)
     return {"total_sum": total, "single_digit": single}
 
 
-def get_compatibility(mulank: int, number: int) -> dict:
+def get_compatibility(mulank: int, number: int, system=None) -> dict:
     """
     Determines if the given number is Lucky (Friendly), Unlucky (Enemy), or Neutral
     for the given Mulank (1-9).
@@ -272,188 +323,100 @@ def get_compatibility(mulank: int, number: int) -> dict:
     Based on provided table.
     """
     
-    # Table Data
-    # Mulank: { Lucky: [...], Unlucky: [...], Neutral: [...] }
-    compatibility_data = {
-        1: {"lucky": [1, 2, 3, 5, 9], "unlucky": [8],       "neutral": [4, 6, 7]},
-        2: {"lucky": [1, 3, 5],       "unlucky": [4, 8, 9], "neutral": [2, 6, 7]},
-        3: {"lucky": [1, 2, 3, 5, 9], "unlucky": [6],       "neutral": [4, 7, 8]},
-        4: {"lucky": [1, 5, 6, 7, 8], "unlucky": [2, 9],    "neutral": [3, 4]},
-        5: {"lucky": [1, 2, 3, 5, 6], "unlucky": [],        "neutral": [4, 7, 8, 9]}, # Unlucky: None in table
-        6: {"lucky": [1, 5, 6, 7],    "unlucky": [3],       "neutral": [2, 4, 8, 9]},
-        7: {"lucky": [1, 3, 4, 5, 6], "unlucky": [],        "neutral": [2, 7, 8, 9]}, # Unlucky: None
-        8: {"lucky": [3, 5, 6, 7],    "unlucky": [1, 2],    "neutral": [4, 8, 9]},
-        9: {"lucky": [1, 2, 3, 9],    "unlucky": [4, 5],    "neutral": [6, 7, 8]},
-    }
-    
-    data = compatibility_data.get(mulank, {"lucky": [], "unlucky": [], "neutral": []})
-    
-    if number in data["lucky"]:
-        status = "Lucky"
-    elif number in data["unlucky"]:
-        status = "Unlucky"
+    if system is None:
+        lucky_numbers, lucky_sets, unlucky_sets, matrix = tables.LUCKY_NUMBERS, tables.LUCKY, tables.UNLUCKY, tables.STATUS
     else:
-        status = "Neutral"
-        
-    return {
-        "status": status,
-        "lucky_numbers": data["lucky"]
-    }
-    
-    if number in data["lucky"]:
+        lucky_numbers, lucky_sets, unlucky_sets, matrix = system.lucky_numbers, system.lucky, system.unlucky, system.status
+
+    lucky = lucky_numbers.get(mulank)
+    if lucky is None:
+        return {"status": "Neutral", "lucky_numbers": []}
+
+    if type(number) is int and type(mulank) is int and 0 <= number <= 9:
+        status = matrix[mulank][number]
+    elif number in lucky_sets[mulank]:
         status = "Lucky"
-    elif number in data["unlucky"]:
+    elif number in unlucky_sets[mulank]:
         status = "Unlucky"
     else:
         status = "Neutral"
-        
+
     return {
         "status": status,
-        "lucky_numbers": data["lucky"]
+        "lucky_numbers": list(lucky)
     }
 
-def calculate_pinnacles_and_challenges(dob: str) -> dict:
+def pinnacle_cycles(dob: str, system=None) -> PinnacleCycles:
     """
     Calculates 4 Pinnacles and 4 Challenges.
     Pinnacle Math: Addition. Do not reduce Master Numbers 11 or 22 in intermediate sums.
     Challenge Math: Absolute difference. Always reduce to single digits (1-9). No Master Numbers.
     Timing Rule: First Pinnacle ends at 36 - LP.
+    Pass a systems.System to use its Master Numbers.
     """
-    parts = dob.split("-")
-    birth_year = int(parts[0])
-    birth_month = int(parts[1])
-    birth_day = int(parts[2])
-    
-    # Base Numbers
-    # Month (M)
-    m_pinnacle = birth_month # Preserve 11 for Pinnacles (logic handled in sum)
-    # Actually, the prompt says: "Nov = 11; preserve 11 for Pinnacles"
-    # But for addition M+D, if M=11, we use 11.
-    
-    m_challenge = reduce_to_single_digit(birth_month) # Reduce for Challenges
-    
-    # Day (D)
-    d_pinnacle = birth_day # Preserve but usually simplified? 
-    # Prompt: "Reduced birth day (e.g., 26 = 8)." for Base Numbers. 
-    # But later "Pinnacle Math: Use addition. Do not reduce Master Numbers 11 or 22 if they appear in intermediate sums".
-    # This implies we add the Reduced Base Numbers, but keep the Sum if it is 11 or 22.
-    # "Base Numbers: Month... Day: Reduced birth day... Year: Reduced birth year..."
-    # So we MUST reduce D and Y and M (unless M is 11) BEFORE adding for Pinnacle?
-    # "Month ($M$): Reduced birth month (e.g., Nov = 11; preserve 11 for Pinnacles, reduce to 2 for Challenges)."
-    # "Day ($D$): Reduced birth day (e.g., 26 = 8)."
-    # "Year ($Y$): Reduced birth year (e.g., 1985...=5)."
-    # So D and Y are ALWAYS reduced. M is 11 or reduced.
-    
-    d_reduced = reduce_to_single_digit(birth_day)
-    # Check if we should preserve 11/22 for Day? Prompt doesn't explicitly say for Day/Year base, only Month.
-    # "Day ($D$): Reduced birth day (e.g., 26 = 8)." -> Implies always reduce.
-    # "Year ($Y$): Reduced birth year... = 5". -> Implies always reduce.
-    
-    y_reduced = reduce_to_single_digit(reduce_to_single_digit(birth_year)) # Recursive reduction to be sure? 
-    # The reduce_to_single_digit function already loops until < 10.
-    # Year calculation example: 1985 = 1+9+8+5 = 23 = 5. reduce_to_single_digit(1985) does this.
-    y_reduced = reduce_to_single_digit(birth_year)
-
-    # Life Path (LP) for Timing
-    # "Full reduction of DOB"
-    lp = reduce_to_single_digit(calculate_bhagyank(dob))
-    # Wait, calculate_bhagyank returns single digit.
-    # Prompt: "The First Pinnacle ends at age 36 minus the user’s Life Path number. If LP=11 or 22, use 2 or 4 for the subtraction logic."
-    # Since calculate_bhagyank already reduces to single digit, we don't know if it was 11 or 22.
-    # We need a non-reducing bhagyank calculation or check the intermediate.
-    # Let's re-calculate LP properly for Master detection.
-    
-    total_dob_sum = sum(int(d) for d in dob if d.isdigit())
-    lp_intermediate = total_dob_sum
-    while lp_intermediate > 9 and lp_intermediate not in [11, 22]:
-         lp_intermediate = sum(int(d) for d in str(lp_intermediate))
-    
-    lp_for_timing = lp_intermediate
-    if lp_for_timing == 11:
+    if system is None:
+        master_numbers, reduce_master = MASTER_NUMBERS, reduce_preserving_master
+    else:
+        master_numbers, reduce_master = system.master_numbers, system.reduce_master
+
+    birth_year, birth_month, birth_day = _dob_parts(dob)
+
+    # Base Numbers: Day and Year are always reduced. Month keeps a Master
+    # Number (Nov = 11) for Pinnacles and is reduced for Challenges.
+    d_base = reduce_to_single_digit(birth_day)
+    y_base = reduce_to_single_digit(birth_year)
+    m_base_c = reduce_to_single_digit(birth_month)
+    m_base_p = birth_month if birth_month in master_numbers else m_base_c
+
+    # Life Path (LP) for Timing: the full DOB total reduced preserving Master
+    # Numbers, since Bhagyank can't tell 11 or 22 from 2 or 4.
+    # "If LP=11 or 22, use 2 or 4 for the subtraction logic."
+    total_dob_sum = dob.digit_total if type(dob) is BirthDate else _digit_total(dob)
+    lp = reduce_master(total_dob_sum)
+    if lp == 11:
         deduction = 2
-    elif lp_for_timing == 22:
+    elif lp == 22:
         deduction = 4
     else:
-        # If it's still > 9 (e.g. 33, though prompt only mentions 11/22), reduce it?
-        # Standard numerology reduces 33 to 6 usually unless specified.
-        # "If LP=11 or 22, use 2 or 4...". Implies otherwise use LP value (which should be single digit).
-        # Our while loop ensures it is single digit OR 11/22.
-        if lp_for_timing > 9 and lp_for_timing not in [11, 22]:
-             lp_for_timing = reduce_to_single_digit(lp_for_timing) # Should be covered by while loop
-        deduction = reduce_to_single_digit(lp_for_timing)
-
-    # Calculation Helpers
+        deduction = reduce_to_single_digit(lp)
+
     def pinnacle_add(a, b):
-        s = a + b
         # "Do not reduce Master Numbers 11 or 22 if they appear in intermediate sums (e.g., M(11)+D(11)=22)."
-        if s in [11, 22]:
+        s = a + b
+        if s in master_numbers:
             return s
         return reduce_to_single_digit(s)
 
     def challenge_sub(a, b):
-        diff = abs(a - b)
-        # "Always reduce all numbers to single digits (1-9) before subtracting."
-        # Use m_challenge, d_reduced, y_reduced which are single digits (M might be 11? No m_challenge is reduced).
-        return reduce_to_single_digit(diff)
-    
-    # Base for Pinnacles
-    # M: "Nov = 11; preserve 11 for Pinnacles". 
-    if birth_month == 11:
-        m_base_p = 11
-    else:
-        m_base_p = reduce_to_single_digit(birth_month)
-        
-    d_base_p = d_reduced
-    y_base_p = y_reduced
+        return reduce_to_single_digit(abs(a - b))
 
     # Pinnacles
-    p1 = pinnacle_add(m_base_p, d_base_p)
-    p2 = pinnacle_add(d_base_p, y_base_p)
+    p1 = pinnacle_add(m_base_p, d_base)
+    p2 = pinnacle_add(d_base, y_base)
     p3 = pinnacle_add(p1, p2)
-    p4 = pinnacle_add(m_base_p, y_base_p)
-    
+    p4 = pinnacle_add(m_base_p, y_base)
+
     # Challenges
-    # "reduce to single digits... before subtracting"
-    m_base_c = reduce_to_single_digit(birth_month)
-    d_base_c = d_reduced
-    y_base_c = y_reduced
-    
-    c1 = challenge_sub(m_base_c, d_base_c)
-    c2 = challenge_sub(d_base_c, y_base_c)
+    c1 = challenge_sub(m_base_c, d_base)
+    c2 = challenge_sub(d_base, y_base)
     c3 = challenge_sub(c1, c2)
-    c4 = challenge_sub(m_base_c, y_base_c)
-    
-    # Ranges
+    c4 = challenge_sub(m_base_c, y_base)
+
+    # Ranges: Birth to (36 - LP), then "Next 9 Years" twice, then the rest (see PinnacleCycles.ranges)
     end_p1 = 36 - deduction
-    range_p1 = f"Birth to {end_p1}"
-    
-    start_p2 = end_p1 + 1
-    end_p2 = start_p2 + 8 # "Next 9 Years" (inclusive? usually 9 year cycle. e.g. 0-27 (28 yrs? No 36-9=27. 0-27 is 28 years. 28-36 is 9 years).
-    # Prompt: "Birth to (36-LP)". "Next 9 Years".
-    # Implementation: Age ranges.
-    range_p2 = f"{start_p2} to {end_p2}"
-    
-    start_p3 = end_p2 + 1
-    end_p3 = start_p3 + 8 # Next 9 Years
-    range_p3 = f"{start_p3} to {end_p3}"
-    
-    start_p4 = end_p3 + 1
-    range_p4 = f"{start_p4}+"
-    
-    return [
-        {"cycle": "I (Spring)", "range": range_p1, "pinnacle": p1, "challenge": c1},
-        {"cycle": "II (Summer)", "range": range_p2, "pinnacle": p2, "challenge": c2},
-        {"cycle": "III (Autumn)", "range": range_p3, "pinnacle": p3, "challenge": c3},
-        {"cycle": "IV (Winter)", "range": range_p4, "pinnacle": p4, "challenge": c4},
-    ]
+    return PinnacleCycles((p1, p2, p3, p4), (c1, c2, c3, c4), end_p1)
 
-def calculate_essence(dob: str, full_name: str) -> list:
+def calculate_pinnacles_and_challenges(dob: str, system=None) -> list:
     """
-    Calculates Essence (Event) Number Grid for age 0 to 100.
+    pinnacle_cycles as a list of {"cycle", "range", "pinnacle", "challenge"} dicts.
     """
-    if not full_name:
-        return []
+    return pinnacle_cycles(dob, system).to_json()
 
+def _essence_name_values(full_name: str, system=None) -> list:
+    """
+    Splits a full name into First, Middle and Last and returns the list of
+    Chaldean letter values for each part (an empty list for a missing part).
+    """
     # Parse Name
     # "Required Inputs: Full Name (First, Middle, Last)"
     # We assume space separated.
@@ -466,87 +429,92 @@ def calculate_essence(dob: str, full_name: str) -> list:
     # Logic if >3 names: First, Middle...Middle, Last. Join Middles? 
     # "IF MiddleName = NULL THEN MiddleValue = 0."
     
-    # Clean names
-    def clean(s):
-        return ''.join(c.upper() for c in s if c.isalpha())
-    
-    first = clean(first)
-    middle = clean(middle)
-    last = clean(last)
-    
-    # Helper to get sequence of letters and durations
-    chaldean_map = {
-        'A': 1, 'I': 1, 'J': 1, 'Q': 1, 'Y': 1,
-        'B': 2, 'K': 2, 'R': 2,
-        'C': 3, 'G': 3, 'L': 3, 'S': 3,
-        'D': 4, 'M': 4, 'T': 4,
-        'E': 5, 'H': 5, 'N': 5, 'X': 5,
-        'U': 6, 'V': 6, 'W': 6,
-        'O': 7, 'Z': 7,
-        'F': 8, 'P': 8
-    }
-    
-    def get_letter_sequence(name_str):
-        seq = []
-        for char in name_str:
-            val = chaldean_map.get(char, 0)
-            seq.append({"char": char, "val": val, "duration": val}) # duration = value
-        return seq
-    
-    seq_first = get_letter_sequence(first)
-    seq_middle = get_letter_sequence(middle)
-    seq_last = get_letter_sequence(last)
-    
-    birth_year = int(dob.split("-")[0])
-    
-    essence_grid = []
-    
-    # Pointers for each name part
-    # We need to track current letter index and remaining years for that letter
-    
-    def init_tracker(seq):
-        if not seq: return None
-        return {"index": 0, "remaining": seq[0]["duration"]}
-        
-    t_first = init_tracker(seq_first)
-    t_middle = init_tracker(seq_middle)
-    t_last = init_tracker(seq_last)
-    
-    for age in range(101): # 0 to 100
-        year = birth_year + age
-        
-        # Calculate Essence
-        val_f = seq_first[t_first["index"]]["val"] if t_first else 0
-        val_m = seq_middle[t_middle["index"]]["val"] if t_middle else 0
-        val_l = seq_last[t_last["index"]]["val"] if t_last else 0
-        
-        total = val_f + val_m + val_l
+    if system is None:
+        letter_bytes, letters_upper = tables.CHALDEAN_BYTES, tables.CHALDEAN_UPPER
+    else:
+        letter_bytes, letters_upper = system.letter_bytes, system.letters_upper
+
+    def letter_values(s):
+        if s.isascii():
+            # Drop non-letters, then map each letter byte to its value
+            return list(s.encode().translate(letter_bytes, tables.NON_LETTER_BYTES))
+        # Upper-casing can expand a letter (e.g. 'ß' -> 'SS'), so clean first
+        clean = ''.join(c.upper() for c in s if c.isalpha())
+        return [letters_upper.get(char, 0) for char in clean]
+
+    return [letter_values(part) for part in (first, middle, last)]
+
+def _essence_cursor(values: list, age: int):
+    """
+    Returns [letter index, years remaining on that letter] for the letter
+    active at the given age, or None for an empty name part.
+    Each letter lasts its value in years (a 0-value letter still occupies
+    one year) and the name repeats, so the position is age modulo the
+    cycle length rather than a year-by-year walk from birth.
+    """
+    if not values:
+        return None
+    position = age % sum(max(v, 1) for v in values)
+    for index, value in enumerate(values):
+        duration = max(value, 1)
+        if position < duration:
+            return [index, duration - position]
+        position -= duration
+
+def _essence_numbers(full_name: str, start_age: int, end_age: int, system=None):
+    """
+    Yields the Essence number for each age from start_age to end_age (inclusive).
+    """
+    reduce_master = reduce_preserving_master if system is None else system.reduce_master
+    name_values = _essence_name_values(full_name, system)
+    cursors = [_essence_cursor(values, start_age) for values in name_values]
+    
+    for _ in range(start_age, end_age + 1):
+        total = 0
+        for values, cursor in zip(name_values, cursors):
+            if cursor:
+                total += values[cursor[0]]
         
         # Reduce to single digit or Master Number (11, 22)
         # "Reduce the total to a single digit (1–9) or Master Number (11, 22)."
-        reduced_essence = total
-        while reduced_essence > 9 and reduced_essence not in [11, 22]:
-             reduced_essence = sum(int(d) for d in str(reduced_essence))
-             
-        essence_grid.append({
-            "age": age,
-            "year": year,
-            "essence": reduced_essence
-        })
-        
-        # Advance Pointers
-        def advance(tracker, seq):
-            if not tracker: return
-            tracker["remaining"] -= 1
-            if tracker["remaining"] <= 0:
-                # Move to next letter
-                tracker["index"] += 1
-                if tracker["index"] >= len(seq):
-                    tracker["index"] = 0 # Loop
-                tracker["remaining"] = seq[tracker["index"]]["duration"]
-                
-        advance(t_first, seq_first)
-        advance(t_middle, seq_middle)
-        advance(t_last, seq_last)
+        yield reduce_master(total)
         
-    return essence_grid
+        # Advance each part to its next letter when the current one runs out
+        for values, cursor in zip(name_values, cursors):
+            if cursor:
+                cursor[1] -= 1
+                if cursor[1] <= 0:
+                    cursor[0] = (cursor[0] + 1) % len(values)
+                    cursor[1] = max(values[cursor[0]], 1)
+
+def iter_essence(dob: str, full_name: str, start_age: int = 0, end_age: int = 100, system=None):
+    """
+    Yields Essence (Event) Number entries for ages start_age to end_age
+    (inclusive), jumping straight to start_age.
+    """
+    if not full_name:
+        return
+
+    birth_year = dob.year if type(dob) is BirthDate else int(dob.split("-")[0])
+    for age, essence in enumerate(_essence_numbers(full_name, start_age, end_age, system), start_age):
+        yield {
+            "age": age,
+            "year": birth_year + age,
+            "essence": essence
+        }
+
+def essence_timeline(dob: str, full_name: str, start_age: int = 0, end_age: int = 100, system=None) -> EssenceTimeline:
+    """
+    Calculates Essence (Event) Number Grid, by default for age 0 to 100.
+    Pass start_age/end_age to get only a window of ages.
+    """
+    if not full_name:
+        return EssenceTimeline(0, start_age, b"")
+    birth_year = dob.year if type(dob) is BirthDate else int(dob.split("-")[0])
+    return EssenceTimeline(birth_year, start_age, _essence_numbers(full_name, start_age, end_age, system))
+
+def calculate_essence(dob: str, full_name: str, start_age: int = 0, end_age: int = 100, system=None) -> list:
+    """
+    essence_timeline as a list of {"age", "year", "essence"} dicts.
+    """
+    return essence_timeline(dob, full_name, start_age, end_age, system).to_json()
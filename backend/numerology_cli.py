@@ -0,0 +1,414 @@
+"""
+Command-line bulk scoring over the numerology engine.
+
+Reads CSV or NDJSON records with name/dob/gender/mobile/vehicle/house
+columns and streams one result per record, without the FastAPI server.
+
+    python numerology_cli.py score clients.csv -o scored.ndjson
+    cat clients.ndjson | python numerology_cli.py score --input-format ndjson --output-format csv
+    python numerology_cli.py score clients.csv -o scored.parquet
+    python numerology_cli.py score clients.csv --workers 8 -o scored.ndjson
+    python numerology_cli.py recommend inventory.txt --dob 1990-06-29 --prefer 19,23 --top-k 20
+    python numerology_cli.py match people.csv --top-k 10 --workers 4 -o matches.ndjson
+    python numerology_cli.py stats users.csv --workers 4
+
+Input and output are processed as generators, so memory stays flat
+regardless of input size. Throughput is reported on stderr when done; the
+one-off DOB table build is timed separately.
+Arrow and Parquet output (see columnar.py) need pyarrow.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import analysis
+import columnar
+import dob_table
+import matching
+import population_stats
+import recommend
+import systems
+import results
+from birthdate import BirthDate
+
+FIELDS = ("name", "dob", "gender", "mobile", "vehicle", "house")
+
+CSV_COLUMNS = [
+    "name", "dob", "gender",
+    "mulank", "bhagyank", "kua", "name_total", "name_number",
+    "mobile_total", "mobile_compound", "mobile_status",
+    "vehicle_total", "vehicle_compound", "vehicle_status",
+    "house_total", "house_compound", "house_status",
+    "error",
+]
+
+
+# --- Input ---
+
+def read_csv(stream):
+    for row in csv.DictReader(stream):
+        yield row
+
+
+def read_ndjson(stream):
+    # A line that is not valid JSON yields None, reported by normalize_record
+    for line in stream:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+
+def detect_format(path: str, default: str) -> str:
+    if path and path != "-":
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".csv":
+            return "csv"
+        if ext in (".ndjson", ".jsonl"):
+            return "ndjson"
+        if ext in (".arrow", ".feather"):
+            return "arrow"
+        if ext == ".parquet":
+            return "parquet"
+    return default
+
+
+def normalize_record(row: dict) -> dict:
+    """
+    Reduces an input row to the known fields as stripped strings
+    (missing or empty values become ""). A row that is not an object
+    (invalid JSON, or an NDJSON array or scalar) gets empty fields and an
+    "error", so it is reported as an error row instead of stopping the run.
+    """
+    if not isinstance(row, dict):
+        record = dict.fromkeys(FIELDS, "")
+        record["error"] = "record is not valid JSON" if row is None else "record is not a JSON object"
+        return record
+    record = {}
+    for field in FIELDS:
+        value = row.get(field)
+        record[field] = "" if value is None else str(value).strip()
+    return record
+
+
+# --- Scoring ---
+
+def score_record(context: analysis.BatchContext, record: dict) -> dict:
+    """
+    Scores one normalized record. A person analysis is produced when name,
+    dob and gender are present; each of mobile/vehicle/house is analyzed
+    when present. Errors are reported in the result rather than raised.
+    """
+    result = {"name": record["name"], "dob": record["dob"], "gender": record["gender"]}
+    try:
+        if "error" in record:
+            raise ValueError(record["error"])
+        if not record["dob"]:
+            raise ValueError("dob is required")
+        dob = BirthDate.parse(record["dob"])
+        if record["name"] and record["gender"]:
+            result["analysis"] = context.analyze_person(record["name"], dob, record["gender"])
+        for kind in analysis.NUMBER_TOTALS:
+            if record[kind]:
+                result[kind] = context.analyze_number(kind, record[kind], dob)
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# --- Output ---
+
+def flatten_result(result: dict) -> dict:
+    """
+    Projects a scored result onto CSV_COLUMNS.
+    """
+    row = {"name": result["name"], "dob": result["dob"], "gender": result["gender"]}
+    person = result.get("analysis")
+    if person:
+        row["mulank"] = person["mulank"]
+        row["bhagyank"] = person["bhagyank"]
+        row["kua"] = person["kua"]
+        row["name_total"] = person["name_number"]["total_sum"]
+        row["name_number"] = person["name_number"]["single_digit"]
+    for kind in analysis.NUMBER_TOTALS:
+        data = result.get(kind)
+        if data:
+            row["mulank"] = data["mulank"]
+            row["bhagyank"] = data["bhagyank"]
+            row[f"{kind}_total"] = data[f"{kind}_total"]
+            row[f"{kind}_compound"] = data[f"{kind}_compound"]
+            row[f"{kind}_status"] = data["compatibility"]["status"]
+    row["error"] = result.get("error", "")
+    return row
+
+
+def encode_chunk(records: list, output_format: str):
+    """
+    Scores and encodes a chunk of records into output text (without the CSV
+    header), or a pyarrow RecordBatch for arrow/parquet. Runs inside pool
+    workers so only text or Arrow buffers cross the process boundary.
+    """
+    context = analysis.BatchContext()
+    scored = (score_record(context, record) for record in records)
+    if output_format in columnar.FORMATS:
+        return columnar.record_batch(list(scored))
+    if output_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, restval="")
+        for result in scored:
+            writer.writerow(flatten_result(result))
+        return buffer.getvalue()
+    return "".join(json.dumps(result, separators=(",", ":"), default=results.default) + "\n" for result in scored)
+
+
+def score_stream(records, output_format: str = "ndjson", workers: int = 1, chunk_size: int = 1000):
+    """
+    Yields (row_count, encode_chunk output) per chunk of records, in input order.
+
+    With workers > 1, chunks are scored in a process pool. At most
+    2 * workers chunks are in flight at once, so a slow consumer or a huge
+    input never buffers more than that.
+    """
+    chunks = _chunks(records, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield len(chunk), encode_chunk(chunk, output_format)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((len(chunk), pool.submit(encode_chunk, chunk, output_format)))
+            if len(pending) >= 2 * workers:
+                count, future = pending.popleft()
+                yield count, future.result()
+        while pending:
+            count, future = pending.popleft()
+            yield count, future.result()
+
+
+# --- Entry point ---
+
+def build_tables() -> float:
+    """
+    Builds the shared DOB table before any timed work (pool workers fork
+    with it already built) and returns the seconds it took.
+    """
+    began = time.perf_counter()
+    dob_table.get_table()
+    return time.perf_counter() - began
+
+
+def cmd_score(args) -> int:
+    input_format = args.input_format or detect_format(args.input, "csv")
+    output_format = args.output_format or detect_format(args.output, "ndjson")
+
+    if output_format in columnar.FORMATS:
+        columnar.require_pyarrow()
+
+    src = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    if output_format in columnar.FORMATS:
+        dst = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    else:
+        dst = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        rows = read_csv(src) if input_format == "csv" else read_ndjson(src)
+        records = (normalize_record(row) for row in rows)
+
+        setup = build_tables()
+        began = time.perf_counter()
+        chunks = score_stream(records, output_format, args.workers, args.chunk_size)
+        count = 0
+        if output_format in columnar.FORMATS:
+            with columnar.BatchWriter(dst, output_format) as writer:
+                for rows_done, batch in chunks:
+                    writer.write(batch)
+                    count += rows_done
+        else:
+            if output_format == "csv":
+                csv.DictWriter(dst, fieldnames=CSV_COLUMNS).writeheader()
+            for rows_done, text in chunks:
+                dst.write(text)
+                count += rows_done
+        elapsed = time.perf_counter() - began
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst not in (sys.stdout, sys.stdout.buffer):
+            dst.close()
+
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"Built DOB table in {setup:.2f}s", file=sys.stderr)
+    print(f"Scored {count} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)", file=sys.stderr)
+    return 0
+
+
+def cmd_recommend(args) -> int:
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        # One candidate per line; blank lines are skipped
+        candidates = (line.strip() for line in src if line.strip())
+        setup = build_tables()
+        began = time.perf_counter()
+        result = recommend.recommend(
+            args.dob, candidates, args.kind, args.top_k, args.prefer,
+            workers=args.workers, chunk_size=args.chunk_size,
+        )
+        elapsed = time.perf_counter() - began
+    finally:
+        if src is not sys.stdin:
+            src.close()
+
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    rate = result["scanned"] / elapsed if elapsed > 0 else 0.0
+    print(f"Built DOB table in {setup:.2f}s", file=sys.stderr)
+    print(f"Scanned {result['scanned']} candidates in {elapsed:.2f}s ({rate:,.0f} numbers/sec)", file=sys.stderr)
+    return 0
+
+
+def cmd_match(args) -> int:
+    input_format = args.input_format or detect_format(args.input, "csv")
+    src = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    try:
+        rows = read_csv(src) if input_format == "csv" else read_ndjson(src)
+        dobs, ids = [], []
+        for line, row in enumerate(rows, 1):
+            record = normalize_record(row)
+            if "error" in record:
+                print(f"Record {line}: {record['error']}", file=sys.stderr)
+                return 1
+            try:
+                dobs.append(BirthDate.parse(record["dob"]))
+            except ValueError as e:
+                print(f"Record {line}: {e}", file=sys.stderr)
+                return 1
+            # People are identified by id, else name, in the output
+            ids.append(str(row.get("id") or record["name"]))
+    finally:
+        if src is not sys.stdin:
+            src.close()
+
+    began = time.perf_counter()
+    group = matching.MatchGroup(dobs, ids, systems.resolve(args.system))
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        if args.summary:
+            json.dump(group.summary(args.top_k, args.min_score), dst, indent=2)
+            dst.write("\n")
+        else:
+            for _, text in matching.match_all(group, args.top_k, args.min_score, args.workers, args.chunk_size):
+                dst.write(text)
+    finally:
+        if dst is not sys.stdout:
+            dst.close()
+    elapsed = time.perf_counter() - began
+    print(f"Matched {group.size} people in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+def cmd_stats(args) -> int:
+    input_format = args.input_format or detect_format(args.input, "csv")
+    src = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    try:
+        rows = read_csv(src) if input_format == "csv" else read_ndjson(src)
+        setup = build_tables()
+        began = time.perf_counter()
+        stats = population_stats.aggregate(rows, args.workers, args.chunk_size)
+        elapsed = time.perf_counter() - began
+    finally:
+        if src is not sys.stdin:
+            src.close()
+
+    json.dump(stats.report(args.top_patterns), sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    rate = stats.records / elapsed if elapsed > 0 else 0.0
+    print(f"Built DOB table in {setup:.2f}s", file=sys.stderr)
+    print(f"Aggregated {stats.records} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)", file=sys.stderr)
+    return 0
+
+
+def _birth_date(value: str) -> BirthDate:
+    try:
+        return BirthDate.parse(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def _int_list(value: str) -> list:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Bulk numerology scoring")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    score = sub.add_parser("score", help="Score CSV/NDJSON records")
+    score.add_argument("input", nargs="?", default="-", help="Input file (default: stdin)")
+    score.add_argument("-o", "--output", default="-", help="Output file (default: stdout)")
+    score.add_argument("--input-format", choices=["csv", "ndjson"], help="Default: from extension, else csv")
+    score.add_argument("--output-format", choices=["csv", "ndjson", "arrow", "parquet"],
+                       help="Default: from extension, else ndjson")
+    score.add_argument("--workers", type=int, default=1, help="Processes to fan out across (default: 1)")
+    score.add_argument("--chunk-size", type=int, default=1000, help="Records per worker task (default: 1000)")
+    score.set_defaults(func=cmd_score)
+
+    rec = sub.add_parser("recommend", help="Rank candidate numbers (one per line) for a DOB")
+    rec.add_argument("input", nargs="?", default="-", help="Candidate file (default: stdin)")
+    rec.add_argument("--dob", type=_birth_date, required=True, help="Date of birth, YYYY-MM-DD")
+    rec.add_argument("--kind", choices=list(analysis.NUMBER_TOTALS), default="mobile")
+    rec.add_argument("--top-k", type=int, default=10)
+    rec.add_argument("--prefer", type=_int_list, default=[], help="Preferred compound totals, e.g. 19,23,32")
+    rec.add_argument("--workers", type=int, default=1,
+                     help="Processes to rank chunks in (default: 1); chunks are pickled to workers, so measure before raising it")
+    rec.add_argument("--chunk-size", type=int, default=100000, help="Candidates per worker task (default: 100000)")
+    rec.set_defaults(func=cmd_recommend)
+
+    match = sub.add_parser("match", help="Rank compatible matches within a group of people (id/name and dob columns)")
+    match.add_argument("input", nargs="?", default="-", help="Input file (default: stdin)")
+    match.add_argument("-o", "--output", default="-", help="Output file (default: stdout)")
+    match.add_argument("--input-format", choices=["csv", "ndjson"], help="Default: from extension, else csv")
+    match.add_argument("--top-k", type=int, default=10, help="Matches per person (default: 10)")
+    match.add_argument("--min-score", type=int, default=0, help="Lowest pair score to match, 0-4 (default: 0)")
+    match.add_argument("--summary", action="store_true", help="Print the group summary instead of per-person matches")
+    match.add_argument("--system", help="Numerology system from systems.json (default: configured default)")
+    match.add_argument("--workers", type=int, default=1, help="Processes to fan out across (default: 1)")
+    match.add_argument("--chunk-size", type=int, default=5000, help="People per worker task (default: 5000)")
+    match.set_defaults(func=cmd_match)
+
+    stats = sub.add_parser("stats", help="Mulank/Bhagyank/Kua, Lo Shu and lucky-mobile distributions of CSV/NDJSON records")
+    stats.add_argument("input", nargs="?", default="-", help="Input file (default: stdin)")
+    stats.add_argument("--input-format", choices=["csv", "ndjson"], help="Default: from extension, else csv")
+    stats.add_argument("--top-patterns", type=int, default=20, help="Missing-number patterns to list (default: 20)")
+    stats.add_argument("--workers", type=int, default=1, help="Processes to shard across (default: 1)")
+    stats.add_argument("--chunk-size", type=int, default=10000, help="Records per shard (default: 10000)")
+    stats.set_defaults(func=cmd_stats)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
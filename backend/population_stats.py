@@ -0,0 +1,248 @@
+"""
+One-pass distribution statistics over a population of records (the
+name/dob/gender/mobile columns numerology_cli reads):
+
+- Mulank, Bhagyank and Kua counts
+- Lo Shu digit presence: the share of people whose grid has each digit
+- missing-number patterns: how often each set of absent Lo Shu digits occurs
+- mobile numbers per Mulank, and the share that are Lucky for it
+
+PopulationStats holds only fixed-size counters (at most 512 missing
+patterns), so memory is constant whatever the number of records. Two
+aggregates merge by adding counters, so shards can be aggregated in
+separate processes and combined:
+
+    stats = PopulationStats()
+    stats.add_records(records)
+    stats.merge(other_shard)
+    stats.report()
+
+aggregate() shards a record stream across a process pool, and
+RecordDecoder turns an uploaded CSV/NDJSON body into records as its
+bytes arrive.
+"""
+import codecs
+import csv
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import analysis
+import numerology
+from birthdate import BirthDate
+
+DIGITS = range(1, 10)
+STATUSES = ("Lucky", "Neutral", "Unlucky")
+
+
+def _field(record: dict, name: str) -> str:
+    value = record.get(name)
+    return "" if value is None else str(value).strip()
+
+
+def _pattern(mask: int) -> list:
+    # Digits whose bit is set in a missing-digit mask (bit d - 1 for digit d)
+    return [d for d in DIGITS if mask >> (d - 1) & 1]
+
+
+class PopulationStats:
+    """
+    Mergeable counters; see the module docstring.
+    """
+
+    def __init__(self):
+        self.records = 0
+        self.errors = 0
+        self.mulank = [0] * 10
+        self.bhagyank = [0] * 10
+        # Kua, Lo Shu and missing patterns need gender, so count only those records
+        self.with_gender = 0
+        self.kua = [0] * 10
+        self.loshu_present = [0] * 10
+        self.missing = [0] * 512
+        # mobile[mulank][status index in STATUSES]
+        self.mobile = [[0, 0, 0] for _ in range(10)]
+
+    def add(self, record: dict):
+        """
+        Counts one input row. Rows that are not dicts or lack a valid dob
+        count as errors.
+        """
+        self.records += 1
+        try:
+            dob = BirthDate.parse(_field(record, "dob"))
+        except (ValueError, AttributeError):
+            self.errors += 1
+            return
+        gender = _field(record, "gender")
+        if gender:
+            profile = analysis.dob_profile(dob, gender)
+            mulank, bhagyank = profile["mulank"], profile["bhagyank"]
+            self.with_gender += 1
+            self.kua[profile["kua"]] += 1
+            mask = 0
+            for digit, count in zip(DIGITS, profile["loshu"].counts):
+                if count:
+                    self.loshu_present[digit] += 1
+                else:
+                    mask |= 1 << (digit - 1)
+            self.missing[mask] += 1
+        else:
+            mulank, bhagyank = analysis.core_numbers(dob)
+        self.mulank[mulank] += 1
+        self.bhagyank[bhagyank] += 1
+        mobile = _field(record, "mobile")
+        if mobile:
+            total = numerology.calculate_mobile_total(mobile)["single_digit"]
+            status = numerology.get_compatibility(mulank, total)["status"]
+            self.mobile[mulank][STATUSES.index(status)] += 1
+
+    def add_records(self, records) -> "PopulationStats":
+        for record in records:
+            self.add(record)
+        return self
+
+    def merge(self, other: "PopulationStats") -> "PopulationStats":
+        """
+        Adds other's counts into this aggregate.
+        """
+        self.records += other.records
+        self.errors += other.errors
+        self.with_gender += other.with_gender
+        for mine, theirs in (
+            (self.mulank, other.mulank), (self.bhagyank, other.bhagyank), (self.kua, other.kua),
+            (self.loshu_present, other.loshu_present), (self.missing, other.missing),
+        ):
+            for i, count in enumerate(theirs):
+                mine[i] += count
+        for mine, theirs in zip(self.mobile, other.mobile):
+            for i, count in enumerate(theirs):
+                mine[i] += count
+        return self
+
+    def report(self, top_patterns: int = 20) -> dict:
+        """
+        Counts and rates as a JSON-ready dict, with the top_patterns most
+        common missing-number patterns.
+        """
+        valid = self.records - self.errors
+
+        def share(count, total):
+            return round(count / total, 6) if total else 0.0
+
+        patterns = sorted(
+            ((count, mask) for mask, count in enumerate(self.missing) if count),
+            key=lambda entry: (-entry[0], entry[1]),
+        )
+        mobiles = []
+        for mulank in DIGITS:
+            counts = self.mobile[mulank]
+            total = sum(counts)
+            mobiles.append({
+                "mulank": mulank,
+                "mobiles": total,
+                **{status.lower(): count for status, count in zip(STATUSES, counts)},
+                "lucky_share": share(counts[0], total),
+            })
+        return {
+            "records": self.records,
+            "valid_records": valid,
+            "errors": self.errors,
+            "mulank": {str(n): self.mulank[n] for n in DIGITS},
+            "bhagyank": {str(n): self.bhagyank[n] for n in DIGITS},
+            "kua": {str(n): self.kua[n] for n in range(10) if self.kua[n]},
+            "loshu_presence": {
+                "people": self.with_gender,
+                "rates": {str(d): share(self.loshu_present[d], self.with_gender) for d in DIGITS},
+            },
+            "missing_patterns": {
+                "distinct": len(patterns),
+                "top": [
+                    {"missing": _pattern(mask), "people": count, "share": share(count, self.with_gender)}
+                    for count, mask in patterns[:top_patterns]
+                ],
+            },
+            "mobile_by_mulank": mobiles,
+        }
+
+
+class RecordDecoder:
+    """
+    Incremental CSV (with a header row) or NDJSON decoder for a body that
+    arrives in chunks: feed() returns the rows completed so far, close()
+    the rest. Only a partial line is buffered. CSV records must be one
+    per line. An NDJSON line that is not valid JSON decodes to None,
+    which PopulationStats counts as an error.
+    """
+
+    def __init__(self, input_format: str = "csv"):
+        if input_format not in ("csv", "ndjson"):
+            raise ValueError("input_format must be csv or ndjson")
+        self.input_format = input_format
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        self.partial = ""
+        self.header = None
+
+    def _rows(self, lines: list) -> list:
+        if self.input_format == "ndjson":
+            rows = []
+            for line in lines:
+                if line.strip():
+                    try:
+                        rows.append(json.loads(line))
+                    except ValueError:
+                        rows.append(None)
+            return rows
+        rows = csv.reader(line for line in lines if line.strip())
+        if self.header is None:
+            self.header = next(rows, None)
+        return [dict(zip(self.header, row)) for row in rows]
+
+    def feed(self, data: bytes) -> list:
+        text = self.partial + self.decoder.decode(data)
+        lines = text.split("\n")
+        self.partial = lines.pop()
+        return self._rows(lines)
+
+    def close(self) -> list:
+        text = self.partial + self.decoder.decode(b"", final=True)
+        self.partial = ""
+        return self._rows([text])
+
+
+def aggregate_chunk(records: list) -> PopulationStats:
+    """
+    Aggregates one shard; the unit of work for pool workers.
+    """
+    return PopulationStats().add_records(records)
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def aggregate(records, workers: int = 1, chunk_size: int = 10000) -> PopulationStats:
+    """
+    Aggregates a stream of normalized records in one pass. With
+    workers > 1, chunks are aggregated in a process pool (at most
+    2 * workers in flight) and merged as they finish.
+    """
+    total = PopulationStats()
+    if workers <= 1:
+        return total.add_records(records)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in _chunks(records, chunk_size):
+            pending.append(pool.submit(aggregate_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                total.merge(pending.popleft().result())
+        while pending:
+            total.merge(pending.popleft().result())
+    return total
@@ -0,0 +1,199 @@
+"""
+Opt-in request profiling.
+
+With NUMEROLOGY_PROFILING=1, ProfilingMiddleware runs cProfile around a
+sample of requests to the calculation routes (/analyze and friends) and
+writes each profile as a pstats file plus a small JSON sidecar (route,
+status, duration, trigger) into PROFILE_DIR, keeping the newest
+PROFILE_KEEP. A request is profiled when:
+
+- it sends X-Profile: <PROFILE_ADMIN_TOKEN>, to capture one slow input on
+  demand, or
+- a random draw falls under PROFILE_SAMPLE_RATE (0.0-1.0, default 0).
+
+Profiled responses carry X-Profile-Id, and the admin endpoints (which
+need X-Admin-Token: <PROFILE_ADMIN_TOKEN>) list and download profiles.
+Inspect a download with `python -m pstats <file>` or snakeviz.
+
+cProfile records everything on the event loop thread while enabled, so
+other requests interleaved with a profiled one show up in its profile,
+and only one request is profiled at a time. When profiling is off the
+middleware is not installed, so requests pay nothing.
+"""
+import cProfile
+import hmac
+import io
+import itertools
+import json
+import os
+import pstats
+import random
+import re
+import time
+
+PROFILED_PREFIXES = ("/analyze", "/search", "/recommend", "/suggest")
+PROFILE_ID = re.compile(r"^[0-9]{8}T[0-9]{6}-[0-9]+-[a-z0-9-]+$")
+
+
+class Profiler:
+    """
+    Decides which requests to profile and manages the profile directory.
+    """
+
+    def __init__(self, directory: str, sample_rate: float = 0.0, keep: int = 50, token: str = None):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.keep = keep
+        self.token = token or None
+        self.active = False
+        self._sequence = itertools.count(1)
+        os.makedirs(directory, exist_ok=True)
+
+    def check_token(self, token: str) -> bool:
+        """
+        Constant-time comparison with the admin token; always False when
+        no token is configured.
+        """
+        if self.token is None or token is None:
+            return False
+        return hmac.compare_digest(token.encode(), self.token.encode())
+
+    def trigger(self, path: str, header_token: str) -> str:
+        """
+        Why this request should be profiled ("header" or "sample"), or None.
+        """
+        if self.active or not path.startswith(PROFILED_PREFIXES):
+            return None
+        if header_token is not None and self.check_token(header_token):
+            return "header"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    def new_id(self, path: str) -> str:
+        slug = re.sub(r"[^a-z0-9]+", "-", path.lower()).strip("-") or "root"
+        return f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{next(self._sequence)}-{slug}"
+
+    def save(self, profile_id: str, profile: cProfile.Profile, meta: dict):
+        profile.dump_stats(os.path.join(self.directory, f"{profile_id}.pstats"))
+        with open(os.path.join(self.directory, f"{profile_id}.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        self.rotate()
+
+    def rotate(self):
+        profiles = self.list()
+        for old in profiles[self.keep:]:
+            for suffix in (".pstats", ".json"):
+                try:
+                    os.remove(os.path.join(self.directory, old["id"] + suffix))
+                except FileNotFoundError:
+                    pass
+
+    def list(self) -> list:
+        """
+        Saved profiles, newest first.
+        """
+        profiles = []
+        for entry in os.scandir(self.directory):
+            name, ext = os.path.splitext(entry.name)
+            if ext != ".pstats" or not PROFILE_ID.match(name):
+                continue
+            meta = {}
+            try:
+                with open(os.path.join(self.directory, name + ".json"), encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                pass
+            stat = entry.stat()
+            profiles.append(dict(meta, id=name, bytes=stat.st_size, mtime=stat.st_mtime))
+        profiles.sort(key=lambda p: (p["mtime"], p["id"]), reverse=True)
+        return profiles
+
+    def path(self, profile_id: str) -> str:
+        """
+        File path of a saved profile, or None for unknown or malformed ids.
+        """
+        if not PROFILE_ID.match(profile_id):
+            return None
+        path = os.path.join(self.directory, f"{profile_id}.pstats")
+        return path if os.path.exists(path) else None
+
+    def stats(self) -> dict:
+        return {"directory": self.directory, "sample_rate": self.sample_rate, "keep": self.keep}
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, profiler: Profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        header_token = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                header_token = value.decode("latin-1")
+                break
+        trigger = self.profiler.trigger(scope["path"], header_token)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = self.profiler.new_id(scope["path"])
+        status = 500
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = dict(message, headers=list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())])
+            await send(message)
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger) holds the hook; serve unprofiled
+            await self.app(scope, receive, send)
+            return
+        self.profiler.active = True
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.disable()
+            duration = time.perf_counter() - start
+            self.profiler.active = False
+            self.profiler.save(profile_id, profile, {
+                "path": scope["path"],
+                "method": scope["method"],
+                "status": status,
+                "duration_ms": round(duration * 1000, 3),
+                "trigger": trigger,
+            })
+
+
+def render_text(path: str, sort: str = "cumulative", limit: int = 60) -> str:
+    """
+    The pstats report for a saved profile, top functions by sort.
+    """
+    stream = io.StringIO()
+    pstats.Stats(path, stream=stream).strip_dirs().sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+def profiler_from_env() -> Profiler:
+    """
+    The configured Profiler, or None when NUMEROLOGY_PROFILING is not 1.
+    """
+    if os.getenv("NUMEROLOGY_PROFILING", "0") != "1":
+        return None
+    default_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+    return Profiler(
+        os.getenv("PROFILE_DIR", default_dir),
+        sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+        keep=int(os.getenv("PROFILE_KEEP", "50")),
+        token=os.getenv("PROFILE_ADMIN_TOKEN"),
+    )
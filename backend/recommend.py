@@ -0,0 +1,148 @@
+"""
+Number recommendation: rank candidate mobile, vehicle or house numbers
+for a date of birth.
+
+Candidates whose single-digit total is Lucky for the person's Mulank are
+kept. They are ranked by position in an optional list of preferred
+compound totals (candidates with other compounds come after), then by
+their order in the pool. The pool is streamed and only the best top_k
+are held, so it can come straight from a large inventory file. With
+workers > 1, chunks of the pool are scored in a process pool and their
+top_k lists are merged.
+"""
+import heapq
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import analysis
+import numerology
+import tables
+
+
+def digit_total(number: str, kind: str = "mobile") -> int:
+    """
+    Sum of the digits in number, as calculate_mobile_total and friends
+    compute it. ASCII numbers take a bytes.translate fast path.
+    """
+    if number.isascii():
+        return sum(number.encode().translate(tables.DIGIT_BYTES))
+    return analysis.NUMBER_TOTALS[kind](number)["total_sum"]
+
+
+def rank_chunk(candidates: list, mulank: int, kind: str, top_k: int, preferred: tuple, start: int = 0) -> tuple:
+    """
+    Scores one chunk of candidates. start is the chunk's position in the
+    whole pool. Returns (scanned, matched, best) where best holds at most
+    top_k (sort_key, number, compound, total) tuples.
+    """
+    lucky = tables.LUCKY[mulank]
+    preference = {compound: i for i, compound in enumerate(preferred)}
+    unpreferred = len(preferred)
+    scanned = 0
+    matched = 0
+
+    def lucky_entries():
+        nonlocal scanned, matched
+        for position, number in enumerate(candidates, start):
+            scanned += 1
+            compound = digit_total(number, kind)
+            total = numerology.reduce_to_single_digit(compound)
+            if total in lucky:
+                matched += 1
+                yield (preference.get(compound, unpreferred), position), number, compound, total
+
+    best = heapq.nsmallest(top_k, lucky_entries())
+    return scanned, matched, best
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def mulank_for(dob: str, kind: str) -> int:
+    """
+    Validates kind and returns the Mulank candidates are ranked for.
+    """
+    if kind not in analysis.NUMBER_TOTALS:
+        raise ValueError(f"kind must be one of {', '.join(analysis.NUMBER_TOTALS)}")
+    mulank, _ = analysis.core_numbers(dob)
+    if mulank not in tables.LUCKY:
+        raise ValueError(f"Cannot derive a Mulank from dob {dob!r}")
+    return mulank
+
+
+def tasks(candidates, mulank: int, kind: str, top_k: int, preferred: tuple, chunk_size: int):
+    """
+    rank_chunk arguments for each chunk_size chunk of candidates, for
+    rank_task.
+    """
+    for index, chunk in enumerate(_chunks(candidates, chunk_size)):
+        yield chunk, mulank, kind, top_k, preferred, index * chunk_size
+
+
+def rank_task(task: tuple) -> tuple:
+    """
+    rank_chunk over one tasks() entry; the unit of work for pool workers.
+    """
+    return rank_chunk(*task)
+
+
+def merge(total: tuple, part: tuple, top_k: int) -> tuple:
+    """
+    Combines two rank_chunk results, keeping the best top_k.
+    """
+    return total[0] + part[0], total[1] + part[1], heapq.nsmallest(top_k, total[2] + part[2])
+
+
+def summarize(mulank: int, kind: str, preferred: tuple, ranked: tuple) -> dict:
+    """
+    The recommend() payload for merged rank_chunk results.
+    """
+    scanned, matched, best = ranked
+    return {
+        "mulank": mulank,
+        "kind": kind,
+        "lucky_numbers": sorted(tables.LUCKY[mulank]),
+        "scanned": scanned,
+        "matched": matched,
+        "results": [
+            {
+                "number": number,
+                f"{kind}_total": total,
+                f"{kind}_compound": compound,
+                "preferred": key[0] < len(preferred),
+            }
+            for key, number, compound, total in best
+        ],
+    }
+
+
+def recommend(dob: str, candidates, kind: str = "mobile", top_k: int = 10, preferred_compounds=(),
+              workers: int = 1, chunk_size: int = 100000) -> dict:
+    """
+    Returns the top_k Lucky candidates for dob. candidates may be any
+    iterable of strings (e.g. an open file's lines, already stripped).
+    """
+    mulank = mulank_for(dob, kind)
+    preferred = tuple(preferred_compounds)
+    ranked = (0, 0, [])
+    work = tasks(candidates, mulank, kind, top_k, preferred, chunk_size)
+    if workers <= 1:
+        for task in work:
+            ranked = merge(ranked, rank_task(task), top_k)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for task in work:
+                pending.append(pool.submit(rank_task, task))
+                if len(pending) >= 2 * workers:
+                    ranked = merge(ranked, pending.popleft().result(), top_k)
+            while pending:
+                ranked = merge(ranked, pending.popleft().result(), top_k)
+    return summarize(mulank, kind, preferred, ranked)
@@ -0,0 +1,207 @@
+"""
+Compact result types for the bulky parts of an analysis.
+
+The dict versions cost a lot under batch load: an essence timeline was
+101 three-key dicts, personal periods 22 forecast dicts, and every Lo
+Shu grid a fresh string-keyed dict. These types hold the same numbers
+in __slots__ objects backed by bytes (every value fits in 0-255), so a
+whole timeline is one small object:
+
+- LoShuGrid: 9 counts, for digits 1-9.
+- PinnacleCycles: 4 pinnacles, 4 challenges and the end age of cycle I.
+- EssenceTimeline: one Essence number per age from start_age.
+- PersonalPeriods: the current year/month/day plus the 10 forecast
+  years and 12 forecast months.
+
+analysis.py keeps results in these forms (so do the caches and batch
+memos) and they turn into the original JSON shapes only at the edge:
+to_json() builds the dicts and lists, default() plugs that into
+json.dumps / orjson.dumps, and plain() converts a whole payload.
+Output is identical to the dict versions.
+"""
+from functools import lru_cache
+
+import tables
+
+CYCLE_NAMES = ("I (Spring)", "II (Summer)", "III (Autumn)", "IV (Winter)")
+GRID_KEYS = tuple(str(d) for d in range(1, 10))
+
+
+class LoShuGrid:
+    __slots__ = ("counts",)
+
+    def __init__(self, counts: bytes):
+        self.counts = bytes(counts)
+
+    def __getitem__(self, digit) -> int:
+        # "5" or 5, like the dict's string keys
+        return self.counts[int(digit) - 1]
+
+    def __eq__(self, other):
+        if type(other) is LoShuGrid:
+            return self.counts == other.counts
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"LoShuGrid({self.to_json()})"
+
+    def to_json(self) -> dict:
+        return dict(zip(GRID_KEYS, self.counts))
+
+
+class PinnacleCycles:
+    __slots__ = ("pinnacles", "challenges", "first_end")
+
+    def __init__(self, pinnacles, challenges, first_end: int):
+        self.pinnacles = bytes(pinnacles)
+        self.challenges = bytes(challenges)
+        self.first_end = first_end
+
+    def __eq__(self, other):
+        if type(other) is PinnacleCycles:
+            return (self.pinnacles, self.challenges, self.first_end) == \
+                (other.pinnacles, other.challenges, other.first_end)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"PinnacleCycles({list(self.pinnacles)}, {list(self.challenges)}, {self.first_end})"
+
+    def ranges(self) -> tuple:
+        # Cycle I ends at 36 - LP; II and III last 9 years each
+        end_p1 = self.first_end
+        return (
+            f"Birth to {end_p1}",
+            f"{end_p1 + 1} to {end_p1 + 9}",
+            f"{end_p1 + 10} to {end_p1 + 18}",
+            f"{end_p1 + 19}+",
+        )
+
+    def to_json(self) -> list:
+        return [
+            {"cycle": name, "range": age_range, "pinnacle": pinnacle, "challenge": challenge}
+            for name, age_range, pinnacle, challenge in zip(CYCLE_NAMES, self.ranges(), self.pinnacles, self.challenges)
+        ]
+
+
+class EssenceTimeline:
+    __slots__ = ("birth_year", "start_age", "values")
+
+    def __init__(self, birth_year: int, start_age: int, values):
+        self.birth_year = birth_year
+        self.start_age = start_age
+        self.values = bytes(values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> dict:
+        # The dict entry at a list position, as in the old list of dicts
+        essence = self.values[index]
+        if index < 0:
+            index += len(self.values)
+        age = self.start_age + index
+        return {"age": age, "year": self.birth_year + age, "essence": essence}
+
+    def __eq__(self, other):
+        if type(other) is EssenceTimeline:
+            return (self.birth_year, self.start_age, self.values) == (other.birth_year, other.start_age, other.values)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"EssenceTimeline({self.birth_year}, {self.start_age}, {list(self.values)})"
+
+    def to_json(self) -> list:
+        birth_year = self.birth_year
+        return [
+            {"age": age, "year": birth_year + age, "essence": essence}
+            for age, essence in enumerate(self.values, self.start_age)
+        ]
+
+    def json_text(self) -> str:
+        """
+        The encoded to_json() list, filled into a cached per-(birth year,
+        ages) template; skips building a dict per age.
+        """
+        return _essence_template(self.birth_year, self.start_age, len(self.values)) % tuple(self.values)
+
+
+@lru_cache(maxsize=4096)
+def _essence_template(birth_year: int, start_age: int, count: int) -> str:
+    rows = ",".join(
+        f'{{"age":{age},"year":{birth_year + age},"essence":%d}}'
+        for age in range(start_age, start_age + count)
+    )
+    return f"[{rows}]"
+
+
+class PersonalPeriods:
+    __slots__ = ("date", "personal_year", "personal_month", "personal_day", "years", "months")
+
+    def __init__(self, date: str, personal_year: int, personal_month: int, personal_day: int, years, months):
+        self.date = date
+        self.personal_year = personal_year
+        self.personal_month = personal_month
+        self.personal_day = personal_day
+        # Personal Years from the date's year onwards, and Personal Months of its year
+        self.years = bytes(years)
+        self.months = bytes(months)
+
+    def __eq__(self, other):
+        if type(other) is PersonalPeriods:
+            return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"PersonalPeriods({self.date!r}, {self.personal_year}, {self.personal_month}, {self.personal_day})"
+
+    def to_json(self) -> dict:
+        first_year = int(self.date.split("-")[0])
+        return {
+            "current": {
+                "personal_year": self.personal_year,
+                "personal_month": self.personal_month,
+                "personal_day": self.personal_day,
+                "date": self.date,
+            },
+            "yearly_forecast": [
+                {"year": first_year + i, "personal_year": py} for i, py in enumerate(self.years)
+            ],
+            "monthly_forecast": [
+                {"month": name, "month_num": i + 1, "personal_month": pm}
+                for i, (name, pm) in enumerate(zip(tables.MONTH_NAMES, self.months))
+            ],
+        }
+
+
+RESULT_TYPES = (LoShuGrid, PinnacleCycles, EssenceTimeline, PersonalPeriods)
+
+
+def default(obj):
+    """
+    default= hook for json.dumps and orjson.dumps.
+    """
+    if type(obj) in RESULT_TYPES:
+        return obj.to_json()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def plain(value):
+    """
+    value with every result object inside it (in dicts and lists) replaced
+    by its dict or list form, for encoders that take no default hook.
+    """
+    if type(value) in RESULT_TYPES:
+        return value.to_json()
+    if isinstance(value, dict):
+        return {key: plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [plain(item) for item in value]
+    return value
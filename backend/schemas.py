@@ -0,0 +1,174 @@
+"""
+Request models for the API.
+
+Kept apart from main.py so batch workers can validate records without
+importing the FastAPI app.
+"""
+from datetime import date
+from typing import Any, List, Literal, Optional
+
+from typing_extensions import Annotated
+from pydantic import (
+    BaseModel, Field, PlainSerializer, PlainValidator, ValidationError, WithJsonSchema,
+    field_validator, model_validator,
+)
+
+import calendar_forecast
+import metrics
+import systems
+from birthdate import BirthDate
+
+class RequestModel(BaseModel):
+    if metrics.ENABLED:
+        @model_validator(mode="wrap")
+        @classmethod
+        def time_validation(cls, data, handler):
+            with metrics.stage("validation"):
+                return handler(data)
+
+# A YYYY-MM-DD string in JSON; parsed and validated once here (2023-02-30 is a 422)
+# and passed to the calculations as a BirthDate
+DateOfBirth = Annotated[
+    BirthDate,
+    PlainValidator(BirthDate.parse),
+    PlainSerializer(str, return_type=str, when_used="json"),
+    WithJsonSchema({"type": "string", "format": "date"}),
+]
+
+class SystemSelection(RequestModel):
+    # Numerology system from systems.json; omit for the configured default
+    system: Optional[str] = None
+
+    @field_validator("system")
+    @classmethod
+    def check_system(cls, value):
+        if value is not None:
+            systems.get_system(value)
+        return value
+
+    def numerology_system(self):
+        return systems.resolve(self.system)
+
+class AnalysisRequest(SystemSelection):
+    name: str
+    dob: DateOfBirth
+    gender: str
+    # Optional essence window; omit both for the full 0-100 timeline
+    essence_start_age: Optional[int] = Field(None, ge=0, le=100)
+    essence_end_age: Optional[int] = Field(None, ge=0, le=100)
+
+    @model_validator(mode="after")
+    def check_essence_window(self):
+        start, end = self.essence_window()
+        if start > end:
+            raise ValueError("essence_start_age must not be greater than essence_end_age")
+        return self
+
+    def essence_window(self) -> tuple:
+        start = 0 if self.essence_start_age is None else self.essence_start_age
+        end = 100 if self.essence_end_age is None else self.essence_end_age
+        return start, end
+
+class MobileAnalysisRequest(SystemSelection):
+    mobile_number: str
+    dob: DateOfBirth
+
+class VehicleAnalysisRequest(SystemSelection):
+    vehicle_number: str
+    dob: DateOfBirth
+
+class HouseAnalysisRequest(SystemSelection):
+    house_number: str
+    dob: DateOfBirth
+
+class BatchAnalysisRequest(RequestModel):
+    # Each record is an AnalysisRequest, MobileAnalysisRequest,
+    # VehicleAnalysisRequest or HouseAnalysisRequest; records are validated
+    # one by one so a bad record only fails itself.
+    records: List[Any]
+
+LoShuDigit = Annotated[int, Field(ge=1, le=9)]
+
+class DobSearchRequest(RequestModel):
+    # Every given criterion must match; omitted ones are ignored
+    mulank: Optional[int] = Field(None, ge=1, le=9)
+    bhagyank: Optional[int] = Field(None, ge=1, le=9)
+    kua: Optional[int] = Field(None, ge=0, le=9)
+    gender: Optional[str] = None  # required with kua, present or missing
+    present: List[LoShuDigit] = []  # digits that must appear in the Lo Shu grid
+    missing: List[LoShuDigit] = []  # digits that must not appear
+    pinnacles: Optional[List[int]] = Field(None, min_length=4, max_length=4)
+    challenges: Optional[List[int]] = Field(None, min_length=4, max_length=4)
+    start: Optional[date] = None
+    end: Optional[date] = None
+    offset: int = Field(0, ge=0)
+    limit: int = Field(100, ge=1, le=1000)
+
+    @model_validator(mode="after")
+    def check_gender(self):
+        if (self.kua is not None or self.present or self.missing) and not self.gender:
+            raise ValueError("gender is required to search by kua or Lo Shu digits")
+        return self
+
+class RecommendRequest(RequestModel):
+    dob: DateOfBirth
+    kind: Literal["mobile", "vehicle", "house"] = "mobile"
+    candidates: List[str]
+    top_k: int = Field(10, ge=1, le=1000)
+    # Compound totals to rank first, most preferred first
+    preferred_compounds: List[int] = []
+
+class MatchRequest(SystemSelection):
+    dobs: List[DateOfBirth] = Field(min_length=2)
+    # Optional labels echoed in results, one per dob
+    ids: Optional[List[str]] = None
+    # Index into dobs to rank matches for; omit for the whole-group summary
+    target: Optional[int] = Field(None, ge=0)
+    top_k: int = Field(10, ge=1, le=1000)
+    # Pair scores run from 0 (Unlucky both ways) to 4 (Lucky both ways)
+    min_score: int = Field(0, ge=0, le=4)
+
+    @model_validator(mode="after")
+    def check_people(self):
+        if self.ids is not None and len(self.ids) != len(self.dobs):
+            raise ValueError(f"{len(self.ids)} ids for {len(self.dobs)} dobs")
+        if self.target is not None and self.target >= len(self.dobs):
+            raise ValueError(f"target {self.target} is out of range for {len(self.dobs)} dobs")
+        return self
+
+class NameSuggestionRequest(RequestModel):
+    name: str
+    dob: DateOfBirth
+    max_edits: int = Field(2, ge=1, le=3)
+    limit: int = Field(20, ge=1, le=200)
+    # Search time budget; the best suggestions found so far are returned when it runs out
+    time_budget_ms: float = Field(200, gt=0, le=5000)
+    # Target single digits; defaults to the Lucky digits for the Mulank
+    targets: Optional[List[Annotated[int, Field(ge=1, le=9)]]] = None
+
+class CalendarForecastRequest(RequestModel):
+    dobs: List[DateOfBirth] = Field(min_length=1)
+    # Range defaults to `years` whole years from target_date (today if omitted)
+    target_date: Optional[date] = None
+    start: Optional[date] = None
+    end: Optional[date] = None
+    years: int = Field(1, ge=1, le=100)
+
+    @model_validator(mode="after")
+    def check_range(self):
+        start, end = self.date_range()
+        if start > end:
+            raise ValueError("start must not be after end")
+        return self
+
+    def date_range(self) -> tuple:
+        start = self.start or self.target_date or date.today()
+        end = self.end or calendar_forecast.default_range(start, self.years)[1]
+        return start, end
+
+def validation_message(error: ValidationError) -> str:
+    messages = []
+    for err in error.errors():
+        location = ".".join(str(part) for part in err["loc"])
+        messages.append(f"{location}: {err['msg']}" if location else err["msg"])
+    return "; ".join(messages)
@@ -0,0 +1,176 @@
+"""
+Pluggable numerology systems (letter values, compatibility, Master
+Numbers and Kua rules) loaded from systems.json.
+
+Each system is compiled once into the same kind of lookup tables that
+tables.py holds for the built-in Chaldean system, and compiled systems
+are cached per process, so selecting a system per request is a dict
+lookup. The functions in numerology.py take an optional system and read
+its tables in place of the built-in ones.
+
+A system may "extends" another and override any of its sections. Set
+NUMEROLOGY_SYSTEMS to load definitions from a different file.
+"""
+import json
+import os
+
+import numerology
+import tables
+
+SYSTEMS_FILE = os.getenv("NUMEROLOGY_SYSTEMS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "systems.json"))
+SECTIONS = ("letters", "master_numbers", "compatibility", "kua")
+
+
+class System:
+    """
+    A compiled system: the same lookup tables tables.py holds for the
+    built-in system, built from one definition.
+    """
+
+    def __init__(self, name: str, definition: dict):
+        self.name = name
+        self.description = definition.get("description", "")
+
+        letters = {}
+        for value, group in definition["letters"].items():
+            value = int(value)
+            if not 1 <= value <= 9:
+                raise ValueError(f"system {name!r}: letter value {value} must be 1-9")
+            for letter in group:
+                if not letter.isalpha():
+                    raise ValueError(f"system {name!r}: {letter!r} is not a letter")
+                letters[letter.lower()] = value
+        self.letters = letters
+        self.letters_upper = {letter.upper(): value for letter, value in letters.items()}
+        self.letter_bytes = bytes(letters.get(chr(b).lower(), 0) if b < 128 else 0 for b in range(256))
+
+        self.master_numbers = tuple(sorted(definition["master_numbers"]))
+        self._master_reduced = tuple(self._reduce_master_slow(n) for n in range(1000))
+
+        self.lucky_numbers = {}
+        self.lucky = {}
+        self.unlucky = {}
+        status = [()]
+        for mulank in range(1, 10):
+            row = definition["compatibility"].get(str(mulank), {})
+            self.lucky_numbers[mulank] = tuple(row.get("lucky", ()))
+            self.lucky[mulank] = frozenset(row.get("lucky", ()))
+            self.unlucky[mulank] = frozenset(row.get("unlucky", ()))
+            status.append(tuple(
+                "Lucky" if n in self.lucky[mulank] else "Unlucky" if n in self.unlucky[mulank] else "Neutral"
+                for n in range(10)
+            ))
+        self.status = tuple(status)
+
+        kua = definition["kua"]
+        self.kua_centuries = tuple(
+            (rule["from"], rule["to"], tuple(rule["male"]), tuple(rule["female"]))
+            for rule in kua["centuries"]
+        )
+        self.kua_five = (kua["five"]["male"], kua["five"]["female"])
+
+        # Same tables as the built-in system: callers can skip the system
+        # and use the precomputed DOB table and existing cache entries
+        self.builtin = (
+            letters == tables.CHALDEAN
+            and self.master_numbers == numerology.MASTER_NUMBERS
+            and self.lucky_numbers == tables.LUCKY_NUMBERS
+            and self.unlucky == tables.UNLUCKY
+            and self.kua_centuries == tables.KUA_CENTURIES
+            and self.kua_five == tables.KUA_FIVE
+        )
+
+    def _reduce_master_slow(self, n: int) -> int:
+        while n > 9 and n not in self.master_numbers:
+            n = numerology.digit_sum(n)
+        return n
+
+    def reduce_master(self, n: int) -> int:
+        """
+        reduce_preserving_master with this system's Master Numbers.
+        """
+        if n < 10:
+            return n
+        while n >= 1000:
+            n = numerology.digit_sum(n)
+        return self._master_reduced[n]
+
+    def describe(self) -> dict:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "master_numbers": list(self.master_numbers),
+            "builtin": self.builtin,
+        }
+
+
+def _resolve(name: str, definitions: dict, seen=()) -> dict:
+    if name not in definitions:
+        raise ValueError(f"unknown numerology system {name!r}")
+    if name in seen:
+        raise ValueError(f"numerology system {name!r} extends itself")
+    definition = definitions[name]
+    parent = definition.get("extends")
+    resolved = dict(_resolve(parent, definitions, seen + (name,))) if parent else {}
+    resolved.update(definition)
+    missing = [section for section in SECTIONS if section not in resolved]
+    if missing:
+        raise ValueError(f"numerology system {name!r} is missing {', '.join(missing)}")
+    return resolved
+
+
+def compile_systems(config: dict) -> dict:
+    """
+    Compiles every system in a systems.json-style config.
+    """
+    definitions = config["systems"]
+    return {name: System(name, _resolve(name, definitions)) for name in definitions}
+
+
+def load_systems(path: str = SYSTEMS_FILE) -> dict:
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    compiled = compile_systems(config)
+    default = config.get("default", "chaldean")
+    if default not in compiled:
+        raise ValueError(f"default numerology system {default!r} is not defined")
+    return {"default": default, "systems": compiled}
+
+
+_loaded = None
+
+
+def _get_loaded() -> dict:
+    global _loaded
+    if _loaded is None:
+        _loaded = load_systems()
+    return _loaded
+
+
+def names() -> list:
+    return list(_get_loaded()["systems"])
+
+
+def default_name() -> str:
+    return _get_loaded()["default"]
+
+
+def get_system(name: str = None) -> System:
+    """
+    Returns the compiled system (the configured default for None).
+    """
+    loaded = _get_loaded()
+    system = loaded["systems"].get(name or loaded["default"])
+    if system is None:
+        raise ValueError(f"unknown numerology system {name!r}; choose from {', '.join(loaded['systems'])}")
+    return system
+
+
+def resolve(name: str = None):
+    """
+    The system argument to pass to numerology and analysis functions:
+    None when the selected system matches the built-in tables, so the
+    built-in fast paths apply.
+    """
+    system = get_system(name)
+    return None if system.builtin else system
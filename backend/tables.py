@@ -0,0 +1,82 @@
+"""
+Constant lookup tables shared by the numerology calculations.
+
+Everything here is built once at import time and is immutable (tuples,
+frozensets, bytes), so callers can use the tables directly without
+copying. Letter and digit scoring use bytes.translate tables: an ASCII
+string is encoded once, each byte is replaced with its value in C, and
+the resulting bytes are summed (or listed) without a per-character
+Python loop.
+"""
+
+# Chaldean letter values, lower-case
+CHALDEAN = {
+    'a': 1, 'i': 1, 'j': 1, 'q': 1, 'y': 1,
+    'b': 2, 'k': 2, 'r': 2,
+    'c': 3, 'g': 3, 'l': 3, 's': 3,
+    'd': 4, 'm': 4, 't': 4,
+    'e': 5, 'h': 5, 'n': 5, 'x': 5,
+    'u': 6, 'v': 6, 'w': 6,
+    'o': 7, 'z': 7,
+    'f': 8, 'p': 8,
+}
+
+# Upper-case view, for the Essence calculation which upper-cases names
+CHALDEAN_UPPER = {letter.upper(): value for letter, value in CHALDEAN.items()}
+
+# bytes.translate table: each ASCII letter (either case) to its Chaldean
+# value, every other byte to 0
+CHALDEAN_BYTES = bytes(CHALDEAN.get(chr(b).lower(), 0) if b < 128 else 0 for b in range(256))
+
+# Every byte that is not an ASCII letter, for bytes.translate(table, delete)
+NON_LETTER_BYTES = bytes(b for b in range(256) if not (b < 128 and chr(b).isalpha()))
+
+# bytes.translate table: each ASCII digit to its value, every other byte to 0
+DIGIT_BYTES = bytes(b - 48 if 48 <= b <= 57 else 0 for b in range(256))
+
+MONTH_NAMES = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+# Mulank: (Lucky, Unlucky, Neutral) single digits
+COMPATIBILITY = {
+    1: ((1, 2, 3, 5, 9), (8,),      (4, 6, 7)),
+    2: ((1, 3, 5),       (4, 8, 9), (2, 6, 7)),
+    3: ((1, 2, 3, 5, 9), (6,),      (4, 7, 8)),
+    4: ((1, 5, 6, 7, 8), (2, 9),    (3, 4)),
+    5: ((1, 2, 3, 5, 6), (),        (4, 7, 8, 9)),  # Unlucky: None in table
+    6: ((1, 5, 6, 7),    (3,),      (2, 4, 8, 9)),
+    7: ((1, 3, 4, 5, 6), (),        (2, 7, 8, 9)),  # Unlucky: None
+    8: ((3, 5, 6, 7),    (1, 2),    (4, 8, 9)),
+    9: ((1, 2, 3, 9),    (4, 5),    (6, 7, 8)),
+}
+
+LUCKY_NUMBERS = {mulank: row[0] for mulank, row in COMPATIBILITY.items()}
+LUCKY = {mulank: frozenset(row[0]) for mulank, row in COMPATIBILITY.items()}
+UNLUCKY = {mulank: frozenset(row[1]) for mulank, row in COMPATIBILITY.items()}
+NEUTRAL = {mulank: frozenset(row[2]) for mulank, row in COMPATIBILITY.items()}
+
+
+def _status(mulank: int, number: int) -> str:
+    if number in LUCKY[mulank]:
+        return "Lucky"
+    if number in UNLUCKY[mulank]:
+        return "Unlucky"
+    return "Neutral"
+
+
+# STATUS[mulank][number] for mulank 1-9 and number 0-9; row 0 is unused
+STATUS = ((),) + tuple(
+    tuple(_status(mulank, number) for number in range(10))
+    for mulank in range(1, 10)
+)
+
+# Kua rules: (first year, last year, male (base, factor sign), female (base, factor sign));
+# Kua is base + sign * Kua Factor, reduced. Years outside every range get 0.
+KUA_CENTURIES = (
+    (1900, 1999, (10, -1), (5, 1)),
+    (2000, 2099, (9, -1), (6, 1)),
+)
+# Kua that replaces a result of 5: (male, female)
+KUA_FIVE = (2, 8)
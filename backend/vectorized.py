@@ -0,0 +1,136 @@
+"""
+NumPy kernels for batch numerology.
+
+Array counterparts of the scalar functions in numerology.py. Every kernel
+takes whole columns (dates as datetime64, numbers as fixed-width ASCII
+byte strings) and returns integer arrays, with results identical to the
+scalar functions element by element.
+"""
+import numpy as np
+
+
+def digital_root(n):
+    """
+    Array form of reduce_to_single_digit: values above 9 reduce to 1-9,
+    values 0-9 are returned unchanged.
+    """
+    n = np.asarray(n, dtype=np.int64)
+    return np.where(n > 9, 1 + (n - 1) % 9, n)
+
+
+def split_dates(dobs):
+    """
+    Splits dates into (year, month, day) int64 arrays.
+    Accepts datetime64 arrays or anything np.datetime64 can parse (e.g. YYYY-MM-DD strings).
+    """
+    dates = np.asarray(dobs, dtype="datetime64[D]")
+    years = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+    months = dates.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    days = (dates - dates.astype("datetime64[M]")).astype(np.int64) + 1
+    return years, months, days
+
+
+def mulank(dobs):
+    _, _, days = split_dates(dobs)
+    return digital_root(days)
+
+
+def bhagyank(dobs):
+    # The digit sum of YYYYMMDD and Y + M + D share a digital root
+    years, months, days = split_dates(dobs)
+    return digital_root(years + months + days)
+
+
+def _is_male(genders, size: int):
+    genders = np.asarray(genders)
+    if genders.dtype == np.bool_:
+        return np.broadcast_to(genders, (size,))
+    return np.broadcast_to(np.char.lower(genders.astype(str)) == "male", (size,))
+
+
+def kua(dobs, genders):
+    """
+    genders is a boolean "is male" array, or strings compared like calculate_kua
+    (case-insensitive "male", anything else female). Years outside 1900-2099 give 0.
+    """
+    years, _, _ = split_dates(dobs)
+    male = _is_male(genders, years.shape[0])
+
+    last_two = years % 100
+    kua_factor = digital_root(last_two // 10 + last_two % 10)
+
+    in_1900s = (years >= 1900) & (years <= 1999)
+    in_2000s = (years >= 2000) & (years <= 2099)
+    raw = np.zeros_like(years)
+    raw = np.where(in_1900s & male, 10 - kua_factor, raw)
+    raw = np.where(in_1900s & ~male, 5 + kua_factor, raw)
+    raw = np.where(in_2000s & male, 9 - kua_factor, raw)
+    raw = np.where(in_2000s & ~male, 6 + kua_factor, raw)
+
+    result = digital_root(raw)
+    return np.where(result == 5, np.where(male, 2, 8), result)
+
+
+def personal_periods(dobs, target_dates):
+    """
+    Returns (personal_year, personal_month, personal_day) arrays.
+    target_dates may be a single date or an array broadcastable against dobs.
+    """
+    _, birth_months, birth_days = split_dates(dobs)
+    years, months, days = split_dates(target_dates)
+
+    personal_year = digital_root(digital_root(birth_days) + digital_root(birth_months) + digital_root(years))
+    personal_month = digital_root(personal_year + digital_root(months))
+    personal_day = digital_root(personal_month + digital_root(days))
+    return personal_year, personal_month, personal_day
+
+
+def personal_calendar(dobs, start, end):
+    """
+    Personal periods for every DOB on every day from start to end inclusive.
+
+    Returns (dates, personal_year, personal_month, personal_day): dates is
+    the datetime64[D] day axis and the others are int8 arrays of shape
+    (len(dobs), len(dates)). Only the birth day and month matter, so each
+    distinct (day, month) pair is computed once and the rows are gathered.
+    """
+    dates = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+    _, birth_months, birth_days = split_dates(dobs)
+    years, months, days = split_dates(dates)
+
+    # Reduced birth day + month is 2-18; rows differ only by this base
+    base = digital_root(birth_days) + digital_root(birth_months)
+    bases, rows = np.unique(base, return_inverse=True)
+    personal_year = 1 + (bases[:, None] + digital_root(years)[None, :] - 1) % 9
+    personal_month = 1 + (personal_year + digital_root(months)[None, :] - 1) % 9
+    personal_day = 1 + (personal_month + digital_root(days)[None, :] - 1) % 9
+
+    rows = rows.reshape(-1)
+
+    def gather(table):
+        return table.astype(np.int8)[rows]
+
+    return dates, gather(personal_year), gather(personal_month), gather(personal_day)
+
+
+def digit_totals(numbers):
+    """
+    Returns (total_sum, single_digit) arrays for mobile, vehicle or house
+    numbers, summing only the digit characters like calculate_mobile_total,
+    calculate_vehicle_total and calculate_house_total.
+
+    numbers is a fixed-width bytes array (dtype "S<n>") or anything that
+    converts to one, so values must be ASCII.
+    """
+    buffer = np.asarray(numbers, dtype=np.bytes_)
+    width = buffer.dtype.itemsize
+    chars = buffer.view(np.uint8).reshape(buffer.shape[0], width)
+    values = chars.astype(np.int16) - ord("0")
+    is_digit = (values >= 0) & (values <= 9)
+    totals = np.where(is_digit, values, 0).sum(axis=1, dtype=np.int64)
+    return totals, digital_root(totals)
+
+
+mobile_totals = digit_totals
+vehicle_totals = digit_totals
+house_totals = digit_totals
@@ -0,0 +1,53 @@
+import pickle
+import random
+from datetime import date
+
+import numerology
+import systems
+from birthdate import BirthDate
+
+rng = random.Random(21)
+pythagorean = systems.get_system("pythagorean")
+
+print("--- BirthDate Matches String DOBs ---")
+for _ in range(5000):
+    text = date.fromordinal(rng.randrange(1, 800000)).isoformat()
+    dob = BirthDate.parse(text)
+    gender = rng.choice(("male", "female"))
+    assert numerology.calculate_mulank(dob) == numerology.calculate_mulank(text)
+    assert numerology.calculate_bhagyank(dob) == numerology.calculate_bhagyank(text)
+    for system in (None, pythagorean):
+        assert numerology.calculate_kua(dob, gender, system) == numerology.calculate_kua(text, gender, system)
+        assert numerology.calculate_pinnacles_and_challenges(dob, system) == numerology.calculate_pinnacles_and_challenges(text, system)
+    kua = numerology.calculate_kua(text, gender)
+    assert numerology.generate_lo_shu_grid(dob, dob.mulank, dob.bhagyank, kua) == \
+        numerology.generate_lo_shu_grid(text, dob.mulank, dob.bhagyank, kua)
+    assert numerology.calculate_personal_periods(dob, "2026-03-04") == numerology.calculate_personal_periods(text, "2026-03-04")
+    assert numerology.calculate_essence(dob, "Asha Rao", 20, 40) == numerology.calculate_essence(text, "Asha Rao", 20, 40)
+print("PASS")
+
+print("\n--- Invalid Dates Rejected ---")
+for text in ("2023-02-30", "1990-13-01", "1990-00-10", "1990-05", "1990-05-1x", "1990--15", "", "١٩٩٠-٠٥-١٥", None, 19900515):
+    try:
+        BirthDate.parse(text)
+    except ValueError as e:
+        print("rejected:", e)
+    else:
+        raise AssertionError(f"accepted {text!r}")
+print("PASS")
+
+print("\n--- Value Semantics ---")
+dob = BirthDate.parse("1990-05-15")
+assert BirthDate.parse(dob) is dob
+assert dob == BirthDate.from_date(date(1990, 5, 15)) and hash(dob) == hash("1990-05-15")
+assert str(dob) == f"{dob}" == "1990-05-15" and dob.to_date() == date(1990, 5, 15)
+assert pickle.loads(pickle.dumps(dob)) == dob
+try:
+    dob.year = 2000
+except AttributeError:
+    pass
+else:
+    raise AssertionError("BirthDate is mutable")
+print("PASS")
+
+print("\n--- All Tests Passed ---")
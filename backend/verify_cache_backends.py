@@ -0,0 +1,66 @@
+import os
+import tempfile
+import time
+
+import cache
+
+value = {"mulank": 2, "loshu": {"1": 1, "2": 0}, "essence": [{"age": 0, "essence": 11}]}
+
+def check_backend(name, backend):
+    print(f"\n--- {name} ---")
+    assert backend.get("missing") is None
+    backend.set("k1", value)
+    assert backend.get("k1") == value
+    # Already expired entries are never returned
+    backend.set("k2", value, expires_at=time.time() - 1)
+    assert backend.get("k2") is None
+    stats = backend.stats()
+    print(stats)
+    assert stats["hits"] >= 1 and stats["misses"] >= 2
+    backend.clear()
+    assert backend.get("k1") is None
+    print("PASS")
+
+check_backend("Memory LRU", cache.LRUCache(max_entries=10))
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "cache.db")
+    check_backend("SQLite", cache.SQLiteBackend(path, "verify", max_entries=10))
+
+    print("\n--- SQLite Shared Between Instances ---")
+    writer = cache.SQLiteBackend(path, "shared", max_entries=10)
+    reader = cache.SQLiteBackend(path, "shared", max_entries=10)
+    writer.set("k", value)
+    assert reader.get("k") == value
+    print("PASS")
+
+    print("\n--- SQLite LRU Pruning ---")
+    small = cache.SQLiteBackend(path, "small", max_entries=5)
+    for i in range(20):
+        small.set(f"k{i}", i)
+        time.sleep(0.001)
+    small.prune()
+    assert small.stats()["entries"] == 5
+    assert small.get("k19") == 19 and small.get("k0") is None
+    print("PASS")
+
+check_backend("Redis (FakeRedis client)", cache.RedisBackend(cache.FakeRedis(), "verify"))
+
+print("\n--- Fallback When Redis Is Down ---")
+client = cache.FakeRedis()
+backend = cache.FallbackBackend(cache.RedisBackend(client, "verify"), cache.LRUCache(10), retry_after=60)
+backend.set("k", value)
+client.available = False
+backend.set("k", {"from": "fallback"})
+assert backend.get("k") == {"from": "fallback"}
+stats = backend.stats()
+print(stats)
+assert stats["errors"] == 1 and not stats["available"]
+print("PASS")
+
+print("\n--- Unreachable Backend At Startup ---")
+assert isinstance(cache.make_backend("bogus://", "verify"), cache.LRUCache)
+assert isinstance(cache.make_backend("fake-redis://", "verify"), cache.FallbackBackend)
+print("PASS")
+
+print("\n--- All Tests Passed ---")
@@ -0,0 +1,46 @@
+import json
+import random
+from datetime import date, timedelta
+
+import calendar_forecast
+import numerology
+import vectorized
+
+rng = random.Random(20)
+first = date(1900, 1, 1).toordinal()
+
+print("--- Calendar Matches calculate_personal_periods ---")
+for _ in range(100):
+    dob = date.fromordinal(first + rng.randrange(73000)).isoformat()
+    start = date(2020, 1, 1) + timedelta(days=rng.randrange(2000))
+    end = start + timedelta(days=rng.randrange(800))
+    days = list(calendar_forecast.iter_days(dob, start, end))
+    assert len(days) == (end - start).days + 1
+    for day, py, pm, pd in days:
+        current = numerology.calculate_personal_periods(dob, day.isoformat())["current"]
+        assert (py, pm, pd) == (current["personal_year"], current["personal_month"], current["personal_day"]), (dob, day)
+
+    months = list(calendar_forecast.iter_months(dob, start, end))
+    assert [pd for month in months for pd in month["personal_days"]] == [d[3] for d in days]
+    lines = b"".join(calendar_forecast.encode_ndjson([dob], start, end, chunk_bytes=256)).splitlines()
+    assert [json.loads(line) for line in lines] == months
+print("PASS")
+
+print("\n--- Vectorized Calendar ---")
+dobs = [date.fromordinal(first + rng.randrange(73000)).isoformat() for _ in range(200)]
+start, end = date(2024, 1, 1), date(2025, 12, 31)
+dates, py, pm, pd = vectorized.personal_calendar(dobs, start, end)
+assert py.shape == pm.shape == pd.shape == (len(dobs), len(dates))
+for i, dob in enumerate(dobs):
+    expected = list(calendar_forecast.iter_days(dob, start, end))
+    assert py[i].tolist() == [d[1] for d in expected]
+    assert pm[i].tolist() == [d[2] for d in expected]
+    assert pd[i].tolist() == [d[3] for d in expected]
+print("PASS")
+
+print("\n--- Default Range ---")
+assert calendar_forecast.default_range(date(2026, 3, 5)) == (date(2026, 3, 5), date(2027, 3, 4))
+assert calendar_forecast.default_range(date(2024, 2, 29)) == (date(2024, 2, 29), date(2025, 2, 28))
+print("PASS")
+
+print("\n--- All Tests Passed ---")
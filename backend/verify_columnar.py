@@ -0,0 +1,78 @@
+import io
+import json
+
+import analysis
+import batch
+import columnar
+import numerology_cli
+import results
+
+if columnar.pa is None:
+    print("pyarrow is not installed; skipping")
+    raise SystemExit(0)
+pa, pq = columnar.pa, columnar.pq
+
+records = [numerology_cli.normalize_record(row) for row in [
+    {"name": "Asha Rao", "dob": "1990-05-15", "gender": "female", "mobile": "9876543210"},
+    {"name": "Vikram Singh", "dob": "1985-11-29", "gender": "male", "vehicle": "MH12AB1234", "house": "42B"},
+    {"name": "", "dob": "2001-01-01", "gender": "", "mobile": "12345"},
+    {"name": "Bad Date", "dob": "2023-02-30", "gender": "male"},
+]]
+context = analysis.BatchContext()
+scored = [numerology_cli.score_record(context, record) for record in records]
+expected = [json.loads(json.dumps(result, default=results.default)) for result in scored]
+
+print("--- Columns Match The Scored Results ---")
+rows = columnar.record_batch(scored).to_pylist()
+for row, result in zip(rows, expected):
+    person = result.get("analysis")
+    if person:
+        assert [row[c] for c in columnar.GRID_COLUMNS] == list(person["loshu"].values())
+        cycles = person["life_roadmap"]["pinnacles_challenges"]
+        assert [row[c] for c in columnar.PINNACLE_COLUMNS] == [c["pinnacle"] for c in cycles]
+        assert [row[c] for c in columnar.CHALLENGE_COLUMNS] == [c["challenge"] for c in cycles]
+        assert (row["kua"], row["name_number"]) == (person["kua"], person["name_number"]["single_digit"])
+    else:
+        assert row["loshu_1"] is None and row["pinnacle_1"] is None
+    for kind in analysis.NUMBER_TOTALS:
+        data = result.get(kind)
+        status = data["compatibility"]["status"] if data else None
+        assert row[f"{kind}_status"] == status
+    assert row["error"] == result.get("error")
+print(rows[3]["error"])
+print("PASS")
+
+print("\n--- Files Round Trip In Row Groups ---")
+batch_ = columnar.record_batch(scored)
+for output_format in columnar.FORMATS:
+    sink = io.BytesIO()
+    with columnar.BatchWriter(sink, output_format, rows_per_group=6) as writer:
+        for _ in range(5):
+            writer.write(batch_)
+    data = sink.getvalue()
+    if output_format == "parquet":
+        table = pq.read_table(io.BytesIO(data))
+        assert pq.ParquetFile(io.BytesIO(data)).metadata.num_row_groups == 3
+    else:
+        table = pa.ipc.open_file(data).read_all()
+    assert writer.rows == 20 and table.to_pylist() == rows * 5
+    print(output_format, len(data), "bytes")
+print("PASS")
+
+print("\n--- API Records Stream As Arrow IPC ---")
+api_records = [
+    {"name": "Asha Rao", "dob": "1990-05-15", "gender": "female"},
+    {"mobile_number": "9876543210", "dob": "1990-05-15"},
+    {"name": "Bad Date", "dob": "2023-02-30", "gender": "male"},
+    "not a record",
+]
+stream = columnar.stream_header() + batch.encode_arrow(api_records) + batch.encode_arrow(api_records) + columnar.STREAM_END
+table = pa.ipc.open_stream(stream).read_all()
+assert table.schema == columnar.schema() and table.num_rows == 8
+api_rows = table.to_pylist()
+assert api_rows[0]["loshu_5"] == rows[0]["loshu_5"] and api_rows[0]["mobile_status"] is None
+assert api_rows[1]["mobile_status"] == rows[0]["mobile_status"] and api_rows[1]["name"] is None
+assert api_rows[2]["error"] and api_rows[3]["error"] == "record must be a JSON object"
+print("PASS")
+
+print("\n--- All Tests Passed ---")
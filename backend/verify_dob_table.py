@@ -0,0 +1,22 @@
+import dob_table
+
+print("--- Building DOB Table ---")
+table = dob_table.get_table()
+stats = table.stats()
+print(f"Rows: {stats['rows']} ({stats['start']} to {stats['end']})")
+print(f"Build time: {stats['build_seconds']}s")
+print(f"Resident size: {stats['bytes'] / 1024:.1f} KiB")
+
+print("\n--- Verifying Against numerology.py ---")
+mismatches = table.verify()
+print(f"Mismatches: {len(mismatches)}")
+assert not mismatches, f"First mismatches: {mismatches[:5]}"
+print("PASS")
+
+print("\n--- Out Of Range Falls Back ---")
+assert table.lookup("1899-12-31", "male") is None
+assert table.lookup("2100-01-01", "female") is None
+assert table.lookup("1990-02-30", "male") is None
+print("PASS")
+
+print("\n--- All Tests Passed ---")
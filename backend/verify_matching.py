@@ -0,0 +1,64 @@
+import random
+from collections import Counter
+from datetime import date
+from itertools import combinations
+
+import matching
+import numerology
+import systems
+
+rng = random.Random(24)
+points = matching.STATUS_POINTS
+
+
+def pair_score(a, b, system=None):
+    return points[numerology.get_compatibility(a, b, system)["status"]] + \
+        points[numerology.get_compatibility(b, a, system)["status"]]
+
+
+dobs = [date.fromordinal(rng.randrange(700000, 735000)).isoformat() for _ in range(400)]
+ids = [f"p{i}" for i in range(len(dobs))]
+
+for label, system in (("Built-in", None), ("Pythagorean", systems.resolve("pythagorean"))):
+    group = matching.MatchGroup(dobs, ids, system)
+    mulanks = [numerology.calculate_mulank(dob) for dob in dobs]
+    assert list(group.mulanks) == mulanks
+
+    print(f"--- {label}: Score Distribution Matches Every Pair ---")
+    counts = Counter(pair_score(mulanks[i], mulanks[j], system) for i, j in combinations(range(len(dobs)), 2))
+    summary = group.summary(top_k=50, min_score=3)
+    assert {row["score"]: row["pairs"] for row in summary["score_distribution"]} == {s: counts[s] for s in range(5)}
+    assert sum(row["pairs"] for row in summary["group_pairs"]) == summary["pairs"] == sum(counts.values())
+    for pair in summary["top_pairs"]:
+        i, j = (person["index"] for person in pair["people"])
+        assert pair["score"] == pair_score(mulanks[i], mulanks[j], system) >= 3
+    print(summary["score_distribution"])
+    print("PASS")
+
+    print(f"\n--- {label}: Ranked Matches Match A Brute-Force Sort ---")
+    for index in range(0, len(dobs), 13):
+        a = mulanks[index]
+        for min_score in (0, 3):
+            expected = sorted(
+                (other for other in range(len(dobs)) if other != index and pair_score(a, mulanks[other], system) >= min_score),
+                key=lambda other: (
+                    -pair_score(a, mulanks[other], system),
+                    -points[numerology.get_compatibility(a, mulanks[other], system)["status"]],
+                    mulanks[other], other,
+                ),
+            )
+            result = group.matches(index, top_k=25, min_score=min_score)
+            assert [match["index"] for match in result["results"]] == expected[:25]
+            assert result["matched"] == len(expected) and result["person"]["id"] == ids[index]
+            for match in result["results"]:
+                assert match["status"] == numerology.get_compatibility(a, match["mulank"], system)["status"]
+                assert match["their_status"] == numerology.get_compatibility(match["mulank"], a, system)["status"]
+    print("PASS\n")
+
+print("--- match_all Matches matches() In Order ---")
+group = matching.MatchGroup(dobs, ids)
+lines = "".join(text for _, text in matching.match_all(group, top_k=5, chunk_size=64)).splitlines()
+assert lines == [matching.encode_matches(i, i + 1, 5, 0, group).rstrip("\n") for i in range(len(dobs))]
+print("PASS")
+
+print("\n--- All Tests Passed ---")
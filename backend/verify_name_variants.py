@@ -0,0 +1,36 @@
+import json
+import re
+
+import main
+import name_variants
+import numerology
+from asgi_client import ASGIClient
+
+DOUBLED_CAPITAL = re.compile(r"([A-Z])\1")
+
+print("--- Edits Never Double A Word's Initial Capital ---")
+for name in ("Shiva", "Jean Luc", "Anne-Marie O'Neil"):
+    for edit in name_variants.single_edits(name):
+        variant = name_variants.apply_edits(name, [edit])
+        assert not DOUBLED_CAPITAL.search(variant), (name, edit, variant)
+        total = numerology.calculate_name_number(variant)["total_sum"]
+        assert total == numerology.calculate_name_number(name)["total_sum"] + edit[3], (name, edit, variant)
+print(name_variants.apply_edits("Shiva", [name_variants.single_edits("Shiva")[0]]))
+print("PASS")
+
+print("\n--- /suggest/name Returns No Doubled Capitals ---")
+client = ASGIClient(main.app)
+for name, dob in (("Shiva Kumar", "1990-06-29"), ("Jean Luc", "1985-11-02"), ("Luc", "2001-01-09")):
+    status, body = client.post("/suggest/name", {"name": name, "dob": dob, "max_edits": 2, "limit": 50,
+                                                 "time_budget_ms": 1000})
+    assert status == 200, (status, body)
+    suggestions = json.loads(body)["suggestions"]
+    assert suggestions, name
+    for suggestion in suggestions:
+        assert not DOUBLED_CAPITAL.search(suggestion["name"]), suggestion
+        assert numerology.calculate_name_number(suggestion["name"])["total_sum"] == suggestion["total_sum"]
+    print(name, "->", [s["name"] for s in suggestions[:5]])
+client.close()
+print("PASS")
+
+print("\n--- All Tests Passed ---")
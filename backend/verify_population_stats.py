@@ -0,0 +1,81 @@
+import json
+import pickle
+import random
+from collections import Counter
+from datetime import date
+
+import numerology
+import population_stats
+from population_stats import PopulationStats, RecordDecoder
+
+rng = random.Random(25)
+rows = []
+for i in range(3000):
+    rows.append({
+        "name": f"Person {i}",
+        "dob": date.fromordinal(rng.randrange(650000, 760000)).isoformat(),
+        "gender": rng.choice(("male", "female", "Male", "")),
+        "mobile": str(rng.randrange(10**9, 10**10)) if i % 3 else "",
+    })
+rows += [{"dob": "2023-02-30", "gender": "male"}, {"name": "no dob"}, None]
+
+print("--- Counts Match Direct Calculation ---")
+mulank, bhagyank, kua, present, missing, mobile = Counter(), Counter(), Counter(), Counter(), Counter(), Counter()
+for row in rows[:3000]:
+    dob, gender = row["dob"], row["gender"]
+    m, b = numerology.calculate_mulank(dob), numerology.calculate_bhagyank(dob)
+    mulank[str(m)] += 1
+    bhagyank[str(b)] += 1
+    if gender:
+        k = numerology.calculate_kua(dob, gender)
+        kua[str(k)] += 1
+        grid = numerology.generate_lo_shu_grid(dob, m, b, k)
+        present.update(d for d, count in grid.items() if count)
+        missing[tuple(int(d) for d, count in grid.items() if not count)] += 1
+    if row["mobile"]:
+        total = numerology.calculate_mobile_total(row["mobile"])["single_digit"]
+        mobile[m, numerology.get_compatibility(m, total)["status"]] += 1
+
+report = PopulationStats().add_records(rows).report(top_patterns=512)
+with_gender = sum(1 for row in rows[:3000] if row["gender"])
+assert (report["records"], report["valid_records"], report["errors"]) == (3003, 3000, 3)
+assert report["mulank"] == {str(n): mulank[str(n)] for n in range(1, 10)}
+assert report["bhagyank"] == {str(n): bhagyank[str(n)] for n in range(1, 10)}
+assert report["kua"] == dict(sorted(kua.items()))
+assert report["loshu_presence"]["people"] == with_gender
+for digit, rate in report["loshu_presence"]["rates"].items():
+    assert rate == round(present[digit] / with_gender, 6)
+assert {tuple(p["missing"]): p["people"] for p in report["missing_patterns"]["top"]} == missing
+for entry in report["mobile_by_mulank"]:
+    for status in ("Lucky", "Neutral", "Unlucky"):
+        assert entry[status.lower()] == mobile[entry["mulank"], status]
+print(report["mobile_by_mulank"][0])
+print("PASS")
+
+print("\n--- Shards Merge To The Same Result ---")
+shards = [PopulationStats().add_records(rows[i:i + 700]) for i in range(0, len(rows), 700)]
+merged = PopulationStats()
+for shard in shards:
+    merged.merge(pickle.loads(pickle.dumps(shard)))
+assert merged.report(512) == report
+assert population_stats.aggregate(iter(rows), workers=2, chunk_size=500).report(512) == report
+print("PASS")
+
+print("\n--- Uploads Decode Incrementally ---")
+csv_body = "\ufeffname,dob,gender,mobile\r\n" + "".join(
+    f"{r['name']},{r['dob']},{r['gender']},{r['mobile']}\r\n" for r in rows[:3000]
+)
+ndjson_body = "".join(json.dumps(r) + "\n" for r in rows[:3000]) + "not json\n"
+for input_format, body, errors in (("csv", csv_body, 0), ("ndjson", ndjson_body, 1)):
+    data = body.encode()
+    for size in (1, 7, 4096):
+        decoder, stats = RecordDecoder(input_format), PopulationStats()
+        for start in range(0, len(data), size):
+            stats.add_records(decoder.feed(data[start:start + size]))
+        stats.add_records(decoder.close())
+        decoded = stats.report(512)
+        assert decoded["errors"] == errors and decoded["mulank"] == report["mulank"]
+        assert decoded["missing_patterns"] == report["missing_patterns"]
+print("PASS")
+
+print("\n--- All Tests Passed ---")
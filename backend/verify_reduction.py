@@ -0,0 +1,38 @@
+import random
+import sys
+
+import numerology
+
+# Reference implementations: the original string-based reductions
+def reference_single_digit(n):
+    while n > 9:
+        n = sum(int(digit) for digit in str(n))
+    return n
+
+def reference_master(n):
+    while n > 9 and n not in [11, 22]:
+        n = sum(int(d) for d in str(n))
+    return n
+
+# Exhaustive range; pass a smaller limit as the first argument for a quick run
+limit = int(sys.argv[1]) if len(sys.argv) > 1 else 10**7
+
+print(f"--- Exhaustive Check: -100 to {limit:,} ---")
+for n in range(-100, limit + 1):
+    assert numerology.reduce_to_single_digit(n) == reference_single_digit(n), f"single digit differs at {n}"
+    assert numerology.reduce_preserving_master(n) == reference_master(n), f"master differs at {n}"
+print("PASS")
+
+print("\n--- Property Check: 100,000 random values up to 10^30 ---")
+rng = random.Random(2024)
+for _ in range(100_000):
+    n = rng.randrange(10 ** rng.randint(1, 30))
+    assert numerology.reduce_to_single_digit(n) == reference_single_digit(n), f"single digit differs at {n}"
+    assert numerology.reduce_preserving_master(n) == reference_master(n), f"master differs at {n}"
+    # Digital root properties: result in 1-9 and congruent to n mod 9
+    if n > 0:
+        root = numerology.reduce_to_single_digit(n)
+        assert 1 <= root <= 9 and root % 9 == n % 9
+print("PASS")
+
+print("\n--- All Tests Passed ---")
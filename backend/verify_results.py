@@ -0,0 +1,53 @@
+import json
+import random
+from datetime import date
+
+import analysis
+import fastjson
+import numerology
+import results
+import systems
+from birthdate import BirthDate
+
+rng = random.Random(22)
+pythagorean = systems.get_system("pythagorean")
+names = ["Asha Rao", "Vikram Singh", "Mary Ann Lee", "Jo", ""]
+
+print("--- Typed Results Match Dict Versions ---")
+for _ in range(3000):
+    dob = BirthDate.parse(date.fromordinal(rng.randrange(650000, 750000)).isoformat())
+    name = rng.choice(names)
+    system = rng.choice((None, pythagorean))
+    essence = numerology.essence_timeline(dob, name, 10, 60, system)
+    assert essence.to_json() == list(numerology.iter_essence(dob, name, 10, 60, system))
+    assert len(essence) == 51 * bool(name)
+    if name:
+        assert essence[0] == essence.to_json()[0] and essence[-1] == essence.to_json()[-1]
+    assert json.loads(essence.json_text()) == essence.to_json()
+    grid = numerology.lo_shu_grid(dob, dob.mulank, dob.bhagyank, 5)
+    assert all(grid[key] == grid[int(key)] == count for key, count in grid.to_json().items())
+    periods = numerology.personal_periods(dob, "2026-03-04")
+    assert periods.to_json() == numerology.calculate_personal_periods(dob, "2026-03-04")
+    assert numerology.pinnacle_cycles(dob, system).to_json() == numerology.calculate_pinnacles_and_challenges(dob, system)
+print("PASS")
+
+print("\n--- Encoders Agree ---")
+for _ in range(200):
+    dob = BirthDate.parse(date.fromordinal(rng.randrange(650000, 750000)).isoformat())
+    payload = analysis.analyze_person(rng.choice(names), dob, rng.choice(("male", "female")))
+    plain = results.plain(payload)
+    expected = json.dumps(plain, ensure_ascii=False, separators=(",", ":")).encode()
+    assert json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=results.default).encode() == expected
+    assert fastjson.dumps(payload) == expected
+print("PASS")
+
+print("\n--- Unknown Objects Still Rejected ---")
+try:
+    json.dumps({"when": date(2026, 1, 1)}, default=results.default)
+except TypeError as e:
+    print("rejected:", e)
+else:
+    raise AssertionError("date encoded")
+print("PASS")
+
+print("\n--- All Tests Passed ---")
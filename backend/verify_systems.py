@@ -0,0 +1,65 @@
+import random
+import string
+from datetime import date, timedelta
+
+import analysis
+import numerology
+import systems
+
+chaldean = systems.get_system("chaldean")
+pythagorean = systems.get_system("pythagorean")
+
+print("--- Systems Loaded ---")
+for name in systems.names():
+    print(systems.get_system(name).describe())
+assert systems.default_name() == "chaldean"
+assert chaldean.builtin and systems.resolve("chaldean") is None
+assert systems.resolve("custom") is None  # identical to chaldean, so it shares the fast path
+assert not pythagorean.builtin and systems.resolve("pythagorean") is pythagorean
+print("PASS")
+
+print("\n--- Compiled Chaldean Matches Built-in Functions ---")
+# Passing the compiled system forces the system code paths; they must
+# agree with the built-in tables on random inputs
+rng = random.Random(15)
+chars = string.ascii_letters + "  -.'ßéÁ"
+start = date(1900, 1, 1).toordinal()
+for _ in range(5000):
+    name = "".join(rng.choice(chars) for _ in range(rng.randint(0, 24)))
+    dob = date.fromordinal(start + rng.randrange(73000)).isoformat()
+    gender = rng.choice(("male", "female"))
+    assert numerology.calculate_name_number(name, chaldean) == numerology.calculate_name_number(name)
+    assert numerology.calculate_kua(dob, gender, chaldean) == numerology.calculate_kua(dob, gender)
+    assert numerology.calculate_pinnacles_and_challenges(dob, chaldean) == numerology.calculate_pinnacles_and_challenges(dob)
+    assert numerology.calculate_essence(dob, name, system=chaldean) == numerology.calculate_essence(dob, name)
+for mulank in range(0, 11):
+    for number in range(0, 12):
+        assert numerology.get_compatibility(mulank, number, chaldean) == numerology.get_compatibility(mulank, number)
+print("PASS")
+
+print("\n--- Pythagorean Values ---")
+# A=1 J=1 S=1, I=9 R=9
+assert numerology.calculate_name_number("AJS", pythagorean) == {"total_sum": 3, "single_digit": 3}
+assert numerology.calculate_name_number("Iris", pythagorean)["total_sum"] == 9 + 9 + 9 + 1
+# 33 is a Master Number in this system
+assert pythagorean.reduce_master(33) == 33 and numerology.reduce_preserving_master(33) == 6
+result = analysis.analyze_person("Iris Smith", "1990-05-15", "female", system=pythagorean)
+print(result["name_number"], result["life_roadmap"]["essence"][0])
+print("PASS")
+
+print("\n--- Invalid Definitions Rejected ---")
+for config in (
+    {"systems": {"a": {"extends": "b"}}},
+    {"systems": {"a": {"extends": "a"}}},
+    {"systems": {"a": {"letters": {"1": "A"}}}},
+    {"systems": {"base": {"letters": {"10": "A"}, "master_numbers": [], "compatibility": {}, "kua": {}}}},
+):
+    try:
+        systems.compile_systems(config)
+    except ValueError as e:
+        print("rejected:", e)
+    else:
+        raise AssertionError(f"accepted {config}")
+print("PASS")
+
+print("\n--- All Tests Passed ---")